@@ -0,0 +1,243 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+import paddle
+from paddle.distributed.fleet.utils.log_util import logger
+
+from .metadata import Metadata
+from .stream_storage import (
+    StreamCheckpointWriter,
+    compute_storage_offsets,
+    get_numpy_dtype,
+    mmap_local_tensors,
+)
+from .utils import get_max_id
+
+if TYPE_CHECKING:
+    from paddle import Tensor
+
+    from .metadata import LocalTensorIndex
+
+# The max bytes copied to host at a time when hashing a local tensor.
+FINGERPRINT_CHUNK_SIZE = 64 << 20
+
+
+def compute_fingerprint(
+    tensor: Tensor, chunk_size: int = FINGERPRINT_CHUNK_SIZE
+) -> str:
+    """
+    Hash the content of a local tensor chunk by chunk. The dtype and shape
+    are hashed as well, so that tensors with the same bytes but different
+    layouts get different fingerprints.
+    """
+    dtype = str(tensor.dtype).split(".")[1]
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f"{dtype}:{list(tensor.shape)}".encode())
+    flat_tensor = tensor.reshape([-1])
+    numel = flat_tensor.shape[0]
+    chunk_numel = max(chunk_size // get_numpy_dtype(dtype).itemsize, 1)
+    for start in range(0, numel, chunk_numel):
+        end = min(start + chunk_numel, numel)
+        chunk = flat_tensor[start:end] if end - start < numel else flat_tensor
+        buffer = np.ascontiguousarray(chunk.cpu().numpy())
+        hasher.update(memoryview(buffer.reshape([-1]).view(np.uint8)))
+    return hasher.hexdigest()
+
+
+def get_base_unique_id(path: str, unique_id: int) -> int | None:
+    """
+    Get the unique id of the latest checkpoint saved before unique_id in path.
+    """
+    pattern = re.compile(r"^(\d+)\.metadata$")
+    ids = []
+    for file in os.listdir(path):
+        match = pattern.match(file)
+        if match and int(match.group(1)) < unique_id:
+            ids.append(int(match.group(1)))
+    return max(ids) if ids else None
+
+
+def get_reused_storage(
+    tensor_fingerprints: dict[LocalTensorIndex, str],
+    base_metadata: Metadata,
+) -> dict[LocalTensorIndex, str]:
+    """
+    Get the local tensors unchanged since the base checkpoint, mapped to the
+    files holding them. The base metadata already points to the file where
+    a tensor was last written, so the references never form a chain to be
+    followed at loading.
+    """
+    if base_metadata.tensor_fingerprints is None:
+        return {}
+    reused_storage = {}
+    for local_tensor_index, fingerprint in tensor_fingerprints.items():
+        if (
+            base_metadata.tensor_fingerprints.get(local_tensor_index)
+            == fingerprint
+            and local_tensor_index in base_metadata.storage_metadata
+        ):
+            reused_storage[local_tensor_index] = base_metadata.storage_metadata[
+                local_tensor_index
+            ]
+    return reused_storage
+
+
+def get_referenced_files(metadata_list: list[Metadata]) -> list[str]:
+    """
+    Get all the data files holding the local tensors of the checkpoint,
+    including the files of earlier checkpoints referenced by an incremental
+    checkpoint.
+    """
+    files = []
+    for metadata in metadata_list:
+        for file_name in metadata.storage_metadata.values():
+            if file_name not in files:
+                files.append(file_name)
+    return files
+
+
+def _get_file_rank(file_name: str) -> int:
+    return int(file_name.split(".")[0].split("_")[0])
+
+
+def _get_file_unique_id(file_name: str) -> int:
+    return int(file_name.split(".")[0].split("_")[1])
+
+
+def compact_checkpoint(path: str, unique_id: int | None = None) -> None:
+    """
+    Merge an incremental checkpoint and the earlier checkpoint files it
+    references into a full checkpoint. The local tensors saved by rank i
+    are written into the new file `{i}_{unique_id}.compact.distcp`, after
+    that the earlier checkpoints are not needed to load this one and can be
+    removed.
+
+    The existing files are never rewritten, since the later incremental
+    checkpoints may reference the local tensors in them by byte ranges, and
+    the file `{i}_{unique_id}.distcp` is still used to find the checkpoint.
+
+    It runs in a single process and needs all the checkpoint files of path
+    to be accessible.
+
+    Args:
+        path(str): The directory of the checkpoint.
+        unique_id(int): The unique id of the checkpoint to compact. Default is None, in which case the max id of given path is used.
+
+    Example:
+        .. code-block:: python
+
+            >>> # doctest: +SKIP('run in distributed mode')
+            >>> import paddle.distributed as dist
+            >>> from paddle.distributed.checkpoint.incremental import compact_checkpoint
+            >>> dist.save_state_dict(state_dict, "./checkpoint", incremental=True)
+            >>> compact_checkpoint("./checkpoint")
+            >>> # doctest: -SKIP
+    """
+    with paddle.base.dygraph.guard():
+        if unique_id is None:
+            unique_id = get_max_id(path)
+            assert (
+                unique_id is not None
+            ), f"No checkpoint found in the directory: {path}."
+        metadata_path = os.path.join(path, f"{unique_id}.metadata")
+        metadata = paddle.load(metadata_path)
+
+        if all(
+            _get_file_unique_id(file_name) == unique_id
+            for file_name in metadata.storage_metadata.values()
+        ):
+            logger.info(f"The checkpoint {unique_id} is already full.")
+            return
+        storage_metadata = {
+            local_tensor_index: f"{_get_file_rank(file_name)}_{unique_id}.compact.distcp"
+            for local_tensor_index, file_name in metadata.storage_metadata.items()
+        }
+
+        stream_saved = metadata.storage_offsets is not None
+        compacted = Metadata(
+            state_dict_metadata=metadata.state_dict_metadata,
+            storage_metadata=storage_metadata,
+            flat_mapping=metadata.flat_mapping,
+            tensor_fingerprints=metadata.tensor_fingerprints,
+        )
+        if stream_saved:
+            compacted.storage_offsets, file_sizes = compute_storage_offsets(
+                compacted
+            )
+
+        file_to_indices = {}
+        for local_tensor_index, file_name in storage_metadata.items():
+            file_to_indices.setdefault(file_name, []).append(local_tensor_index)
+
+        tmp_files = []
+        for file_name, local_tensor_indices in file_to_indices.items():
+            source_state_dicts = {}
+
+            def read_local_tensor(local_tensor_index):
+                source_file = metadata.storage_metadata[local_tensor_index]
+                if source_file not in source_state_dicts:
+                    if stream_saved:
+                        source_state_dicts[source_file] = mmap_local_tensors(
+                            path, source_file, [metadata]
+                        )
+                    else:
+                        source_state_dicts[source_file] = paddle.load(
+                            os.path.join(path, source_file), return_numpy=True
+                        )
+                return paddle.to_tensor(
+                    source_state_dicts[source_file][
+                        local_tensor_index.tensor_key
+                    ],
+                    place=paddle.CPUPlace(),
+                )
+
+            tmp_file_path = os.path.join(path, f"{file_name}.tmp")
+            if stream_saved:
+                StreamCheckpointWriter().write(
+                    tmp_file_path,
+                    # read lazily so that only the staged chunks are held
+                    (
+                        (
+                            read_local_tensor(local_tensor_index),
+                            compacted.storage_offsets[local_tensor_index],
+                        )
+                        for local_tensor_index in local_tensor_indices
+                    ),
+                    file_sizes[file_name],
+                )
+            else:
+                paddle.save(
+                    {
+                        local_tensor_index.tensor_key: read_local_tensor(
+                            local_tensor_index
+                        )
+                        for local_tensor_index in local_tensor_indices
+                    },
+                    tmp_file_path,
+                )
+            tmp_files.append((tmp_file_path, os.path.join(path, file_name)))
+
+        paddle.save(compacted, f"{metadata_path}.tmp")
+        for tmp_file_path, file_path in tmp_files:
+            os.replace(tmp_file_path, file_path)
+        os.replace(f"{metadata_path}.tmp", metadata_path)
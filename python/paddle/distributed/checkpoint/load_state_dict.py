@@ -19,6 +19,8 @@ import os
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 import paddle
 from paddle.base.framework import (
     _current_expected_place,
@@ -26,7 +28,12 @@ from paddle.base.framework import (
 from paddle.distributed.communication.group import is_initialized
 from paddle.distributed.fleet.utils.log_util import logger
 
+from .incremental import get_referenced_files
 from .metadata import LocalTensorIndex, LocalTensorMetadata
+from .stream_storage import (
+    ChunkPrefetcher,
+    mmap_local_tensors,
+)
 from .utils import (
     check_unique_id,
     compute_local_shape_and_global_offset,
@@ -531,6 +538,7 @@ def load_state_dict(
     unique_id: int | None = None,
     offload: bool = False,
     mw_name_compatibility: bool = True,
+    num_io_threads: int = 4,
 ) -> None:
     """
     Load the state_dict inplace from a checkpoint path.
@@ -543,6 +551,7 @@ def load_state_dict(
         unique_id(int): The unique id of ckeckpoint, used to distinguish between different checkpoint versions. Default is None, in which case the id the max id of given path, and the newest version checkpoint is loaded.
         offload(bool): Whether to offload the checkpoint data from GPU to CPU.
         mw_name_compatibility(bool): Enable name compatibility between dynamic and static graph semi-automatic parallel. Default is True.
+        num_io_threads(int): The number of threads to read the chunks of the checkpoint saved by stream save. Default is 4.
     Example:
         .. code-block:: python
 
@@ -604,6 +613,15 @@ def load_state_dict(
         for file in metadata_files:
             metadata_list.append(paddle.load(os.path.join(path, file)))
 
+        # The incremental checkpoint references the unchanged local tensors
+        # in the files of earlier checkpoints.
+        local_data_files = local_data_files + [
+            file
+            for file in get_referenced_files(metadata_list)
+            if file not in local_data_files
+            and os.path.exists(os.path.join(path, file))
+        ]
+
         rank_to_files, missing_keys, mw_name_compatibility_mapping = (
             get_rank_to_files(
                 metadata_list,
@@ -641,9 +659,18 @@ def load_state_dict(
             rank_to_files, rank_to_local_data_files
         )
 
+        stream_saved = any(
+            metadata.storage_offsets is not None for metadata in metadata_list
+        )
         source_state_dict = {}
         for file in local_load_files:
-            if offload:
+            if stream_saved:
+                # Only map the files here, the chunks overlapped with the
+                # local shards are read in _load_state_dict.
+                source_state_dict[file] = mmap_local_tensors(
+                    path, file, metadata_list
+                )
+            elif offload:
                 state_dict_numpy = paddle.load(
                     os.path.join(path, file), return_numpy=True
                 )
@@ -661,6 +688,7 @@ def load_state_dict(
             process_group,
             coordinator_rank,
             offload,
+            num_io_threads,
         )
 
         for flat_key, keys in mapping.items():
@@ -682,6 +710,7 @@ def _load_state_dict(
     process_group=None,
     coordinator_rank=0,
     offload=False,
+    num_io_threads=4,
 ) -> None:
     with paddle.base.dygraph.guard():
         use_dist = True if paddle.distributed.get_world_size() > 1 else False
@@ -696,6 +725,30 @@ def _load_state_dict(
         read_items = get_read_items(
             metadata_list, target_state_dict, process_group, use_dist
         )
+        # For the checkpoint saved by stream save, the source local tensors are
+        # mapped numpy arrays, only the overlapped chunks are read from disk
+        # by the prefetcher in parallel.
+        prefetch_tasks = []
+        for item in read_items:
+            task = None
+            if item.local_tensor_index in load_infos:
+                src_rank, file_name = load_infos[item.local_tensor_index]
+                storage_local_tensor = source_state_dict.get(file_name, {}).get(
+                    item.local_tensor_index.tensor_key
+                )
+                if src_rank == paddle.distributed.get_rank() and isinstance(
+                    storage_local_tensor, np.ndarray
+                ):
+                    task = (
+                        storage_local_tensor,
+                        item.storage_offset,
+                        item.lengths,
+                    )
+            prefetch_tasks.append(task)
+        prefetcher = None
+        if any(task is not None for task in prefetch_tasks):
+            prefetcher = ChunkPrefetcher(prefetch_tasks, num_io_threads)
+
         state_dict_in_cpu = []
         idx = 0
         for item in read_items:
@@ -721,29 +774,36 @@ def _load_state_dict(
                     item.local_tensor_index.tensor_key
                 ]
 
-                if offload:
-                    storage_local_tensor = paddle.to_tensor(
-                        storage_local_tensor, place=_current_expected_place()
-                    )
-
-                storage_offsets = item.storage_offset
-                storage_lengths = item.lengths
-                storage_ends = [
-                    storage_offset + storage_length
-                    for storage_offset, storage_length in zip(
-                        storage_offsets, storage_lengths
-                    )
-                ]
-                # The storage_chunk_tensor and storage_local_tensor share the same memory.
-                if len(storage_lengths) > 0:
-                    storage_chunk_tensor = paddle.slice(
-                        storage_local_tensor,
-                        list(range(len(storage_lengths))),
-                        storage_offsets,
-                        storage_ends,
+                if prefetch_tasks[idx] is not None:
+                    # Only the overlapped chunk is read from the mapped file.
+                    storage_chunk_tensor = paddle.to_tensor(
+                        prefetcher.get(idx), place=_current_expected_place()
                     )
                 else:
-                    storage_chunk_tensor = storage_local_tensor
+                    if offload:
+                        storage_local_tensor = paddle.to_tensor(
+                            storage_local_tensor,
+                            place=_current_expected_place(),
+                        )
+
+                    storage_offsets = item.storage_offset
+                    storage_lengths = item.lengths
+                    storage_ends = [
+                        storage_offset + storage_length
+                        for storage_offset, storage_length in zip(
+                            storage_offsets, storage_lengths
+                        )
+                    ]
+                    # The storage_chunk_tensor and storage_local_tensor share the same memory.
+                    if len(storage_lengths) > 0:
+                        storage_chunk_tensor = paddle.slice(
+                            storage_local_tensor,
+                            list(range(len(storage_lengths))),
+                            storage_offsets,
+                            storage_ends,
+                        )
+                    else:
+                        storage_chunk_tensor = storage_local_tensor
             # The read item rank need to be assigned
             if item.rank == paddle.distributed.get_rank():
                 assert (
@@ -811,6 +871,8 @@ def _load_state_dict(
                 target_state_dict[key] = target_state_dict[key].cpu()
             idx = idx + 1
 
+        if prefetcher is not None:
+            prefetcher.shutdown()
         if use_dist:
             paddle.distributed.barrier(process_group)
 
@@ -37,8 +37,24 @@ class LocalTensorIndex:
     global_offset: tuple[int]
 
 
+@dataclass(frozen=True)
+class LocalTensorStorageInfo:
+    """
+    The byte range of a local tensor in a raw checkpoint file.
+    """
+
+    offset: int
+    nbytes: int
+
+
 @dataclass
 class Metadata:
     state_dict_metadata: dict[str, list[LocalTensorMetadata]] = None
     storage_metadata: dict[LocalTensorIndex, str] = None
     flat_mapping: dict[str, tuple[str]] = None
+    # Only set for the checkpoint saved in raw format by stream save, None
+    # means the checkpoint files are saved by paddle.save.
+    storage_offsets: dict[LocalTensorIndex, LocalTensorStorageInfo] = None
+    # Only set for the checkpoint saved by incremental save, the content hash
+    # of each local tensor used to find the unchanged ones in the next save.
+    tensor_fingerprints: dict[LocalTensorIndex, str] = None
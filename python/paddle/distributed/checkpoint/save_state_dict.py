@@ -19,10 +19,19 @@ import time
 from typing import TYPE_CHECKING
 
 import paddle
+from paddle.distributed.communication.all_gather import (
+    all_gather_object_batch,
+)
 from paddle.distributed.communication.group import is_initialized
 from paddle.distributed.fleet.utils.log_util import logger
 
+from .incremental import (
+    compute_fingerprint,
+    get_base_unique_id,
+    get_reused_storage,
+)
 from .metadata import LocalTensorIndex, LocalTensorMetadata, Metadata
+from .stream_storage import StreamCheckpointWriter, compute_storage_offsets
 from .utils import (
     check_unique_id,
     compute_local_shape_and_global_offset,
@@ -132,6 +141,33 @@ def dedup_tensor(
             local_state_dict.pop(tensor_index.tensor_key)
 
 
+def get_incremental_base_metadata(path, global_base_unique_ids, stream_save):
+    """
+    Get the metadata of the latest checkpoint in path, whose unchanged local
+    tensors are referenced instead of saved again by the incremental save.
+
+    All ranks should see the same base checkpoint saved in the same format,
+    otherwise None is returned and the checkpoint is saved in full.
+    """
+    base_unique_id = global_base_unique_ids[0]
+    if base_unique_id is None:
+        return None
+    if any(id != base_unique_id for id in global_base_unique_ids):
+        logger.warning(
+            f"The latest checkpoints found by ranks are different: {global_base_unique_ids}, save the checkpoint in full."
+        )
+        return None
+    base_metadata = paddle.load(
+        os.path.join(path, f"{base_unique_id}.metadata")
+    )
+    if (base_metadata.storage_offsets is not None) != stream_save:
+        logger.warning(
+            f"The checkpoint {base_unique_id} is saved in another format, save the checkpoint in full."
+        )
+        return None
+    return base_metadata
+
+
 def save_state_dict(
     state_dict: dict[str, Tensor],
     path: str,
@@ -139,6 +175,10 @@ def save_state_dict(
     coordinator_rank: int = 0,
     unique_id: int | None = None,
     async_save: bool = False,
+    stream_save: bool = False,
+    stream_buffer_size: int = 1 << 30,
+    num_io_threads: int = 4,
+    incremental: bool = False,
 ) -> None:
     """
     Save the state_dict of model to path.
@@ -150,6 +190,10 @@ def save_state_dict(
         coordinator_rank(int): The rank used to save non distributed values. Rank 0 is used by default.
         unique_id(int): The unique id of ckeckpoint, used to distinguish between different checkpoint versions. Default is None, in which case the id 0 when save for the first time and increased by 1 each time when calling save_state_dict in the same path. If unique_id is given and there is already checkpoint with the same unique_id, it will be overrited.
         async_save(bool): Async save the state_dict, default is False.
+        stream_save(bool): Save the local tensors in raw format instead of paddle.save. The tensors are copied to host chunk by chunk and written by a thread pool, the byte range of each tensor is recorded in the metadata. Default is False.
+        stream_buffer_size(int): The max bytes of host buffers used by stream save. Default is 1GB.
+        num_io_threads(int): The number of threads to write file in stream save. Default is 4.
+        incremental(bool): Only save the local tensors changed since the latest checkpoint in path, the unchanged ones are referenced to the files of earlier checkpoints by the metadata. The local tensors are compared by their content hash. The earlier checkpoints should be kept until the checkpoint is compacted by `paddle.distributed.checkpoint.incremental.compact_checkpoint`. If unique_id is None, the max id of given path plus 1 is used. Default is False.
 
     Examples:
         .. code-block:: python
@@ -190,6 +234,10 @@ def save_state_dict(
             logger.debug(f"Max unique id: {max_unique_id}")
             if max_unique_id is None:
                 unique_id = 0
+            elif incremental:
+                # save next to the latest checkpoint, which is the base of
+                # the incremental save
+                unique_id = max_unique_id + 1
             else:
                 unique_id = max_unique_id
         else:
@@ -245,40 +293,116 @@ def save_state_dict(
                     LocalTensorIndex(key, tuple(global_offset))
                 ] = file_name
 
+        local_fingerprints = {}
+        base_unique_id = None
+        if incremental:
+            for key, local_tensor in local_state_dict.items():
+                local_fingerprints[
+                    LocalTensorIndex(
+                        key, tuple(local_state_dict_metadata[key].global_offset)
+                    )
+                ] = compute_fingerprint(local_tensor)
+            base_unique_id = get_base_unique_id(path, unique_id)
+
         global_state_dict_metadata = []
         global_storage_metadata = []
         global_flatten_mapping = []
+        global_fingerprints = []
+        global_base_unique_ids = []
         if use_dist:
-            paddle.distributed.all_gather_object(
-                global_state_dict_metadata,
+            # gather all the metadata in one batch
+            local_objects = [
                 local_state_dict_metadata,
-                process_group,
-            )
-            paddle.distributed.all_gather_object(
-                global_storage_metadata, local_storage_metadata, process_group
-            )
-            paddle.distributed.all_gather_object(
-                global_flatten_mapping, mapping, process_group
+                local_storage_metadata,
+                mapping,
+            ]
+            if incremental:
+                local_objects += [local_fingerprints, base_unique_id]
+            global_objects = all_gather_object_batch(
+                local_objects, process_group
             )
+            (
+                global_state_dict_metadata,
+                global_storage_metadata,
+                global_flatten_mapping,
+            ) = global_objects[:3]
+            if incremental:
+                global_fingerprints, global_base_unique_ids = global_objects[3:]
         else:
             global_state_dict_metadata.append(local_state_dict_metadata)
             global_storage_metadata.append(local_storage_metadata)
             global_flatten_mapping.append(mapping)
+            global_fingerprints.append(local_fingerprints)
+            global_base_unique_ids.append(base_unique_id)
 
         metadata.state_dict_metadata = merge_state_dict_metadata(
             global_state_dict_metadata
         )
         metadata.storage_metadata = dedup_key_in_dict(global_storage_metadata)
         metadata.flat_mapping = dedup_key_in_dict(global_flatten_mapping)
-        if coordinator_rank == paddle.distributed.get_rank():
-            logger.debug(f"metadata:{metadata}")
-            paddle.save(metadata, os.path.join(path, f"{unique_id}.metadata"))
-
         dedup_tensor(
             local_state_dict, local_storage_metadata, metadata.storage_metadata
         )
 
-        if async_save:
+        reused_storage = {}
+        if incremental:
+            metadata.tensor_fingerprints = dedup_key_in_dict(
+                global_fingerprints
+            )
+            base_metadata = get_incremental_base_metadata(
+                path, global_base_unique_ids, stream_save
+            )
+            if base_metadata is not None:
+                reused_storage = get_reused_storage(
+                    metadata.tensor_fingerprints, base_metadata
+                )
+            if len(reused_storage) > 0:
+                logger.info(
+                    f"{len(reused_storage)} of {len(metadata.storage_metadata)} local tensors are unchanged since checkpoint {global_base_unique_ids[0]}."
+                )
+            metadata.storage_metadata.update(reused_storage)
+            for local_tensor_index in local_storage_metadata:
+                if local_tensor_index in reused_storage:
+                    local_state_dict.pop(local_tensor_index.tensor_key, None)
+
+        if stream_save:
+            # All ranks compute the same layout from the global metadata, so
+            # no extra communication is needed for the offsets.
+            metadata.storage_offsets, file_sizes = compute_storage_offsets(
+                metadata, exclude=reused_storage
+            )
+            for local_tensor_index in reused_storage:
+                metadata.storage_offsets[local_tensor_index] = (
+                    base_metadata.storage_offsets[local_tensor_index]
+                )
+        if coordinator_rank == paddle.distributed.get_rank():
+            logger.debug(f"metadata:{metadata}")
+            paddle.save(metadata, os.path.join(path, f"{unique_id}.metadata"))
+
+        if stream_save:
+            if async_save:
+                logger.warning(
+                    "async_save is ignored in stream save, the host memory is "
+                    "bounded by stream_buffer_size and the file is written "
+                    "by io threads."
+                )
+            local_tensors = [
+                (
+                    local_state_dict[local_tensor_index.tensor_key],
+                    metadata.storage_offsets[local_tensor_index],
+                )
+                for local_tensor_index, storage_file in (
+                    metadata.storage_metadata.items()
+                )
+                if storage_file == file_name
+            ]
+            writer = StreamCheckpointWriter(stream_buffer_size, num_io_threads)
+            writer.write(
+                os.path.join(path, file_name),
+                local_tensors,
+                file_sizes.get(file_name, 0),
+            )
+        elif async_save:
             cpu_state_dict = copy_dict_to_cpu(local_state_dict)
             clear_async_save_task_queue()
 
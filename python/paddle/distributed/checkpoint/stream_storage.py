@@ -0,0 +1,313 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .metadata import LocalTensorIndex, LocalTensorStorageInfo
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from paddle import Tensor
+
+    from .metadata import Metadata
+
+# Every local tensor in a raw checkpoint file starts at a multiple of it.
+STORAGE_ALIGNMENT = 64
+
+# NOTE: bfloat16 is stored as uint16 in numpy, paddle.to_tensor casts
+# uint16 numpy array back to bfloat16.
+_NUMPY_DTYPES = {
+    "bool": np.bool_,
+    "uint8": np.uint8,
+    "int8": np.int8,
+    "int16": np.int16,
+    "int32": np.int32,
+    "int64": np.int64,
+    "float16": np.float16,
+    "bfloat16": np.uint16,
+    "float32": np.float32,
+    "float64": np.float64,
+    "complex64": np.complex64,
+    "complex128": np.complex128,
+}
+
+
+def get_numpy_dtype(dtype: str):
+    assert (
+        dtype in _NUMPY_DTYPES
+    ), f"The dtype {dtype} is not supported by raw checkpoint storage."
+    return np.dtype(_NUMPY_DTYPES[dtype])
+
+
+def align_offset(offset: int) -> int:
+    return (
+        (offset + STORAGE_ALIGNMENT - 1)
+        // STORAGE_ALIGNMENT
+        * STORAGE_ALIGNMENT
+    )
+
+
+def get_local_tensor_metadata(metadata: Metadata):
+    """
+    Get the mapping of LocalTensorIndex to LocalTensorMetadata.
+    """
+    local_tensor_metadata = {}
+    for tensor_key, metas in metadata.state_dict_metadata.items():
+        for meta in metas:
+            local_tensor_metadata[
+                LocalTensorIndex(tensor_key, tuple(meta.global_offset))
+            ] = meta
+    return local_tensor_metadata
+
+
+def compute_storage_offsets(metadata: Metadata, exclude=()):
+    """
+    Compute the byte range of each local tensor in its raw checkpoint file.
+    The local tensors are laid out in the order of metadata.storage_metadata,
+    so that all ranks get the same result from the same global metadata.
+    The local tensors in exclude are stored in other checkpoints and skipped.
+
+    Returns:
+        Tuple(Dict[LocalTensorIndex, LocalTensorStorageInfo], Dict[str, int]):
+            The storage offsets and the size of each file.
+    """
+    local_tensor_metadata = get_local_tensor_metadata(metadata)
+    storage_offsets = {}
+    file_sizes = {}
+    for local_tensor_index, file_name in metadata.storage_metadata.items():
+        if local_tensor_index in exclude:
+            continue
+        meta = local_tensor_metadata[local_tensor_index]
+        nbytes = (
+            int(np.prod(meta.local_shape, dtype=np.int64))
+            * get_numpy_dtype(meta.dtype).itemsize
+        )
+        offset = file_sizes.get(file_name, 0)
+        storage_offsets[local_tensor_index] = LocalTensorStorageInfo(
+            offset, nbytes
+        )
+        file_sizes[file_name] = align_offset(offset + nbytes)
+    return storage_offsets, file_sizes
+
+
+class _BufferPool:
+    """
+    Bound the total bytes of the staged host buffers.
+    """
+
+    def __init__(self, capacity: int):
+        self._capacity = capacity
+        self._used = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, nbytes: int) -> None:
+        with self._cond:
+            # a buffer larger than capacity is staged alone
+            self._cond.wait_for(
+                lambda: self._used == 0 or self._used + nbytes <= self._capacity
+            )
+            self._used += nbytes
+
+    def release(self, nbytes: int) -> None:
+        with self._cond:
+            self._used -= nbytes
+            self._cond.notify_all()
+
+
+def _pwrite_all(fd: int, buffer: np.ndarray, offset: int) -> None:
+    view = memoryview(buffer.reshape([-1]).view(np.uint8))
+    while len(view) > 0:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+class StreamCheckpointWriter:
+    """
+    Write local tensors into a raw checkpoint file chunk by chunk. Each chunk
+    is copied to a host buffer and written by a thread pool, the total bytes
+    of the staged host buffers are bounded by buffer_size whatever the size
+    of the state_dict is.
+
+    Args:
+        buffer_size(int): The max bytes of the staged host buffers.
+        num_io_threads(int): The number of threads to write the file.
+    """
+
+    def __init__(self, buffer_size: int = 1 << 30, num_io_threads: int = 4):
+        assert buffer_size > 0, "buffer_size should be positive."
+        assert num_io_threads > 0, "num_io_threads should be positive."
+        self._buffer_size = buffer_size
+        self._num_io_threads = num_io_threads
+        # split tensors into chunks so that D2H copy and file writing overlap
+        self._chunk_size = max(buffer_size // (2 * num_io_threads), 1)
+
+    def _iter_chunks(
+        self, tensor: Tensor, storage_info: LocalTensorStorageInfo
+    ):
+        flat_tensor = tensor.reshape([-1])
+        numel = flat_tensor.shape[0]
+        itemsize = get_numpy_dtype(str(tensor.dtype).split(".")[1]).itemsize
+        assert (
+            numel * itemsize == storage_info.nbytes
+        ), f"The size of tensor {tensor.name} mismatches its storage info {storage_info}."
+        offset = storage_info.offset
+        chunk_numel = max(self._chunk_size // itemsize, 1)
+        for start in range(0, numel, chunk_numel):
+            end = min(start + chunk_numel, numel)
+            yield (
+                flat_tensor[start:end] if end - start < numel else flat_tensor,
+                offset + start * itemsize,
+                (end - start) * itemsize,
+            )
+
+    def write(
+        self,
+        file_path: str,
+        tensors: Iterable[tuple[Tensor, LocalTensorStorageInfo]],
+        file_size: int,
+    ) -> None:
+        """
+        Write the tensors into file_path at the offsets of their storage info.
+        """
+        pool = _BufferPool(self._buffer_size)
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, file_size)
+
+            def write_chunk(buffer, offset, nbytes):
+                try:
+                    _pwrite_all(fd, buffer, offset)
+                finally:
+                    pool.release(nbytes)
+
+            futures = []
+            with ThreadPoolExecutor(self._num_io_threads) as executor:
+                for tensor, storage_info in tensors:
+                    for chunk, offset, nbytes in self._iter_chunks(
+                        tensor, storage_info
+                    ):
+                        pool.acquire(nbytes)
+                        try:
+                            buffer = np.ascontiguousarray(chunk.cpu().numpy())
+                        except:
+                            pool.release(nbytes)
+                            raise
+                        futures.append(
+                            executor.submit(write_chunk, buffer, offset, nbytes)
+                        )
+                    # surface the write errors early
+                    while futures and futures[0].done():
+                        futures.pop(0).result()
+            for future in futures:
+                future.result()
+        finally:
+            os.close(fd)
+
+
+def mmap_local_tensors(
+    path: str,
+    file_name: str,
+    metadata_list: list[Metadata],
+) -> dict[str, np.ndarray]:
+    """
+    Map the local tensors saved in a raw checkpoint file as numpy arrays
+    without reading them, only the pages of the sliced chunks are read
+    from disk when they are accessed.
+    """
+    file_path = os.path.join(path, file_name)
+    file_buffer = None
+    state_dict = {}
+    for metadata in metadata_list:
+        if metadata.storage_offsets is None:
+            continue
+        local_tensor_metadata = get_local_tensor_metadata(metadata)
+        for (
+            local_tensor_index,
+            storage_info,
+        ) in metadata.storage_offsets.items():
+            if metadata.storage_metadata[local_tensor_index] != file_name:
+                continue
+            if file_buffer is None:
+                file_buffer = np.memmap(file_path, dtype=np.uint8, mode="r")
+            meta = local_tensor_metadata[local_tensor_index]
+            state_dict[local_tensor_index.tensor_key] = (
+                file_buffer[
+                    storage_info.offset : storage_info.offset
+                    + storage_info.nbytes
+                ]
+                .view(get_numpy_dtype(meta.dtype))
+                .reshape(meta.local_shape)
+            )
+    return state_dict
+
+
+def read_chunk(
+    array: np.ndarray, offsets: tuple[int], lengths: tuple[int]
+) -> np.ndarray:
+    """
+    Read the chunk [offsets, offsets + lengths) of a mapped local tensor.
+    """
+    if len(lengths) == 0:
+        return np.array(array[...], order="C")
+    index = tuple(
+        slice(offset, offset + length)
+        for offset, length in zip(offsets, lengths)
+    )
+    return np.array(array[index], order="C")
+
+
+class ChunkPrefetcher:
+    """
+    Read the chunks of mapped local tensors by a thread pool ahead of their
+    consumption, at most `window` chunks are read but not consumed.
+
+    Args:
+        tasks(list): The (array, offsets, lengths) of each chunk in the order
+            of consumption, None for a chunk which is not read by this rank.
+        num_io_threads(int): The number of threads to read the chunks.
+        window(int): The max number of chunks read ahead.
+    """
+
+    def __init__(self, tasks, num_io_threads: int = 4, window: int = 16):
+        self._tasks = tasks
+        self._window = max(window, 1)
+        self._futures = {}
+        self._next = 0
+        self._executor = ThreadPoolExecutor(num_io_threads)
+
+    def get(self, idx: int) -> np.ndarray:
+        while self._next < len(self._tasks) and self._next <= idx + (
+            self._window
+        ):
+            if self._tasks[self._next] is not None:
+                self._futures[self._next] = self._executor.submit(
+                    read_chunk, *self._tasks[self._next]
+                )
+            self._next += 1
+        return self._futures.pop(idx).result()
+
+    def shutdown(self) -> None:
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        self._executor.shutdown(wait=True)
@@ -11,7 +11,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from .all_gather import all_gather, all_gather_object  # noqa: F401
+from .all_gather import (  # noqa: F401
+    all_gather,
+    all_gather_object,
+    all_gather_object_batch,
+)
 from .all_reduce import all_reduce  # noqa: F401
 from .all_to_all import alltoall, alltoall_single  # noqa: F401
 from .batch_isend_irecv import P2POp, batch_isend_irecv  # noqa: F401
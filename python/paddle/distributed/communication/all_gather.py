@@ -14,20 +14,29 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, TypeVar
+import struct
+from typing import TYPE_CHECKING, Any, TypeVar
 
 import numpy as np
 
 import paddle
 from paddle import framework
 from paddle.distributed.communication import stream
+from paddle.distributed.communication.group import _get_global_group
 
+from .broadcast import _broadcast_bytes
 from .serialization_utils import (
-    convert_object_to_tensor,
-    convert_tensor_to_object,
+    OBJECT_INLINE_SIZE,
+    SIZE_BYTES,
+    pack_objects,
+    pack_slot,
+    unpack_objects,
+    unpack_slot_size,
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from paddle import Tensor
     from paddle.base.core import task
     from paddle.distributed.communication.group import Group
@@ -123,23 +132,144 @@ def all_gather_object(
         framework.in_dynamic_mode()
     ), "all_gather_object doesn't support static graph mode."
 
-    tensor, len_of_tensor = convert_object_to_tensor(obj)
-
-    # gather len_of_tensor from all ranks
-    list_len_of_tensor = []
-    all_gather(list_len_of_tensor, len_of_tensor, group)
-    # get the max length from list
-    max_len_of_tensor = int(max(list_len_of_tensor).item())
-    # resize the input tensor to max length avoid hang in all gather
-    # Note(liyurui): Maybe we should support various length all_gather?
-    # Now this operation is efficient for we don't support resize in python.
-    numpy_data = tensor.numpy()
-    numpy_data = np.resize(numpy_data, [max_len_of_tensor])
-    input_tensor = paddle.to_tensor(numpy_data)
-
-    tensor_list = []
-    all_gather(tensor_list, input_tensor, group)
-    for i, tensor in enumerate(tensor_list):
-        object_list.append(
-            convert_tensor_to_object(tensor, list_len_of_tensor[i])
-        )
+    object_list.extend(all_gather_object_batch([obj], group)[0])
+
+
+def _all_gather_bytes(packed, group, inline_size):
+    """
+    Gather the variable-length bytes of all ranks. The sizes and the first
+    inline_size bytes are gathered together, and the rest bytes are gathered
+    only if any rank has more bytes than inline_size.
+    """
+    nranks = group.nranks
+    slot = pack_slot(packed, inline_size)
+    out_tensor = paddle.empty([nranks * slot.size], dtype="uint8")
+    stream.all_gather(out_tensor, paddle.to_tensor(slot), group=group)
+    slots = out_tensor.numpy().reshape([nranks, slot.size])
+    sizes = [unpack_slot_size(slot) for slot in slots]
+
+    rest_size = max(sizes) - inline_size
+    if rest_size > 0:
+        rest = np.zeros([rest_size], dtype=np.uint8)
+        rest[: max(packed.size - inline_size, 0)] = packed[inline_size:]
+        out_tensor = paddle.empty([nranks * rest_size], dtype="uint8")
+        stream.all_gather(out_tensor, paddle.to_tensor(rest), group=group)
+        rests = out_tensor.numpy().reshape([nranks, rest_size])
+
+    results = []
+    for i, size in enumerate(sizes):
+        if size <= inline_size:
+            results.append(slots[i, SIZE_BYTES : SIZE_BYTES + size])
+        else:
+            results.append(
+                np.concatenate(
+                    [slots[i, SIZE_BYTES:], rests[i, : size - inline_size]]
+                )
+            )
+    return results
+
+
+def _tree_all_gather_bytes(packed, group, inline_size):
+    """
+    Gather the variable-length bytes of all ranks to the first rank of group
+    along a binomial tree, and broadcast them from it. It takes log2(nranks)
+    steps of point-to-point communication, and every rank only receives the
+    exact bytes of its subtree instead of the bytes padded to the max size.
+    """
+    nranks, rank = group.nranks, group.rank
+    # the bytes of the subtree of this rank, which are the sizes and bytes
+    # of the ranks [rank, rank + step) in order
+    chunks = [np.frombuffer(struct.pack("<Q", packed.size), np.uint8), packed]
+    step = 1
+    while step < nranks:
+        if rank & step:
+            parent = group.ranks[rank - step]
+            data = np.concatenate(chunks)
+            stream.send(
+                paddle.to_tensor([data.size], dtype="int64"),
+                dst=parent,
+                group=group,
+            )
+            stream.send(paddle.to_tensor(data), dst=parent, group=group)
+            break
+        if rank + step < nranks:
+            child = group.ranks[rank + step]
+            size_tensor = paddle.empty([1], dtype="int64")
+            stream.recv(size_tensor, src=child, group=group)
+            data_tensor = paddle.empty([int(size_tensor.item())], dtype="uint8")
+            stream.recv(data_tensor, src=child, group=group)
+            chunks.append(data_tensor.numpy())
+        step <<= 1
+
+    data = _broadcast_bytes(
+        np.concatenate(chunks) if rank == 0 else None,
+        group.ranks[0],
+        group,
+        inline_size,
+    )
+    results = []
+    offset = 0
+    for _ in range(nranks):
+        size = struct.unpack_from("<Q", memoryview(data[offset:]))[0]
+        offset += SIZE_BYTES
+        results.append(data[offset : offset + size])
+        offset += size
+    return results
+
+
+def all_gather_object_batch(
+    objects: Sequence[Any],
+    group: Group | None = None,
+    tree: bool = False,
+    inline_size: int = OBJECT_INLINE_SIZE,
+) -> list[list[Any]]:
+    """
+
+    Gather several picklable objects from all participators in one batch.
+    The objects of a rank are pickled together with protocol 5, and the
+    gathered bytes are variable-length instead of padded to the max length,
+    so it is much cheaper than calling all_gather_object for each object.
+
+    The sizes and the first inline_size bytes of all ranks are gathered by
+    one collective, the rest bytes are gathered by another one only if they
+    are more than inline_size on any rank.
+
+    Args:
+        objects (list): The picklable objects to send.
+        group (Group|None, optional): The group instance return by new_group or None for global default group.
+        tree (bool, optional): Whether to gather the objects along a binomial tree by point-to-point communication
+            and broadcast them, which takes log2(nranks) steps and avoids the padded all_gather buffer of
+            nranks * max_size bytes. It's useful for very large groups. Default: False.
+        inline_size (int, optional): The bytes of each rank gathered together with the sizes. Default: 4096.
+
+    Returns:
+        list[list]: The gathered objects, the i-th list contains the i-th objects of all ranks in the group.
+
+    Warning:
+        This API only supports the dygraph mode.
+
+    Examples:
+        .. code-block:: python
+
+            >>> # doctest: +REQUIRES(env: DISTRIBUTED)
+            >>> import paddle.distributed as dist
+            >>> from paddle.distributed.communication.all_gather import all_gather_object_batch
+
+            >>> dist.init_parallel_env()
+            >>> rank = dist.get_rank()
+            >>> names, sizes = all_gather_object_batch([f"rank{rank}", {"size": rank}])
+            >>> print(names, sizes)
+            >>> # ['rank0', 'rank1'] [{'size': 0}, {'size': 1}] (2 GPUs)
+    """
+    assert (
+        framework.in_dynamic_mode()
+    ), "all_gather_object_batch doesn't support static graph mode."
+
+    group = _get_global_group() if group is None else group
+    packed = pack_objects(objects)
+    if tree:
+        gathered = _tree_all_gather_bytes(packed, group, inline_size)
+    else:
+        gathered = _all_gather_bytes(packed, group, inline_size)
+    objects_of_ranks = [unpack_objects(data) for data in gathered]
+    return [list(objs) for objs in zip(*objects_of_ranks)]
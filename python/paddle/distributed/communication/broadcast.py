@@ -15,14 +15,20 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
+
 import paddle
 import paddle.distributed as dist
 from paddle import framework
 from paddle.distributed.communication import stream
 
 from .serialization_utils import (
-    convert_object_to_tensor,
-    convert_tensor_to_object,
+    OBJECT_INLINE_SIZE,
+    SIZE_BYTES,
+    pack_objects,
+    pack_slot,
+    unpack_objects,
+    unpack_slot_size,
 )
 
 if TYPE_CHECKING:
@@ -117,33 +123,33 @@ def broadcast_object_list(
         framework.in_dynamic_mode()
     ), "broadcast_object_list doesn't support static graph mode."
 
-    rank = dist.get_rank()
-    obj_tensors = []
-    obj_nums = len(object_list)
-
-    if rank == src:
-        obj_sizes = []
-        for obj in object_list:
-            obj_tensor, obj_size = convert_object_to_tensor(obj)
-            obj_tensors.append(obj_tensor)
-            obj_sizes.append(obj_size)
-        obj_size_tensor = paddle.stack(obj_sizes)
+    if dist.get_rank() == src:
+        _broadcast_bytes(pack_objects(object_list), src, group)
     else:
-        obj_size_tensor = paddle.empty([obj_nums], dtype="int64")
-    broadcast(obj_size_tensor, src, group)
+        object_list[:] = unpack_objects(_broadcast_bytes(None, src, group))
+
 
-    if rank == src:
-        # cast to uint8 to keep the same dtype
-        obj_data_tensor = paddle.concat(obj_tensors).cast("uint8")
+def _broadcast_bytes(packed, src, group, inline_size=OBJECT_INLINE_SIZE):
+    """
+    Broadcast variable-length bytes from src, packed is None on the other
+    ranks. The size and the first inline_size bytes are broadcast together,
+    and the rest bytes are broadcast only if there are more than them.
+    """
+    is_src = dist.get_rank() == src
+    if is_src:
+        slot_tensor = paddle.to_tensor(pack_slot(packed, inline_size))
     else:
-        data_len = paddle.sum(obj_size_tensor).item()
-        obj_data_tensor = paddle.empty([data_len], dtype="uint8")
-    broadcast(obj_data_tensor, src, group)
-
-    offset = 0
-    for i in range(obj_nums):
-        data_len = obj_size_tensor[i]
-        object_list[i] = convert_tensor_to_object(
-            obj_data_tensor[offset : offset + data_len], data_len
-        )
-        offset += data_len
+        slot_tensor = paddle.empty([SIZE_BYTES + inline_size], dtype="uint8")
+    broadcast(slot_tensor, src, group)
+    if is_src:
+        if packed.size > inline_size:
+            broadcast(paddle.to_tensor(packed[inline_size:]), src, group)
+        return packed
+
+    slot = slot_tensor.numpy()
+    size = unpack_slot_size(slot)
+    if size <= inline_size:
+        return slot[SIZE_BYTES : SIZE_BYTES + size]
+    rest_tensor = paddle.empty([size - inline_size], dtype="uint8")
+    broadcast(rest_tensor, src, group)
+    return np.concatenate([slot[SIZE_BYTES:], rest_tensor.numpy()])
@@ -14,6 +14,7 @@
 
 import io
 import pickle
+import struct
 
 import numpy as np
 
@@ -32,3 +33,78 @@ def convert_object_to_tensor(obj):
 def convert_tensor_to_object(tensor, len_of_tensor):
     _unpickler = pickle.Unpickler
     return _unpickler(io.BytesIO(tensor.numpy()[:len_of_tensor])).load()
+
+
+# The bytes of a size in the headers of the packed objects.
+SIZE_BYTES = 8
+# The bytes of each rank exchanged together with the sizes by the object
+# collectives, larger objects need another collective for the rest bytes.
+OBJECT_INLINE_SIZE = 4096
+
+
+def pack_objects(objs):
+    """
+    Pickle a list of objects with protocol 5 into one uint8 array. The
+    buffers of the objects supporting out-of-band pickling, like numpy
+    arrays, are appended after the pickle data without copy into it. The
+    layout is:
+
+        | pickle size | num buffers | buffer sizes ... | pickle | buffers ... |
+    """
+    buffers = []
+    data = pickle.dumps(list(objs), protocol=5, buffer_callback=buffers.append)
+    raws = [buffer.raw() for buffer in buffers]
+    header = struct.pack(
+        f"<{2 + len(raws)}Q",
+        len(data),
+        len(raws),
+        *(raw.nbytes for raw in raws),
+    )
+    packed = np.empty(
+        [len(header) + len(data) + sum(raw.nbytes for raw in raws)],
+        dtype=np.uint8,
+    )
+    offset = 0
+    for chunk in [header, data, *raws]:
+        chunk = np.frombuffer(chunk, dtype=np.uint8)
+        packed[offset : offset + chunk.size] = chunk
+        offset += chunk.size
+    return packed
+
+
+def unpack_objects(packed):
+    """
+    Unpickle the list of objects packed by pack_objects, the out-of-band
+    buffers are views of packed.
+    """
+    view = memoryview(packed).cast("B")
+    data_size, num_buffers = struct.unpack_from("<2Q", view)
+    buffer_sizes = struct.unpack_from(f"<{num_buffers}Q", view, 2 * SIZE_BYTES)
+    offset = (2 + num_buffers) * SIZE_BYTES
+    data = view[offset : offset + data_size]
+    offset += data_size
+    buffers = []
+    for size in buffer_sizes:
+        buffers.append(view[offset : offset + size])
+        offset += size
+    return pickle.loads(data, buffers=buffers)
+
+
+def pack_slot(packed, inline_size):
+    """
+    Put the size and the first inline_size bytes of packed into a slot,
+    the slots of all ranks are exchanged by one collective, and the rest
+    bytes are exchanged by another collective only if any of them is not
+    inlined.
+    """
+    slot = np.zeros([SIZE_BYTES + inline_size], dtype=np.uint8)
+    slot[:SIZE_BYTES] = np.frombuffer(
+        struct.pack("<Q", packed.size), dtype=np.uint8
+    )
+    head = min(packed.size, inline_size)
+    slot[SIZE_BYTES : SIZE_BYTES + head] = packed[:head]
+    return slot
+
+
+def unpack_slot_size(slot):
+    return struct.unpack_from("<Q", memoryview(slot[:SIZE_BYTES]))[0]
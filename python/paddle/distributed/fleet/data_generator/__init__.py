@@ -11,6 +11,10 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 
-from .data_generator import DataGenerator, MultiSlotDataGenerator  # noqa: F401
+from .data_generator import (  # noqa: F401
+    DataGenerator,
+    MultiSlotDataGenerator,
+    read_binary_records,
+)
 
 __all__ = []
@@ -13,14 +13,33 @@
 # limitations under the License.
 from __future__ import annotations
 
+import json
+import struct
 import sys
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Iterator, Sequence
+    from typing import BinaryIO
 
 __all__ = []
 
+# The binary record stream of MultiSlotDataGenerator is:
+#
+#   | magic (8 bytes) | names size (4 bytes) | JSON list of slot names |
+#   | record size (4 bytes) | record | record size | record | ...
+#
+# A record is the slots of a sample, each slot is its number of feasigns
+# (4 bytes), its type (1 byte, 0 for uint64 and 1 for float) and the
+# feasigns in little endian uint64 or float32. All the sizes are little
+# endian uint32.
+_BINARY_MAGIC = b"PDMSLOT1"
+_SLOT_TYPES = ("uint64", "float")
+_SLOT_DTYPES = (np.dtype("<u8"), np.dtype("<f4"))
+_SLOT_HEADER = struct.Struct("<IB")
+
 
 class DataGenerator:
     """
@@ -33,6 +52,8 @@ class DataGenerator:
     def __init__(self):
         self._proto_info = None
         self.batch_size_ = 32
+        self._output_format = "text"
+        self._binary_header_written = False
 
     def set_batch(self, batch_size):
         '''
@@ -61,6 +82,50 @@ class DataGenerator:
         '''
         self.batch_size_ = batch_size
 
+    def set_output_format(self, output_format):
+        '''
+        Set the output format of current DataGenerator, "text" is the lines
+        read by the MultiSlotDataFeed, "binary" is a compact record stream
+        read by :func:`read_binary_records`, which is only supported by
+        MultiSlotDataGenerator.
+
+        Example:
+
+            .. code-block:: python
+
+                >>> import paddle.distributed.fleet.data_generator as dg
+                >>> class MyData(dg.MultiSlotDataGenerator):
+                ...     def generate_sample(self, line):
+                ...         def local_iter():
+                ...             int_words = [int(x) for x in line.split()]
+                ...             yield ("words", int_words)
+                ...         return local_iter
+                >>> mydata = MyData()
+                >>> mydata.set_output_format("binary")
+
+        '''
+        if output_format not in ("text", "binary"):
+            raise ValueError(
+                f"output_format should be 'text' or 'binary', but received {output_format}."
+            )
+        self._output_format = output_format
+
+    def _write_batch(self, batch_samples):
+        batch_iter = self.generate_batch(batch_samples)
+        # format and write a batch of samples at once
+        if self._output_format == "binary":
+            out = getattr(sys.stdout, "buffer", sys.stdout)
+            if out is not sys.stdout:
+                sys.stdout.flush()
+            out.write(self._gen_bytes(list(batch_iter())))
+        else:
+            sys.stdout.write("".join(self._gen_str(s) for s in batch_iter()))
+
+    def _flush(self):
+        if self._output_format == "binary":
+            getattr(sys.stdout, "buffer", sys.stdout).flush()
+        sys.stdout.flush()
+
     def run_from_memory(self):
         '''
         This function generator data from memory, it is usually used for
@@ -86,14 +151,11 @@ class DataGenerator:
                 continue
             batch_samples.append(user_parsed_line)
             if len(batch_samples) == self.batch_size_:
-                batch_iter = self.generate_batch(batch_samples)
-                for sample in batch_iter():
-                    sys.stdout.write(self._gen_str(sample))
+                self._write_batch(batch_samples)
                 batch_samples = []
         if len(batch_samples) > 0:
-            batch_iter = self.generate_batch(batch_samples)
-            for sample in batch_iter():
-                sys.stdout.write(self._gen_str(sample))
+            self._write_batch(batch_samples)
+        self._flush()
 
     def run_from_stdin(self):
         '''
@@ -126,14 +188,11 @@ class DataGenerator:
                     continue
                 batch_samples.append(user_parsed_line)
                 if len(batch_samples) == self.batch_size_:
-                    batch_iter = self.generate_batch(batch_samples)
-                    for sample in batch_iter():
-                        sys.stdout.write(self._gen_str(sample))
+                    self._write_batch(batch_samples)
                     batch_samples = []
         if len(batch_samples) > 0:
-            batch_iter = self.generate_batch(batch_samples)
-            for sample in batch_iter():
-                sys.stdout.write(self._gen_str(sample))
+            self._write_batch(batch_samples)
+        self._flush()
 
     def _gen_str(self, line):
         '''
@@ -151,6 +210,22 @@ class DataGenerator:
             "pls use MultiSlotDataGenerator or PairWiseDataGenerator"
         )
 
+    def _gen_bytes(self, samples):
+        '''
+        Encode a batch of the outputs of the process() function rewritten
+        by user into the binary record stream.
+
+        Args:
+            samples(list): the outputs of the process() function.
+
+        Returns:
+            Return the bytes of the records, beginning with the header of
+            the stream if it is the first batch.
+        '''
+        raise NotImplementedError(
+            "the binary output format is only supported by MultiSlotDataGenerator"
+        )
+
     def generate_sample(self, line):
         '''
         This function needs to be overridden by the user to process the
@@ -285,7 +360,7 @@ class MultiSlotStringDataGenerator(DataGenerator):
 class MultiSlotDataGenerator(DataGenerator):
     def _gen_str(
         self,
-        line: Sequence[tuple[str, list[float]]],
+        line: Sequence[tuple[str, list[float] | np.ndarray]],
     ) -> str:
         '''
         Further processing the output of the process() function rewritten by
@@ -295,6 +370,8 @@ class MultiSlotDataGenerator(DataGenerator):
         The input line will be in this format:
             >>> [(name, [feasign, ...]), ...]
             >>> or ((name, [feasign, ...]), ...)
+        where the feasigns of a slot can also be a 1-D numpy.ndarray, whose
+        type is checked once by its dtype.
         The output will be in this format:
             >>> [ids_num id1 id2 ...] ...
         The proto_info will be in this format:
@@ -314,73 +391,191 @@ class MultiSlotDataGenerator(DataGenerator):
         Returns:
             Return a string data that can be read directly by the MultiSlotDataFeed.
         '''
+        output = []
+        for _, elements in self._check_line(line):
+            if isinstance(elements, np.ndarray):
+                elements = elements.tolist()
+            output.append(str(len(elements)))
+            output.append(" ".join(map(str, elements)))
+        return " ".join(output) + "\n"
+
+    def _check_line(self, line):
+        """
+        Check the names and feasigns of the slots of a line and update the
+        proto_info, the type of a slot becomes float once a float feasign
+        appears.
+        """
         if isinstance(line, zip):
             line = list(line)
-
-        if not isinstance(line, list) and not isinstance(line, tuple):
+        if not isinstance(line, (list, tuple)):
             raise ValueError(
                 "the output of process() must be in list or tuple type"
                 "Example: [('words', [1926, 08, 17]), ('label', [1])]"
             )
-        output = ""
-
         if self._proto_info is None:
-            self._proto_info = []
-            for item in line:
-                name, elements = item
-                if not isinstance(name, str):
-                    raise ValueError(f"name{type(name)} must be in str type")
-                if not isinstance(elements, list):
-                    raise ValueError(
-                        f"elements{type(elements)} must be in list type"
-                    )
-                if not elements:
-                    raise ValueError(
-                        "the elements of each field can not be empty, you need padding it in process()."
-                    )
-                self._proto_info.append((name, "uint64"))
-                if output:
-                    output += " "
-                output += str(len(elements))
-                for elem in elements:
-                    if isinstance(elem, float):
-                        self._proto_info[-1] = (name, "float")
-                    elif not isinstance(elem, int):
-                        raise ValueError(
-                            f"the type of element{type(elem)} must be in int or float"
-                        )
-                    output += " " + str(elem)
+            proto_info = []
+        elif len(line) != len(self._proto_info):
+            raise ValueError(
+                "the complete field set of two given line are inconsistent."
+            )
         else:
-            if len(line) != len(self._proto_info):
+            proto_info = self._proto_info
+        for index, item in enumerate(line):
+            name, elements = item
+            if not isinstance(name, str):
+                raise ValueError(f"name{type(name)} must be in str type")
+            if not isinstance(elements, (list, np.ndarray)):
                 raise ValueError(
-                    "the complete field set of two given line are inconsistent."
+                    f"elements{type(elements)} must be in list or numpy.ndarray type"
                 )
-            for index, item in enumerate(line):
-                name, elements = item
-                if not isinstance(name, str):
-                    raise ValueError(f"name{type(name)} must be in str type")
-                if not isinstance(elements, list):
-                    raise ValueError(
-                        f"elements{type(elements)} must be in list type"
-                    )
-                if not elements:
-                    raise ValueError(
-                        "the elements of each field can not be empty, you need padding it in process()."
-                    )
-                if name != self._proto_info[index][0]:
+            if len(elements) == 0:
+                raise ValueError(
+                    "the elements of each field can not be empty, you need padding it in process()."
+                )
+            if proto_info is self._proto_info:
+                if name != proto_info[index][0]:
                     raise ValueError(
-                        f"the field name of two given line are not match: require<{self._proto_info[index][0]}>, get<{name}>."
+                        f"the field name of two given line are not match: require<{proto_info[index][0]}>, get<{name}>."
                     )
-                if output:
-                    output += " "
-                output += str(len(elements))
-                for elem in elements:
-                    if self._proto_info[index][1] != "float":
-                        if isinstance(elem, float):
-                            self._proto_info[index] = (name, "float")
-                        elif not isinstance(elem, int):
-                            raise ValueError(
-                                f"the type of element{type(elem)} must be in int or float"
-                            )
-                    output += " " + str(elem)
-        return output + "\n"
+                if proto_info[index][1] == "float":
+                    continue
+            else:
+                proto_info.append((name, "uint64"))
+            if self._is_float_slot(elements):
+                proto_info[index] = (name, "float")
+        self._proto_info = proto_info
+        return line
+
+    @staticmethod
+    def _is_float_slot(elements):
+        if isinstance(elements, np.ndarray):
+            # the type of a numpy slot is checked once by its dtype
+            if elements.ndim != 1:
+                raise ValueError(
+                    f"the elements of numpy.ndarray type must be 1-D, but received shape {elements.shape}"
+                )
+            # bool is rejected, it is formatted as True/False which can not
+            # be parsed by the MultiSlotDataFeed
+            if elements.dtype.kind in "iu":
+                return False
+            if elements.dtype.kind == "f":
+                return True
+            raise ValueError(
+                f"the dtype of elements{elements.dtype} must be int or float"
+            )
+        is_float = False
+        for elem in elements:
+            if isinstance(elem, float):
+                is_float = True
+            elif not isinstance(elem, int):
+                raise ValueError(
+                    f"the type of element{type(elem)} must be in int or float"
+                )
+        return is_float
+
+    def _gen_bytes(
+        self,
+        samples: Sequence[Sequence[tuple[str, list[float] | np.ndarray]]],
+    ) -> bytes:
+        '''
+        Encode a batch of the outputs of the process() function rewritten
+        by user into the binary record stream read by :func:`read_binary_records`.
+        The feasigns of a slot are int or float, they are written as uint64
+        or float32 by the type of the slot in the proto_info.
+
+        Args:
+            samples(list): the outputs of the process() function.
+
+        Returns:
+            Return the bytes of the records, beginning with the header of
+            the stream if it is the first batch.
+        '''
+        parts = []
+        for line in samples:
+            line = self._check_line(line)
+            if not self._binary_header_written:
+                names = json.dumps([name for name, _ in self._proto_info])
+                names = names.encode("utf-8")
+                parts.append(_BINARY_MAGIC)
+                parts.append(struct.pack("<I", len(names)))
+                parts.append(names)
+                self._binary_header_written = True
+            record = []
+            for index, (_, elements) in enumerate(line):
+                slot_type = int(self._proto_info[index][1] == "float")
+                record.append(_SLOT_HEADER.pack(len(elements), slot_type))
+                record.append(
+                    np.asarray(elements)
+                    .astype(_SLOT_DTYPES[slot_type], copy=False)
+                    .tobytes()
+                )
+            record = b"".join(record)
+            parts.append(struct.pack("<I", len(record)))
+            parts.append(record)
+        return b"".join(parts)
+
+
+def read_binary_records(
+    stream: BinaryIO,
+) -> Iterator[list[tuple[str, np.ndarray]]]:
+    """
+    Read the binary record stream written by a MultiSlotDataGenerator with
+    the "binary" output format.
+
+    Args:
+        stream(BinaryIO): The binary stream, e.g. ``sys.stdin.buffer`` or
+            a file opened in "rb" mode.
+
+    Returns:
+        An iterator of the samples, each sample is a list of the slot names
+        and the feasigns in numpy.ndarray of uint64 or float32.
+
+    Example:
+
+        .. code-block:: python
+
+            >>> # doctest: +SKIP('depend on external file')
+            >>> import numpy as np
+            >>> import paddle.distributed.fleet.data_generator as dg
+            >>> class MyData(dg.MultiSlotDataGenerator):
+            ...     def generate_sample(self, line):
+            ...         def local_iter():
+            ...             ids = np.array(line.split(), dtype=np.int64)
+            ...             yield ("words", ids), ("label", [1])
+            ...         return local_iter
+            >>> mydata = MyData()
+            >>> mydata.set_output_format("binary")
+            >>> # cat data.txt | python my_data.py > data.bin
+            >>> mydata.run_from_stdin()
+
+            >>> with open("data.bin", "rb") as f:
+            ...     for sample in dg.read_binary_records(f):
+            ...         print(sample)
+            [('words', array([1, 2, 3], dtype=uint64)), ('label', array([1], dtype=uint64))]
+    """
+    magic = stream.read(len(_BINARY_MAGIC))
+    if not magic:
+        return
+    if magic != _BINARY_MAGIC:
+        raise ValueError(
+            "The stream is not written in the binary format of MultiSlotDataGenerator."
+        )
+    (names_size,) = struct.unpack("<I", stream.read(4))
+    names = json.loads(stream.read(names_size).decode("utf-8"))
+    while True:
+        size = stream.read(4)
+        if not size:
+            return
+        (size,) = struct.unpack("<I", size)
+        record = stream.read(size)
+        if len(record) != size:
+            raise ValueError("The binary record stream is truncated.")
+        sample = []
+        offset = 0
+        for name in names:
+            count, slot_type = _SLOT_HEADER.unpack_from(record, offset)
+            offset += _SLOT_HEADER.size
+            dtype = _SLOT_DTYPES[slot_type]
+            sample.append((name, np.frombuffer(record, dtype, count, offset)))
+            offset += count * dtype.itemsize
+        yield sample
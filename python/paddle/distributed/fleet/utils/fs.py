@@ -23,7 +23,9 @@ import os
 import re
 import shutil
 import subprocess
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import TYPE_CHECKING, Callable, Literal, TypedDict, TypeVar
 
 # (TODO: GhostScreaming) It will be removed later.
@@ -130,6 +132,38 @@ class FS:
     def cat(self, fs_path=None):
         raise NotImplementedError
 
+    def batch_mkdirs(self, fs_paths):
+        """
+        Create the directories, the file systems which can create multiple
+        directories in one command override it.
+        """
+        for fs_path in fs_paths:
+            self.mkdirs(fs_path)
+
+    def batch_upload(self, local_paths, fs_dir):
+        """
+        Upload the local files into the existing directory fs_dir, the
+        existing files are overwritten. The file systems which can upload
+        multiple files in one command override it.
+        """
+        for local_path in local_paths:
+            fs_path = f"{fs_dir}/{os.path.basename(local_path)}"
+            if self.is_exist(fs_path):
+                self.delete(fs_path)
+            self.upload(local_path, fs_path)
+
+    def batch_download(self, fs_paths, local_dir):
+        """
+        Download the files into the existing local directory local_dir, the
+        existing files are overwritten. The file systems which can download
+        multiple files in one command override it.
+        """
+        for fs_path in fs_paths:
+            local_path = os.path.join(local_dir, os.path.basename(fs_path))
+            if os.path.exists(local_path):
+                os.remove(local_path)
+            self.download(fs_path, local_path)
+
 
 class LocalFS(FS):
     """
@@ -229,6 +263,15 @@ class LocalFS(FS):
         """
         os.rename(fs_src_path, fs_dst_path)
 
+    def batch_upload(self, local_paths: list[str], fs_dir: str) -> None:
+        for local_path in local_paths:
+            shutil.copyfile(
+                local_path, os.path.join(fs_dir, os.path.basename(local_path))
+            )
+
+    def batch_download(self, fs_paths: list[str], local_dir: str) -> None:
+        self.batch_upload(fs_paths, local_dir)
+
     def _rmr(self, fs_path):
         shutil.rmtree(fs_path)
 
@@ -534,7 +577,7 @@ class HDFSClient(FS):
         for x in range(retry_times + 1):
             ret, output = core.shell_execute_cmd(exe_cmd, 0, 0, redirect_stderr)
             ret = int(ret)
-            if ret == 0:
+            if ret == 0 or x == retry_times:
                 break
             time.sleep(retry_sleep_second)
         if ret == 134:
@@ -984,6 +1027,48 @@ class HDFSClient(FS):
             local_fs.delete(local_path)
             raise e
 
+    def batch_mkdirs(self, fs_paths: list[str]) -> None:
+        cmd = f"mkdir -p {' '.join(fs_paths)}"
+        ret, _ = self._run_cmd(cmd)
+        if ret != 0:
+            raise ExecuteError(cmd)
+
+    def batch_upload(self, local_paths: list[str], fs_dir: str) -> None:
+        cmd = f"put -f {' '.join(local_paths)} {fs_dir}"
+        ret, _ = self._run_cmd(cmd)
+        if ret != 0:
+            raise ExecuteError(cmd)
+
+    def batch_download(
+        self, fs_paths: list[str], local_dir: str, retry_times: int = 5
+    ) -> None:
+        # `get` does not overwrite the local files, and a failed `get` may
+        # leave some of them, so they are removed before every attempt and
+        # after the last failure
+        local_paths = [
+            os.path.join(local_dir, os.path.basename(fs_path))
+            for fs_path in fs_paths
+        ]
+
+        def remove_local_files():
+            for local_path in local_paths:
+                if os.path.exists(local_path):
+                    os.remove(local_path)
+
+        cmd = f"get {' '.join(fs_paths)} {local_dir}"
+        try:
+            for x in range(retry_times + 1):
+                if x > 0:
+                    time.sleep(float(self._sleep_inter) / 1000.0)
+                remove_local_files()
+                ret, _ = self._run_cmd(cmd, retry_times=0)
+                if ret == 0:
+                    return
+            raise ExecuteError(cmd)
+        except Exception:
+            remove_local_files()
+            raise
+
     @_handle_errors()
     def mkdirs(self, fs_path: str) -> None:
         """
@@ -1701,3 +1786,402 @@ class AFSClient(FS):
             begin += blocks[i]
 
         return trainer_files[trainer_id]
+
+
+class FSMetadataCache:
+    """
+    A cache of the results of `ls_dir`, `is_exist` and `is_dir` of a file
+    system, every result expires after ttl seconds. The listing of a
+    directory also answers whether its children exist and are directories.
+
+    Args:
+        ttl(float): The seconds a result is valid. Default: 30.
+    """
+
+    def __init__(self, ttl: float = 30.0) -> None:
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _norm(fs_path):
+        return fs_path.rstrip("/") or "/"
+
+    def _get(self, kind, fs_path):
+        entry = self._entries.get((kind, self._norm(fs_path)))
+        if entry is None or entry[0] < time.time():
+            return None
+        return entry[1]
+
+    def get(self, kind: str, fs_path: str):
+        """
+        Get the cached result of kind (`ls`, `exist` or `dir`) for fs_path,
+        return None if it is not cached or expired.
+        """
+        with self._lock:
+            value = self._get(kind, fs_path)
+            if value is None and kind != "ls":
+                # answer from the listing of the parent directory
+                fs_path = self._norm(fs_path)
+                listing = self._get("ls", os.path.dirname(fs_path))
+                if listing is not None:
+                    name = os.path.basename(fs_path)
+                    is_dir = name in listing[0]
+                    if kind == "dir":
+                        value = is_dir
+                    else:
+                        value = is_dir or name in listing[1]
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def put(self, kind: str, fs_path: str, value) -> None:
+        with self._lock:
+            self._entries[(kind, self._norm(fs_path))] = (
+                time.time() + self.ttl,
+                value,
+            )
+
+    def invalidate(self, fs_path: str | None = None) -> None:
+        """
+        Remove the results of fs_path, its descendants and its parent, or
+        all the results if fs_path is None.
+        """
+        with self._lock:
+            if fs_path is None:
+                self._entries.clear()
+                return
+            fs_path = self._norm(fs_path)
+            parent = os.path.dirname(fs_path)
+            for key in list(self._entries):
+                path = key[1]
+                if (
+                    path == fs_path
+                    or path == parent
+                    or path.startswith(fs_path + "/")
+                ):
+                    del self._entries[key]
+
+
+class TransferMetrics:
+    """
+    The throughput and latency of the commands run by FSTransferEngine.
+    """
+
+    def __init__(self) -> None:
+        self.files = 0
+        self.bytes = 0
+        self.commands = 0
+        self.failed_commands = 0
+        self.latencies = []
+        self.start_time = time.time()
+        self.end_time = None
+        self._lock = threading.Lock()
+
+    def record(
+        self, num_files: int, num_bytes: int, latency: float, ok: bool
+    ) -> None:
+        with self._lock:
+            self.commands += 1
+            self.latencies.append(latency)
+            if ok:
+                self.files += num_files
+                self.bytes += num_bytes
+            else:
+                self.failed_commands += 1
+
+    def finish(self) -> None:
+        self.end_time = time.time()
+
+    def summary(self) -> dict[str, float]:
+        """
+        Get the counters, the throughput in bytes and files per second, and
+        the latency percentiles of the commands in seconds.
+        """
+        with self._lock:
+            elapsed = (self.end_time or time.time()) - self.start_time
+            latencies = sorted(self.latencies)
+
+        def percentile(q):
+            if not latencies:
+                return 0.0
+            return latencies[min(int(q * len(latencies)), len(latencies) - 1)]
+
+        return {
+            "files": self.files,
+            "bytes": self.bytes,
+            "commands": self.commands,
+            "failed_commands": self.failed_commands,
+            "elapsed": elapsed,
+            "bytes_per_second": self.bytes / elapsed if elapsed > 0 else 0.0,
+            "files_per_second": self.files / elapsed if elapsed > 0 else 0.0,
+            "latency_p50": percentile(0.5),
+            "latency_p99": percentile(0.99),
+            "latency_max": latencies[-1] if latencies else 0.0,
+        }
+
+
+class FSTransferEngine:
+    """
+    Transfer directory trees between the local file system and a file
+    system such as HDFSClient or AFSClient with a bounded pool of workers.
+
+    The files of a directory are transferred in batches, each batch runs
+    one command of the file system, e.g. `hadoop fs -put -f f1 f2 ... dir`.
+    The remote directories are listed by the workers while the batches of
+    the listed directories are transferred. The results of `ls_dir`,
+    `is_exist` and `is_dir` are cached for cache_ttl seconds.
+
+    Args:
+        fs(FS): The file system, e.g. HDFSClient, AFSClient or LocalFS.
+        num_workers(int, optional): The max number of the commands running
+            at the same time. Default: 8.
+        batch_size(int, optional): The max number of the files transferred
+            by one command. Default: 64.
+        batch_bytes(int, optional): The max bytes of the files uploaded by
+            one command, a larger file is uploaded alone. Default: 256MB.
+        cache_ttl(float, optional): The seconds the metadata is cached,
+            0 disables the cache. Default: 30.
+
+    Examples:
+
+        .. code-block:: python
+
+            >>> # doctest: +SKIP('depend on external file')
+            >>> from paddle.distributed.fleet.utils.fs import (
+            ...     FSTransferEngine,
+            ...     HDFSClient,
+            ... )
+
+            >>> hadoop_home = "/home/client/hadoop-client/hadoop/"
+            >>> configs = {
+            ...     "fs.default.name": "hdfs://xxx.hadoop.com:54310",
+            ...     "hadoop.job.ugi": "hello,hello123"
+            ... }
+
+            >>> engine = FSTransferEngine(HDFSClient(hadoop_home, configs))
+            >>> metrics = engine.upload("./checkpoint", "hdfs:/checkpoint")
+            >>> print(metrics.summary()["bytes_per_second"])
+            >>> metrics = engine.download("hdfs:/checkpoint", "./checkpoint")
+
+    """
+
+    def __init__(
+        self,
+        fs: FS,
+        num_workers: int = 8,
+        batch_size: int = 64,
+        batch_bytes: int = 256 << 20,
+        cache_ttl: float = 30.0,
+    ) -> None:
+        assert num_workers > 0, "num_workers should be positive."
+        assert batch_size > 0, "batch_size should be positive."
+        self._fs = fs
+        self.num_workers = num_workers
+        self.batch_size = batch_size
+        self.batch_bytes = batch_bytes
+        self.cache = FSMetadataCache(cache_ttl) if cache_ttl > 0 else None
+
+    def _cached(self, kind, fs_path, f):
+        if self.cache is None:
+            return f(fs_path)
+        value = self.cache.get(kind, fs_path)
+        if value is None:
+            value = f(fs_path)
+            self.cache.put(kind, fs_path, value)
+        return value
+
+    def ls_dir(self, fs_path: str) -> tuple[list[str], list[str]]:
+        def ls_dir(fs_path):
+            dirs, files = self._fs.ls_dir(fs_path)
+            # AFSClient lists the full paths
+            return (
+                [os.path.basename(d.rstrip("/")) for d in dirs],
+                [os.path.basename(f) for f in files],
+            )
+
+        return self._cached("ls", fs_path, ls_dir)
+
+    def is_exist(self, fs_path: str) -> bool:
+        return self._cached("exist", fs_path, self._fs.is_exist)
+
+    def is_dir(self, fs_path: str) -> bool:
+        return self._cached("dir", fs_path, self._fs.is_dir)
+
+    def invalidate(self, fs_path: str | None = None) -> None:
+        """
+        Drop the cached metadata of fs_path, or of all the paths if None,
+        e.g. after the remote files are changed by others.
+        """
+        if self.cache is not None:
+            self.cache.invalidate(fs_path)
+
+    @staticmethod
+    def _run(metrics, f, paths, *args):
+        # f returns the bytes transferred
+        start = time.time()
+        try:
+            num_bytes = f(paths, *args)
+        except Exception as e:
+            metrics.record(0, 0, time.time() - start, False)
+            logger.warning(f"Failed to run {f.__name__} of {paths}: {e}")
+            return e
+        metrics.record(
+            len(paths) if num_bytes is not None else 0,
+            num_bytes or 0,
+            time.time() - start,
+            True,
+        )
+        return None
+
+    def _split(self, paths, sizes=None):
+        batch, batch_bytes = [], 0
+        for i, path in enumerate(paths):
+            size = sizes[i] if sizes is not None else 0
+            if batch and (
+                len(batch) >= self.batch_size
+                or batch_bytes + size > self.batch_bytes
+            ):
+                yield batch, batch_bytes
+                batch, batch_bytes = [], 0
+            batch.append(path)
+            batch_bytes += size
+        if batch:
+            yield batch, batch_bytes
+
+    @staticmethod
+    def _raise_errors(errors, metrics):
+        metrics.finish()
+        if errors:
+            raise ExecuteError(
+                f"{len(errors)} of {metrics.commands} transfer commands failed, the first error: {errors[0]}"
+            )
+
+    def upload(self, local_path: str, fs_dir: str) -> TransferMetrics:
+        """
+        Upload the files under the local directory local_path into fs_dir
+        keeping the relative paths, or the local file local_path into
+        fs_dir. The existing remote files are overwritten.
+
+        Returns:
+            TransferMetrics: The metrics of the upload.
+        """
+        if not os.path.exists(local_path):
+            raise FSFileNotExistsError(f"{local_path} not exists")
+        fs_dir = fs_dir.rstrip("/")
+        metrics = TransferMetrics()
+
+        # the local directories and files mapped to the remote directories
+        dir_files = []
+        if os.path.isdir(local_path):
+            for root, _, files in os.walk(local_path):
+                rel = os.path.relpath(root, local_path)
+                remote = fs_dir if rel == "." else f"{fs_dir}/{rel}"
+                dir_files.append(
+                    (remote, [os.path.join(root, f) for f in sorted(files)])
+                )
+        else:
+            dir_files.append((fs_dir, [local_path]))
+
+        def mkdirs(fs_dirs):
+            self._fs.batch_mkdirs(fs_dirs)
+
+        def upload(local_paths, fs_dir, num_bytes):
+            self._fs.batch_upload(local_paths, fs_dir)
+            return num_bytes
+
+        errors = []
+        with ThreadPoolExecutor(self.num_workers) as pool:
+            futures = [
+                pool.submit(self._run, metrics, mkdirs, batch)
+                for batch, _ in self._split([d for d, _ in dir_files])
+            ]
+            errors.extend(e for e in (f.result() for f in futures) if e)
+            self._raise_errors(errors, metrics)
+
+            futures = []
+            for remote, files in dir_files:
+                sizes = [os.path.getsize(f) for f in files]
+                for batch, num_bytes in self._split(files, sizes):
+                    futures.append(
+                        pool.submit(
+                            self._run, metrics, upload, batch, remote, num_bytes
+                        )
+                    )
+            errors.extend(e for e in (f.result() for f in futures) if e)
+        self.invalidate(fs_dir)
+        self._raise_errors(errors, metrics)
+        return metrics
+
+    def download(self, fs_path: str, local_dir: str) -> TransferMetrics:
+        """
+        Download the files under the remote directory fs_path into the
+        local directory local_dir keeping the relative paths, or the remote
+        file fs_path into local_dir. The existing local files are
+        overwritten.
+
+        Returns:
+            TransferMetrics: The metrics of the download.
+        """
+        if not self.is_exist(fs_path):
+            raise FSFileNotExistsError(f"{fs_path} not exists")
+        fs_path = fs_path.rstrip("/")
+        metrics = TransferMetrics()
+        os.makedirs(local_dir, exist_ok=True)
+
+        def download(fs_paths, local_dir):
+            self._fs.batch_download(fs_paths, local_dir)
+            # count the bytes by the downloaded files
+            return sum(
+                os.path.getsize(os.path.join(local_dir, os.path.basename(p)))
+                for p in fs_paths
+            )
+
+        def list_dir(fs_path, local_dir):
+            dirs, files = self.ls_dir(fs_path)
+            os.makedirs(local_dir, exist_ok=True)
+            return dirs, files
+
+        if not self.is_dir(fs_path):
+            error = self._run(metrics, download, [fs_path], local_dir)
+            self._raise_errors([error] if error else [], metrics)
+            return metrics
+
+        errors = []
+        with ThreadPoolExecutor(self.num_workers) as pool:
+            pending = {
+                pool.submit(list_dir, fs_path, local_dir): (fs_path, local_dir)
+            }
+            # transfer the files of a directory once it is listed, while
+            # the other directories are being listed
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    remote, local = pending.pop(future)
+                    if remote is None:
+                        if future.result():
+                            errors.append(future.result())
+                        continue
+                    dirs, files = future.result()
+                    for d in dirs:
+                        pending[
+                            pool.submit(
+                                list_dir,
+                                f"{remote}/{d}",
+                                os.path.join(local, d),
+                            )
+                        ] = (f"{remote}/{d}", os.path.join(local, d))
+                    for batch, _ in self._split(
+                        [f"{remote}/{f}" for f in files]
+                    ):
+                        pending[
+                            pool.submit(
+                                self._run, metrics, download, batch, local
+                            )
+                        ] = (None, None)
+        self._raise_errors(errors, metrics)
+        return metrics
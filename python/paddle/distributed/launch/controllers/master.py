@@ -24,6 +24,8 @@ from paddle.distributed.launch.utils.kv_client import KVClient
 from paddle.distributed.launch.utils.kv_server import KVServer
 
 ETCD_PROTOCAL = 'etcd://'
+# The max seconds of a long poll waiting for the peers in HTTPMaster.
+SYNC_WAIT_TIMEOUT = 10
 
 
 def _cmp_by_ip(x):
@@ -154,13 +156,19 @@ class HTTPMaster(Master):
         ky = 'aaaaaa' if rank < 0 and self.role == Master.MAIN else key
         k = f"{prefix}/{ky}/{rank}"
 
+        put_done = False
         while not self.ctx.status.is_done():
-            if not self.client.put(k, value):
+            if not put_done and not self.client.put(k, value):
                 self.ctx.logger.warning("put value failed")
                 time.sleep(0.1)
                 continue
+            put_done = True
 
-            rjson = self.client.get_prefix(prefix)
+            # block in the server until all the peers put, the timeout is
+            # short to check the status of the job
+            rjson = self.client.wait_prefix(
+                prefix, size, timeout=SYNC_WAIT_TIMEOUT
+            )
             self.ctx.logger.debug(f"sync peers {rjson}")
             if rjson and len(rjson) == size:
                 if self.ctx.args.sort_ip:
@@ -58,6 +58,26 @@ class KVClient:
         except:
             return ""
 
+    def wait_prefix(self, key, size, timeout=30):
+        """
+        Block until there are at least size keys under the prefix key and
+        get them, return None if timeout or failed.
+        """
+        key = key if key.startswith('/') else f"/{key}"
+        u = f"{self.endpoint}{key}"
+        try:
+            r = httpx.get(
+                u,
+                params={"wait": size, "timeout": timeout},
+                timeout=None,
+                follow_redirects=True,
+            )
+            if r.status_code == 200:
+                return r.json()
+        except:
+            pass
+        return None
+
     def delete(self, key):
         key = key if key.startswith('/') else f"/{key}"
         u = f"{self.endpoint}{key}"
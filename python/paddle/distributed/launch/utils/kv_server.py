@@ -12,26 +12,121 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import argparse
+import bisect
 import http.server as SimpleHTTPServer
 import json
 import threading
-from http.server import HTTPServer
+import time
+from http.server import ThreadingHTTPServer
 from multiprocessing import Process
+from urllib.parse import parse_qs, urlsplit
 
 from .topology import SingleNodeTopology
 
+# The default max seconds a GET request with `wait` blocks for the keys.
+DEFAULT_WAIT_TIMEOUT = 30
+
+
+class KVStore:
+    """
+    A key value store indexed by the sorted keys, so that the keys under a
+    prefix are found by bisection instead of a scan of all the keys.
+
+    The waiters of the same prefix and size share one event, which is set
+    by the put making the number of keys under the prefix reach the size.
+    """
+
+    def __init__(self):
+        self._kv = {}
+        self._keys = []
+        self._lock = threading.Lock()
+        self._waiters = {}
+
+    @staticmethod
+    def _prefix_end(prefix):
+        # the least string greater than all the strings starting with prefix
+        return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+    def _range(self, prefix):
+        lo = bisect.bisect_left(self._keys, prefix)
+        if not prefix:
+            return lo, len(self._keys)
+        return lo, bisect.bisect_left(self._keys, self._prefix_end(prefix), lo)
+
+    def _count(self, prefix):
+        lo, hi = self._range(prefix)
+        return hi - lo
+
+    def put(self, key, value):
+        with self._lock:
+            if key not in self._kv:
+                bisect.insort(self._keys, key)
+            self._kv[key] = value
+            for prefix, size in list(self._waiters):
+                if key.startswith(prefix) and self._count(prefix) >= size:
+                    self._waiters.pop((prefix, size)).set()
+
+    def get(self, key):
+        with self._lock:
+            return self._kv.get(key)
+
+    def get_prefix(self, prefix):
+        with self._lock:
+            lo, hi = self._range(prefix)
+            return {key: self._kv[key] for key in self._keys[lo:hi]}
+
+    def delete(self, key):
+        with self._lock:
+            if key not in self._kv:
+                return False
+            del self._kv[key]
+            del self._keys[bisect.bisect_left(self._keys, key)]
+            return True
+
+    def wait_prefix(self, prefix, size, timeout=None):
+        """
+        Block until there are at least size keys under prefix, return False
+        if timeout.
+        """
+        with self._lock:
+            if self._count(prefix) >= size:
+                return True
+            event = self._waiters.setdefault((prefix, size), threading.Event())
+        return event.wait(timeout)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._kv)
+
 
 class KVHandler(SimpleHTTPServer.SimpleHTTPRequestHandler):
     def do_GET(self):
-        with self.server.kv_lock:
-            ret = {}
-            for k, v in self.server.kv.items():
-                if k.startswith(self.path):
-                    ret[k] = v.decode(encoding="utf-8")
-            if ret:
-                self.output(200, json.dumps(ret).encode("utf-8"))
-            else:
-                self.output(404)
+        """
+        Get the keys and values under the prefix of path. With the query
+        `?wait=N&timeout=T`, the request blocks until there are at least N
+        keys under the prefix, and responds 408 if not in T seconds.
+        """
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        try:
+            if "wait" in query:
+                size = int(query["wait"][0])
+                timeout = float(query.get("timeout", [DEFAULT_WAIT_TIMEOUT])[0])
+                if not self.server.kv.wait_prefix(url.path, size, timeout):
+                    self.output(408)
+                    return
+        except ValueError:
+            self.output(400)
+            return
+        ret = {
+            k: v.decode(encoding="utf-8")
+            for k, v in self.server.kv.get_prefix(url.path).items()
+        }
+        if ret:
+            self.output(200, json.dumps(ret).encode("utf-8"))
+        else:
+            self.output(404)
 
     def do_PUT(self):
         self.do_POST()
@@ -40,20 +135,16 @@ class KVHandler(SimpleHTTPServer.SimpleHTTPRequestHandler):
         content_length = int(self.headers['Content-Length'] or 0)
         try:
             value = self.rfile.read(content_length)
-            with self.server.kv_lock:
-                self.server.kv[self.path] = value
-                self.output(200)
-                return
+            self.server.kv.put(urlsplit(self.path).path, value)
+            self.output(200)
         except:
             self.output(500)
 
     def do_DELETE(self):
-        with self.server.kv_lock:
-            if self.path in self.server.kv:
-                del self.server.kv[self.path]
-                self.output(200)
-            else:
-                self.output(404)
+        if self.server.kv.delete(urlsplit(self.path).path):
+            self.output(200)
+        else:
+            self.output(404)
 
     def output(self, code, value=''):
         self.send_response(code)
@@ -67,11 +158,15 @@ class KVHandler(SimpleHTTPServer.SimpleHTTPRequestHandler):
         return
 
 
-class KVServer(HTTPServer):
+class KVServer(ThreadingHTTPServer):
+    # the backlog of the listening socket, thousands of peers may connect
+    # at the same time in a rendezvous
+    request_queue_size = 4096
+
     def __init__(self, port):
         super().__init__(('', port), KVHandler)
-        self.kv_lock = threading.Lock()
-        self.kv = {'/healthy': b'ok'}
+        self.kv = KVStore()
+        self.kv.put('/healthy', b'ok')
         self.port = port
         self.stopped = False
         self.started = False
@@ -117,12 +212,55 @@ class PKVServer:
         return self._server.stopped
 
 
-if __name__ == '__main__':
-    # kv = PKVServer(8090)
-    kv = KVServer(8090)
-    kv.start()
-    import time
+def load_test(num_peers, port=0, prefix="/load_test", timeout=60):
+    """
+    Simulate a rendezvous of num_peers peers against a local KVServer, each
+    peer puts its key and waits for the keys of all the peers.
+
+    Returns:
+        The seconds of the rendezvous and the number of the peers which
+        failed to get all the keys.
+    """
+    from .kv_client import KVClient
 
-    # print("serve at 8090 for 600 s")
+    server = KVServer(port)
+    server.start()
+    client = KVClient(f"127.0.0.1:{server.server_address[1]}")
+    failed = []
+    barrier = threading.Barrier(num_peers + 1)
+
+    def peer(rank):
+        barrier.wait()
+        ok = client.put(f"{prefix}/{rank}", f"peer{rank}")
+        ret = client.wait_prefix(prefix, num_peers, timeout=timeout)
+        if not ok or not ret or len(ret) != num_peers:
+            failed.append(rank)
+
+    threads = [
+        threading.Thread(target=peer, args=(rank,), daemon=True)
+        for rank in range(num_peers)
+    ]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.time()
+    for thread in threads:
+        thread.join()
+    cost = time.time() - start
+    server.stop()
+    return cost, len(failed)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Load test of the rendezvous of the launch KV server."
+    )
+    parser.add_argument("--peers", type=int, default=2048)
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args()
 
-    time.sleep(600)
+    cost, num_failed = load_test(args.peers, args.port, timeout=args.timeout)
+    print(
+        f"rendezvous of {args.peers} peers: {cost:.3f} s, {num_failed} failed"
+    )
@@ -52,6 +52,7 @@ from .io_utils import (
     _pickle_loads_mac,
     _unpack_saved_dict,
 )
+from .stream_format import StreamFormatReader, _is_stream_format, _stream_save
 
 if TYPE_CHECKING:
     from io import BytesIO
@@ -74,6 +75,7 @@ if TYPE_CHECKING:
 
     class _SaveOptions(TypedDict):
         use_binary_format: NotRequired[bool]
+        use_stream_format: NotRequired[bool]
         pickle_protocol: NotRequired[Literal[2, 3, 4]]
 
 
@@ -389,7 +391,11 @@ def _parse_load_config(configs):
 
 
 def _parse_save_config(configs):
-    supported_configs = ['use_binary_format', 'pickle_protocol']
+    supported_configs = [
+        'use_binary_format',
+        'use_stream_format',
+        'pickle_protocol',
+    ]
 
     # input check
     for key in configs:
@@ -405,6 +411,7 @@ def _parse_save_config(configs):
 
     inner_config = _SaveLoadConfig()
     inner_config.use_binary_format = configs.get('use_binary_format', False)
+    inner_config.use_stream_format = configs.get('use_stream_format', False)
     inner_config.pickle_protocol = configs.get('pickle_protocol', None)
 
     return inner_config
@@ -801,6 +808,10 @@ def save(
           use_binary_format(bool): When the saved object is static graph variable, you can specify ``use_binary_for_var``.
           If True, save the file in the c++ binary format when saving a single static graph variable; otherwise, save it in pickle format.
           Default: False
+          use_stream_format(bool): If True, save the object without pickle in the stream format: a JSON header of the nested structure
+          followed by the raw data of the tensors, which are copied to host and written one by one instead of being serialized as a whole.
+          ``paddle.load`` maps the tensor data of the file into memory. Only Tensor, numpy.ndarray, dict with str keys, list, tuple and python
+          scalars are supported. Default: False
 
     Returns:
         None
@@ -932,8 +943,15 @@ def save(
             f"Type of `use_binary_format` should be bool, but received {type(config.use_binary_format)}."
         )
 
+    if not isinstance(config.use_stream_format, bool):
+        raise TypeError(
+            f"Type of `use_stream_format` should be bool, but received {type(config.use_stream_format)}."
+        )
+
     if config.use_binary_format:
         _save_binary_var(obj, path)
+    elif config.use_stream_format:
+        _stream_save(obj, path)
     else:
         # `protocol` need to be used, `pickle_protocol` is a deprecated arg.
         if config.pickle_protocol is not None:
@@ -1061,6 +1079,7 @@ def load(path: str | BytesIO, **configs: Unpack[_LoadOptions]) -> Any:
             ``save_inference_model`` save format. No default file name, save variables separately
             by default.
             (3) return_numpy(bool): If specified as True, return tensor as numpy.ndarray, otherwise return tensor as paddle.Tensor.
+            For the file saved with ``use_stream_format=True``, the returned numpy.ndarray is mapped to the file and only read when accessed.
             Default False.
 
     Returns:
@@ -1184,6 +1203,8 @@ def load(path: str | BytesIO, **configs: Unpack[_LoadOptions]) -> Any:
 
     if _is_memory_buffer(path) or os.path.isfile(path):
         config = _parse_load_config(configs)
+        if _is_stream_format(path):
+            return StreamFormatReader(path).load(config.return_numpy)
         exception_type = pickle.UnpicklingError
         try:
             with _open_file_buffer(path, 'rb') as f:
@@ -0,0 +1,333 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This file contains the stream format of paddle.save/paddle.load, a pickle
+# free container of nested objects and tensors. The layout of the file is:
+#
+#   | magic (8 bytes) | header size (8 bytes, little endian) | JSON header |
+#   | padding | tensor data aligned to _ALIGNMENT bytes ... |
+#
+# The JSON header records the structure of the saved object and the dtype,
+# shape and byte range of every tensor, so that the tensors are written one
+# by one after the header and read lazily from a memory map.
+
+from __future__ import annotations
+
+import collections
+import json
+import struct
+
+import numpy as np
+
+import paddle
+from paddle.base import core
+from paddle.base.framework import _current_expected_place_, in_dygraph_mode
+
+from .io_utils import _is_file_path, _is_memory_buffer
+
+__all__ = []
+
+_MAGIC = b"PDSTRM01"
+_ALIGNMENT = 64
+# The max bytes of a tensor copied to host at a time when saving.
+_CHUNK_SIZE = 64 << 20
+
+# NOTE: bfloat16 is stored as uint16 in numpy, paddle.to_tensor casts
+# uint16 numpy array back to bfloat16.
+_NUMPY_DTYPES = {
+    "bool": np.bool_,
+    "uint8": np.uint8,
+    "int8": np.int8,
+    "int16": np.int16,
+    "uint16": np.uint16,
+    "int32": np.int32,
+    "int64": np.int64,
+    "float16": np.float16,
+    "bfloat16": np.uint16,
+    "float32": np.float32,
+    "float64": np.float64,
+    "complex64": np.complex64,
+    "complex128": np.complex128,
+}
+
+
+def _align(offset):
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _get_numpy_dtype(dtype):
+    if dtype not in _NUMPY_DTYPES:
+        raise TypeError(
+            f"The dtype {dtype} is not supported by the stream format of `paddle.save`."
+        )
+    return np.dtype(_NUMPY_DTYPES[dtype])
+
+
+class _TensorEntry:
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+        if isinstance(value, core.eager.Tensor):
+            if not value._is_initialized():
+                raise ValueError(f"The saved tensor {key} is not initialized.")
+            self.name = value.name
+            self.dtype = str(value.dtype).split(".")[1]
+            self.shape = list(value.shape)
+        else:
+            self.name = None
+            self.dtype = value.dtype.name
+            self.shape = list(value.shape)
+        self.nbytes = (
+            int(np.prod(self.shape, dtype=np.int64))
+            * _get_numpy_dtype(self.dtype).itemsize
+        )
+        self.offset = None
+
+    def to_header(self):
+        return {
+            "key": self.key,
+            "name": self.name,
+            "dtype": self.dtype,
+            "shape": self.shape,
+            "offset": self.offset,
+            "nbytes": self.nbytes,
+        }
+
+    def iter_chunks(self):
+        value = self.value
+        if not isinstance(value, core.eager.Tensor):
+            yield np.ascontiguousarray(value)
+            return
+        if value.is_dense() and value.place.is_custom_place():
+            value = paddle._C_ops.npu_identity(value, -1)
+        flat_value = value.reshape([-1])
+        numel = flat_value.shape[0]
+        itemsize = _get_numpy_dtype(self.dtype).itemsize
+        chunk_numel = max(_CHUNK_SIZE // itemsize, 1)
+        for start in range(0, numel, chunk_numel):
+            end = min(start + chunk_numel, numel)
+            chunk = flat_value[start:end] if end - start < numel else flat_value
+            yield np.ascontiguousarray(chunk.cpu().numpy())
+
+
+def _encode(obj, key, entries, keys):
+    """
+    Encode obj to a JSON compatible structure, the tensors are replaced by
+    their index in entries.
+    """
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, core.DenseTensor):
+        obj = np.array(obj)
+    if isinstance(obj, (core.eager.Tensor, np.ndarray)):
+        if isinstance(obj, np.ndarray) and obj.dtype.hasobject:
+            raise TypeError(
+                f"The numpy array {key} of object dtype can not be saved in the stream format."
+            )
+        # keep the keys unique for the lazy access by key
+        if key in keys:
+            key = f"{key}@{len(entries)}"
+        keys.add(key)
+        entries.append(_TensorEntry(key, obj))
+        return {"__tensor__": len(entries) - 1}
+    if isinstance(obj, dict):
+        encoded = {}
+        for k, v in obj.items():
+            if not isinstance(k, str):
+                raise TypeError(
+                    f"The stream format of `paddle.save` only supports str keys of dict, but received {type(k)}."
+                )
+            encoded[k] = _encode(v, f"{key}.{k}" if key else k, entries, keys)
+        if isinstance(obj, collections.OrderedDict):
+            return {"__ordered_dict__": encoded}
+        return {"__dict__": encoded}
+    if isinstance(obj, (list, tuple)):
+        encoded = [
+            _encode(v, f"{key}.{i}" if key else str(i), entries, keys)
+            for i, v in enumerate(obj)
+        ]
+        return {"__tuple__": encoded} if isinstance(obj, tuple) else encoded
+    raise TypeError(
+        f"The stream format of `paddle.save` only supports Tensor, numpy.ndarray, "
+        f"dict, list, tuple and python scalars, but received {type(obj)}."
+    )
+
+
+def _is_stream_format(path):
+    if _is_file_path(path):
+        with open(path, "rb") as f:
+            return f.read(len(_MAGIC)) == _MAGIC
+    if _is_memory_buffer(path):
+        pos = path.tell()
+        with path.getbuffer() as view:
+            return bytes(view[pos : pos + len(_MAGIC)]) == _MAGIC
+    return False
+
+
+def _stream_save(obj, path):
+    entries = []
+    structure = _encode(obj, "", entries, set())
+    offset = 0
+    for entry in entries:
+        entry.offset = offset
+        offset = _align(offset + entry.nbytes)
+    header = json.dumps(
+        {
+            "data_size": offset,
+            "tensors": [entry.to_header() for entry in entries],
+            "structure": structure,
+        }
+    ).encode("utf-8")
+    prefix_size = len(_MAGIC) + 8 + len(header)
+
+    def write_all(f):
+        f.write(_MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        f.write(b" " * (_align(prefix_size) - prefix_size))
+        written = 0
+        for entry in entries:
+            f.write(b"\0" * (entry.offset - written))
+            written = entry.offset
+            for chunk in entry.iter_chunks():
+                f.write(memoryview(chunk.reshape([-1]).view(np.uint8)))
+                written += chunk.nbytes
+        f.write(b"\0" * (offset - written))
+
+    if _is_file_path(path):
+        with open(path, "wb") as f:
+            write_all(f)
+    else:
+        write_all(path)
+
+
+class StreamFormatReader:
+    """
+    Read the file saved by ``paddle.save(obj, path, use_stream_format=True)``.
+    The tensor data of a file is memory mapped, only the pages of the
+    tensors accessed are read from disk.
+
+    Args:
+        path(str|BytesIO): The path/buffer of the saved object. The tensor
+            data of a buffer is copied once.
+
+    Examples:
+        .. code-block:: python
+
+            >>> import paddle
+            >>> from paddle.framework.stream_format import StreamFormatReader
+            >>> linear = paddle.nn.Linear(4, 4)
+            >>> paddle.save(linear.state_dict(), "linear.pdparams", use_stream_format=True)
+            >>> reader = StreamFormatReader("linear.pdparams")
+            >>> print(reader.keys())
+            ['weight', 'bias']
+            >>> weight = reader.get_tensor("weight")
+    """
+
+    def __init__(self, path):
+        if _is_file_path(path):
+            with open(path, "rb") as f:
+                self._read_header(f)
+            data_size = self._header["data_size"]
+            if data_size > 0:
+                # copy on write, the file is never modified
+                self._data = np.memmap(
+                    path,
+                    dtype=np.uint8,
+                    mode="c",
+                    offset=self._data_offset,
+                    shape=(data_size,),
+                )
+            else:
+                self._data = np.empty([0], dtype=np.uint8)
+        else:
+            start = path.tell()
+            self._read_header(path)
+            path.seek(start + self._data_offset)
+            self._data = np.frombuffer(
+                bytearray(path.read(self._header["data_size"])), dtype=np.uint8
+            )
+        self._tensors = self._header["tensors"]
+        self._key_to_index = {
+            tensor["key"]: i for i, tensor in enumerate(self._tensors)
+        }
+
+    def _read_header(self, f):
+        magic = f.read(len(_MAGIC))
+        if magic != _MAGIC:
+            raise ValueError(
+                "The file is not saved in the stream format of `paddle.save`."
+            )
+        (header_size,) = struct.unpack("<Q", f.read(8))
+        self._header = json.loads(f.read(header_size).decode("utf-8"))
+        self._data_offset = _align(len(_MAGIC) + 8 + header_size)
+
+    def keys(self):
+        """
+        The keys of the saved tensors, the keys of nested dicts and the
+        indices of lists are joined by ".".
+        """
+        return list(self._key_to_index.keys())
+
+    def _get(self, index, return_numpy):
+        meta = self._tensors[index]
+        dtype = _get_numpy_dtype(meta["dtype"])
+        array = (
+            self._data[meta["offset"] : meta["offset"] + meta["nbytes"]]
+            .view(dtype)
+            .reshape(meta["shape"])
+        )
+        if return_numpy:
+            return array
+        if in_dygraph_mode():
+            tensor = paddle.to_tensor(array)
+            if meta["name"]:
+                tensor.name = meta["name"]
+            return tensor
+        tensor = core.DenseTensor()
+        tensor.set(array, _current_expected_place_())
+        return tensor
+
+    def get_tensor(self, key, return_numpy=False):
+        """
+        Read the tensor of key, return a numpy array mapped to the file if
+        return_numpy is True.
+        """
+        if key not in self._key_to_index:
+            raise KeyError(f"The tensor {key} is not found in the file.")
+        return self._get(self._key_to_index[key], return_numpy)
+
+    def load(self, return_numpy=False):
+        """
+        Load the saved object.
+        """
+
+        def decode(obj):
+            if isinstance(obj, list):
+                return [decode(v) for v in obj]
+            if not isinstance(obj, dict):
+                return obj
+            if "__tensor__" in obj:
+                return self._get(obj["__tensor__"], return_numpy)
+            if "__tuple__" in obj:
+                return tuple(decode(v) for v in obj["__tuple__"])
+            if "__ordered_dict__" in obj:
+                return collections.OrderedDict(
+                    (k, decode(v)) for k, v in obj["__ordered_dict__"].items()
+                )
+            return {k: decode(v) for k, v in obj["__dict__"].items()}
+
+        return decode(self._header["structure"])
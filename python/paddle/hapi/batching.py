@@ -0,0 +1,453 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable
+
+import numpy as np
+
+from .model import to_list
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    import numpy.typing as npt
+    from typing_extensions import Self
+
+    from paddle.jit.dy2static.shape_bucket import ShapeBucketPolicy
+
+    from .model import Model
+
+__all__ = []
+
+
+class BatchingMetrics:
+    """
+    The counters of DynamicBatcher, the latencies are kept for the latest
+    `window` requests.
+    """
+
+    def __init__(self, window: int = 10000) -> None:
+        self.requests = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.numel = 0
+        self.padded_numel = 0
+        self.latencies = collections.deque(maxlen=window)
+        self.queue_latencies = collections.deque(maxlen=window)
+        self.start_time = time.time()
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        batch_size: int,
+        numel: int,
+        padded_numel: int,
+        queue_latencies: Sequence[float],
+        latencies: Sequence[float],
+        ok: bool,
+    ) -> None:
+        with self._lock:
+            self.batches += 1
+            self.requests += batch_size
+            self.numel += numel
+            self.padded_numel += padded_numel
+            self.queue_latencies.extend(queue_latencies)
+            self.latencies.extend(latencies)
+            if not ok:
+                self.failed_batches += 1
+
+    def summary(self) -> dict[str, float]:
+        """
+        Get the counters, the throughput in requests per second, the mean
+        batch size, the ratio of the padded elements, and the percentiles
+        in seconds of the latencies of the requests, where queue latency is
+        the time waiting to be batched.
+        """
+        with self._lock:
+            elapsed = time.time() - self.start_time
+            latencies = sorted(self.latencies)
+            queue_latencies = sorted(self.queue_latencies)
+            requests, batches = self.requests, self.batches
+            failed_batches = self.failed_batches
+            numel, padded_numel = self.numel, self.padded_numel
+
+        def percentile(values, q):
+            if not values:
+                return 0.0
+            return values[min(int(q * len(values)), len(values) - 1)]
+
+        return {
+            "requests": requests,
+            "batches": batches,
+            "failed_batches": failed_batches,
+            "elapsed": elapsed,
+            "requests_per_second": requests / elapsed if elapsed > 0 else 0.0,
+            "mean_batch_size": requests / batches if batches else 0.0,
+            "padding_ratio": (
+                (padded_numel - numel) / padded_numel if padded_numel else 0.0
+            ),
+            "latency_p50": percentile(latencies, 0.5),
+            "latency_p99": percentile(latencies, 0.99),
+            "queue_latency_p50": percentile(queue_latencies, 0.5),
+            "queue_latency_p99": percentile(queue_latencies, 0.99),
+        }
+
+
+class _Request:
+    __slots__ = ["inputs", "arrival", "future"]
+
+    def __init__(self, inputs, future):
+        self.inputs = inputs
+        self.arrival = time.monotonic()
+        self.future = future
+
+
+class DynamicBatcher:
+    """
+    Serve the requests of single samples by batches of
+    :ref:`api_paddle_Model` ``predict_batch``.
+
+    The requests are queued, and the requests of the same shapes are
+    stacked into a batch when there are max_batch_size of them, or when the
+    oldest one has waited for max_wait seconds. The batches are predicted
+    in a background thread one by one, and the outputs of a batch are split
+    into the results of the requests.
+
+    With shape_bucket, the dynamic axes of the inputs are padded up to the
+    sizes of the buckets, so that the requests of different sizes in the
+    same bucket are batched together. The outputs keep the padded sizes.
+
+    Args:
+        model(Model): The model prepared for prediction.
+        max_batch_size(int, optional): The max number of requests in a
+            batch. Default: 32.
+        max_wait(float, optional): The max seconds a request waits for the
+            other requests before its batch is predicted. Default: 0.005.
+        shape_bucket(ShapeBucketPolicy|None, optional): The policy to pad the
+            inputs, whose axes are the axes of the batched inputs, so axis 0
+            is the batch axis and is never padded. The inputs are padded only
+            if their names of the model are in its input_names when it is
+            set. Default: None, which means the requests are batched only
+            with the requests of the same shapes.
+
+    Examples:
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> import paddle
+            >>> from paddle.hapi.batching import DynamicBatcher
+            >>> from paddle.static import InputSpec
+
+            >>> model = paddle.Model(
+            ...     paddle.nn.Linear(8, 2), [InputSpec([None, 8], 'float32', 'x')]
+            ... )
+            >>> model.prepare()
+            >>> with DynamicBatcher(model, max_batch_size=16) as batcher:
+            ...     futures = [
+            ...         batcher.submit(np.random.rand(8).astype('float32'))
+            ...         for _ in range(4)
+            ...     ]
+            ...     outputs = [future.result() for future in futures]
+            >>> print(outputs[0][0].shape)
+            (2,)
+    """
+
+    def __init__(
+        self,
+        model: Model,
+        max_batch_size: int = 32,
+        max_wait: float = 0.005,
+        shape_bucket: ShapeBucketPolicy | None = None,
+    ) -> None:
+        if max_batch_size <= 0:
+            raise ValueError(
+                f"The max_batch_size of DynamicBatcher should be positive, but received {max_batch_size}."
+            )
+        if max_wait < 0:
+            raise ValueError(
+                f"The max_wait of DynamicBatcher should be non-negative, but received {max_wait}."
+            )
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.shape_bucket = shape_bucket
+        self.metrics = BatchingMetrics()
+        # the queued requests of every bucket, keyed by the dtypes and the
+        # padded shapes of the inputs
+        self._pending = {}
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = None
+
+    def start(self) -> Self:
+        """
+        Start the thread predicting the batches, which is started by the
+        first request if it is not started.
+        """
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("DynamicBatcher has been stopped.")
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._loop, name="dynamic_batcher", daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop accepting requests, and wait until the queued requests are
+        predicted.
+        """
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def _bucket_shape(self, index, shape):
+        policy = self.shape_bucket
+        if policy is None:
+            return shape
+        if policy.input_names is not None:
+            specs = self.model._inputs or []
+            if index >= len(specs) or specs[index].name not in (
+                policy.input_names
+            ):
+                return shape
+        shape = list(shape)
+        for axis in policy.axes:
+            # the inputs of a request have no batch axis
+            if 0 < axis <= len(shape):
+                shape[axis - 1] = policy.bucket_size(shape[axis - 1])
+        return tuple(shape)
+
+    def submit(
+        self, inputs: npt.ArrayLike | Sequence[npt.ArrayLike]
+    ) -> Future[list[npt.NDArray[Any]]]:
+        """
+        Queue a request of a sample.
+
+        Args:
+            inputs(ArrayLike|list[ArrayLike]): The inputs of a sample without
+                the batch axis, one for every input of the model.
+
+        Returns:
+            Future: The future of the outputs of the sample, one for every
+            output of the model.
+        """
+        inputs = [np.asarray(x) for x in to_list(inputs)]
+        key = tuple(
+            (x.dtype.str, self._bucket_shape(i, x.shape))
+            for i, x in enumerate(inputs)
+        )
+        request = _Request(inputs, Future())
+        if self._thread is None:
+            self.start()
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("DynamicBatcher has been stopped.")
+            requests = self._pending.setdefault(key, collections.deque())
+            requests.append(request)
+            if len(requests) == 1 or len(requests) >= self.max_batch_size:
+                self._cond.notify()
+        return request.future
+
+    def predict(
+        self,
+        inputs: npt.ArrayLike | Sequence[npt.ArrayLike],
+        timeout: float | None = None,
+    ) -> list[npt.NDArray[Any]]:
+        """
+        Predict a sample and wait for its outputs, see :meth:`submit`.
+        """
+        return self.submit(inputs).result(timeout)
+
+    async def apredict(
+        self, inputs: npt.ArrayLike | Sequence[npt.ArrayLike]
+    ) -> list[npt.NDArray[Any]]:
+        """
+        Predict a sample in a coroutine, see :meth:`submit`.
+        """
+        return await asyncio.wrap_future(self.submit(inputs))
+
+    def _next_batch(self):
+        with self._cond:
+            while True:
+                if not self._pending:
+                    if self._stopped:
+                        return None
+                    self._cond.wait()
+                    continue
+                key = None
+                for k, requests in self._pending.items():
+                    if len(requests) >= self.max_batch_size:
+                        key = k
+                        break
+                if key is None:
+                    # the bucket of the oldest request
+                    key = min(
+                        self._pending,
+                        key=lambda k: self._pending[k][0].arrival,
+                    )
+                    timeout = (
+                        self._pending[key][0].arrival
+                        + self.max_wait
+                        - time.monotonic()
+                    )
+                    if timeout > 0 and not self._stopped:
+                        self._cond.wait(timeout)
+                        continue
+                requests = self._pending[key]
+                batch = [
+                    requests.popleft()
+                    for _ in range(min(len(requests), self.max_batch_size))
+                ]
+                if not requests:
+                    del self._pending[key]
+                # drop the cancelled requests, and the others can not be
+                # cancelled any more
+                batch = [
+                    request
+                    for request in batch
+                    if request.future.set_running_or_notify_cancel()
+                ]
+                if batch:
+                    return key, batch
+
+    def _loop(self):
+        while True:
+            item = self._next_batch()
+            if item is None:
+                return
+            self._run_batch(*item)
+
+    def _run_batch(self, key, requests):
+        start = time.monotonic()
+        numel = 0
+        padded_numel = 0
+        try:
+            inputs = []
+            for i, (dtype, shape) in enumerate(key):
+                batch = np.empty((len(requests), *shape), dtype=dtype)
+                for j, request in enumerate(requests):
+                    x = request.inputs[i]
+                    numel += x.size
+                    if x.shape != shape:
+                        batch[j] = self.shape_bucket.pad_value
+                        batch[j][tuple(slice(0, s) for s in x.shape)] = x
+                    else:
+                        batch[j] = x
+                padded_numel += batch.size
+                inputs.append(batch)
+            outputs = self.model.predict_batch(inputs)
+            results = [
+                [out[j] for out in outputs] for j in range(len(requests))
+            ]
+        except Exception as e:
+            # deliver any error to the requests instead of stopping the
+            # batching thread
+            ok = False
+            for request in requests:
+                request.future.set_exception(e)
+        else:
+            ok = True
+            for request, result in zip(requests, results):
+                request.future.set_result(result)
+        end = time.monotonic()
+        self.metrics.record(
+            len(requests),
+            numel,
+            padded_numel,
+            [start - request.arrival for request in requests],
+            [end - request.arrival for request in requests],
+            ok,
+        )
+
+
+def load_test(
+    predict: Callable[[Any], Any],
+    make_inputs: Callable[[int], Any],
+    num_requests: int = 1000,
+    concurrency: int = 32,
+    use_asyncio: bool = False,
+) -> dict[str, float]:
+    """
+    Send requests from concurrent clients and measure the latencies, e.g.
+    ``load_test(batcher.predict, make_inputs)`` or
+    ``load_test(batcher.apredict, make_inputs, use_asyncio=True)``.
+
+    Args:
+        predict(Callable): The function to predict a sample, which is a
+            coroutine function if use_asyncio is True.
+        make_inputs(Callable): The function to make the inputs of the i-th
+            request.
+        num_requests(int, optional): The number of the requests.
+            Default: 1000.
+        concurrency(int, optional): The number of the clients sending the
+            requests one by one. Default: 32.
+        use_asyncio(bool, optional): Whether the clients are coroutines in
+            an event loop instead of threads. Default: False.
+
+    Returns:
+        dict: The requests per second and the percentiles of the latencies
+        in seconds.
+    """
+    requests = [make_inputs(i) for i in range(num_requests)]
+    latencies = []
+
+    def timed(inputs):
+        start = time.monotonic()
+        predict(inputs)
+        latencies.append(time.monotonic() - start)
+
+    async def atimed(inputs, semaphore):
+        async with semaphore:
+            start = time.monotonic()
+            await predict(inputs)
+            latencies.append(time.monotonic() - start)
+
+    async def arun():
+        semaphore = asyncio.Semaphore(concurrency)
+        await asyncio.gather(*[atimed(x, semaphore) for x in requests])
+
+    start = time.monotonic()
+    if use_asyncio:
+        asyncio.run(arun())
+    else:
+        with ThreadPoolExecutor(concurrency) as pool:
+            list(pool.map(timed, requests))
+    elapsed = time.monotonic() - start
+
+    latencies.sort()
+    return {
+        "requests_per_second": num_requests / elapsed,
+        "latency_p50": latencies[len(latencies) // 2],
+        "latency_p99": latencies[
+            min(int(0.99 * num_requests), num_requests - 1)
+        ],
+    }
@@ -1211,6 +1211,10 @@ class DynamicGraphAdapter:
         self._amp_configs = {}
         self._amp_custom_lists = {}
         self._use_fp16_guard = True
+        # in the deferred mode, the losses and the outputs of the metrics are
+        # kept on device until _flush_metrics to avoid syncing in every step
+        self._deferred = False
+        self._pending_metric_outs = []
 
         if self._nranks > 1:
             dist.init_parallel_env()
@@ -1233,6 +1237,29 @@ class DynamicGraphAdapter:
     def mode(self, value):
         self.model.mode = value
 
+    def _fetch(self, tensors):
+        if self._deferred:
+            return [t.detach() for t in tensors]
+        return [to_numpy(t) for t in tensors]
+
+    def _update_metric(self, metric, metric_outs):
+        if not self._deferred:
+            return metric.update(*[to_numpy(m) for m in metric_outs])
+        self._pending_metric_outs.append(
+            (
+                metric,
+                [
+                    m.detach() if isinstance(m, paddle.Tensor) else m
+                    for m in metric_outs
+                ],
+            )
+        )
+
+    def _flush_metrics(self):
+        for metric, metric_outs in self._pending_metric_outs:
+            metric.update(*[to_numpy(m) for m in metric_outs])
+        self._pending_metric_outs = []
+
     # TODO multi device in dygraph mode not implemented at present time
     def train_batch(self, inputs, labels=None, update=True):
         assert (
@@ -1280,13 +1307,13 @@ class DynamicGraphAdapter:
         metrics = []
         for metric in self.model._metrics:
             metric_outs = metric.compute(*(to_list(outputs) + labels))
-            m = metric.update(*[to_numpy(m) for m in to_list(metric_outs)])
+            m = self._update_metric(metric, to_list(metric_outs))
             metrics.append(m)
 
         return (
-            ([to_numpy(l) for l in losses], metrics)
+            (self._fetch(losses), metrics)
             if len(metrics) > 0
-            else [to_numpy(l) for l in losses]
+            else self._fetch(losses)
         )
 
     def eval_batch(self, inputs, labels=None):
@@ -1341,13 +1368,13 @@ class DynamicGraphAdapter:
         for metric in self.model._metrics:
             # cut off padding value.
             metric_outs = metric.compute(*(to_list(outputs) + labels))
-            m = metric.update(*[to_numpy(m) for m in to_list(metric_outs)])
+            m = self._update_metric(metric, to_list(metric_outs))
             metrics.append(m)
 
         if self.model._loss and len(metrics):
-            return [to_numpy(l) for l in losses], metrics
+            return self._fetch(losses), metrics
         elif self.model._loss:
-            return [to_numpy(l) for l in losses]
+            return self._fetch(losses)
         else:
             return metrics
 
@@ -2214,6 +2241,7 @@ class Model:
         callbacks: Sequence[Callback] | Callback | None = None,
         accumulate_grad_batches: int = 1,
         num_iters: int | None = None,
+        deferred_metrics: bool = False,
     ) -> None:
         """
 
@@ -2262,6 +2290,12 @@ class Model:
             num_iters (int|None, optional): The number of iterations to evaluate the model.
                 If None, evaluate on whole input dataset, otherwise, evaluate `num_iters` times.
                 Default: None.
+            deferred_metrics (bool, optional): Whether to keep the losses and the
+                outputs of the metrics on device, and fetch them to update the logs
+                only every `log_freq` steps and at the end of the epoch, which avoids
+                synchronizing the device in every step. The logs of the other steps
+                keep the values of the last update. It only works in dynamic graph
+                mode. Default: False.
 
         Returns:
             None
@@ -2424,10 +2458,13 @@ class Model:
         if any(isinstance(k, EarlyStopping) for k in cbks) and not do_eval:
             warnings.warn("EarlyStopping needs validation data.")
 
+        sync_freq = log_freq if deferred_metrics else None
         cbks.on_begin('train')
         for epoch in range(epochs):
             cbks.on_epoch_begin(epoch)
-            logs = self._run_one_epoch(train_loader, cbks, 'train')
+            logs = self._run_one_epoch(
+                train_loader, cbks, 'train', sync_freq=sync_freq
+            )
             cbks.on_epoch_end(epoch, logs)
 
             if do_eval and epoch % eval_freq == 0:
@@ -2437,7 +2474,9 @@ class Model:
                     {'steps': eval_steps, 'metrics': self._metrics_name()},
                 )
 
-                eval_logs = self._run_one_epoch(eval_loader, cbks, 'eval')
+                eval_logs = self._run_one_epoch(
+                    eval_loader, cbks, 'eval', sync_freq=sync_freq
+                )
 
                 cbks.on_end('eval', eval_logs)
             if self.stop_training:
@@ -2455,6 +2494,7 @@ class Model:
         num_workers: int = 0,
         callbacks: Sequence[Callback] | Callback | None = None,
         num_iters: int | None = None,
+        deferred_metrics: bool = False,
     ) -> dict[str, float | npt.NDArray[Any]]:
         """
         Evaluate the loss and metrics of the model on input dataset.
@@ -2480,6 +2520,12 @@ class Model:
             num_iters (int|None, optional): The number of iterations to evaluate the model.
                 If None, evaluate on whole input dataset, otherwise, evaluate `num_iters` times.
                 Default: None.
+            deferred_metrics (bool, optional): Whether to keep the losses and the
+                outputs of the metrics on device, and fetch them to update the logs
+                only every `log_freq` steps and at the end of the epoch, which avoids
+                synchronizing the device in every step. The logs of the other steps
+                keep the values of the last update. It only works in dynamic graph
+                mode. Default: False.
         Returns:
             dict: Result of metric. The key is the names of Metric,
                 value is a scalar or numpy.array.
@@ -2545,7 +2591,12 @@ class Model:
             'eval', {'steps': eval_steps, 'metrics': self._metrics_name()}
         )
 
-        logs = self._run_one_epoch(eval_loader, cbks, 'eval')
+        logs = self._run_one_epoch(
+            eval_loader,
+            cbks,
+            'eval',
+            sync_freq=log_freq if deferred_metrics else None,
+        )
 
         cbks.on_end('eval', logs)
 
@@ -2775,83 +2826,98 @@ class Model:
         callbacks,
         mode,
         logs={},
+        sync_freq=None,
     ):
         outputs = []
-        for step, data in enumerate(data_loader):
-            # Data might come from different types of data_loader and have
-            # different format, as following:
-            # 1. DataLoader in static graph:
-            #    [[input1, input2, ..., label1, label2, ...]]
-            # 2. DataLoader in dygraph
-            #    [input1, input2, ..., label1, label2, ...]
-            # 3. custumed iterator yield concated inputs and labels:
-            #   [input1, input2, ..., label1, label2, ...]
-            # 4. custumed iterator yield separated inputs and labels:
-            #   ([input1, input2, ...], [label1, label2, ...])
-            # To handle all of these, flatten (nested) list to list.
-            data = paddle.utils.flatten(data)
-            # DenseTensor.shape is callable, where DenseTensor comes from
-            # DataLoader in static graph
-
-            batch_size = (
-                data[0].shape()[0]
-                if callable(data[0].shape)
-                else data[0].shape[0]
-            )
+        # fetch the losses and the metrics every sync_freq steps in the
+        # deferred mode, the outputs of the other steps are kept on device
+        deferred = (
+            sync_freq is not None
+            and mode != 'predict'
+            and isinstance(self._adapter, DynamicGraphAdapter)
+        )
+        if isinstance(self._adapter, DynamicGraphAdapter):
+            self._adapter._deferred = deferred
+            self._adapter._pending_metric_outs = []
+        try:
+            unsynced_outs = None
+            for step, data in enumerate(data_loader):
+                # Data might come from different types of data_loader and have
+                # different format, as following:
+                # 1. DataLoader in static graph:
+                #    [[input1, input2, ..., label1, label2, ...]]
+                # 2. DataLoader in dygraph
+                #    [input1, input2, ..., label1, label2, ...]
+                # 3. custumed iterator yield concated inputs and labels:
+                #   [input1, input2, ..., label1, label2, ...]
+                # 4. custumed iterator yield separated inputs and labels:
+                #   ([input1, input2, ...], [label1, label2, ...])
+                # To handle all of these, flatten (nested) list to list.
+                data = paddle.utils.flatten(data)
+                # DenseTensor.shape is callable, where DenseTensor comes from
+                # DataLoader in static graph
+
+                batch_size = (
+                    data[0].shape()[0]
+                    if callable(data[0].shape)
+                    else data[0].shape[0]
+                )
 
-            callbacks.on_batch_begin(mode, step, logs)
+                callbacks.on_batch_begin(mode, step, logs)
 
-            if mode != 'predict':
-                _inputs = [data[: len(self._inputs)], data[len(self._inputs) :]]
-                if mode == 'train':
-                    _inputs.append(
-                        (step + 1) % self._accumulate == 0
-                        or step + 1 == len(data_loader)
-                    )
+                if mode != 'predict':
+                    _inputs = [
+                        data[: len(self._inputs)],
+                        data[len(self._inputs) :],
+                    ]
+                    if mode == 'train':
+                        _inputs.append(
+                            (step + 1) % self._accumulate == 0
+                            or step + 1 == len(data_loader)
+                        )
 
-                outs = getattr(self, mode + '_batch')(*_inputs)
+                    outs = getattr(self, mode + '_batch')(*_inputs)
 
-                if self._metrics and self._loss:
-                    metrics = [[float(l) for l in outs[0]]]
-                elif self._loss:
-                    metrics = [[float(l) for l in outs]]
+                    if deferred and (step + 1) % sync_freq != 0:
+                        unsynced_outs = outs
+                    else:
+                        self._update_logs(outs, logs)
+                        unsynced_outs = None
                 else:
-                    metrics = []
+                    if self._inputs is not None:
+                        outs = self.predict_batch(data[: len(self._inputs)])
+                    else:
+                        outs = self.predict_batch(data)
 
-                # metrics
-                for metric in self._metrics:
-                    res = metric.accumulate()
-                    metrics.extend(to_list(res))
+                    outputs.append(outs)
 
-                assert len(self._metrics_name()) == len(metrics)
-                for k, v in zip(self._metrics_name(), metrics):
-                    logs[k] = v
-            else:
-                if self._inputs is not None:
-                    outs = self.predict_batch(data[: len(self._inputs)])
+                logs['step'] = step
+                if (
+                    mode == 'train'
+                    or self._adapter._merge_count.get(mode + '_batch', 0) <= 0
+                ):
+                    logs['batch_size'] = (
+                        batch_size * paddle.distributed.ParallelEnv().nranks
+                    )
                 else:
-                    outs = self.predict_batch(data)
-
-                outputs.append(outs)
+                    logs['batch_size'] = self._adapter._merge_count[
+                        mode + '_batch'
+                    ]
 
-            logs['step'] = step
-            if (
-                mode == 'train'
-                or self._adapter._merge_count.get(mode + '_batch', 0) <= 0
-            ):
-                logs['batch_size'] = (
-                    batch_size * paddle.distributed.ParallelEnv().nranks
-                )
-            else:
-                logs['batch_size'] = self._adapter._merge_count[mode + '_batch']
-
-            callbacks.on_batch_end(mode, step, logs)
-            if hasattr(self, 'num_iters') and self.num_iters is not None:
-                self.num_iters -= 1
-                if self.num_iters <= 0:
-                    self.stop_training = True
-                    del self.num_iters
-                    break
+                callbacks.on_batch_end(mode, step, logs)
+                if hasattr(self, 'num_iters') and self.num_iters is not None:
+                    self.num_iters -= 1
+                    if self.num_iters <= 0:
+                        self.stop_training = True
+                        del self.num_iters
+                        break
+            if deferred and unsynced_outs is not None:
+                self._update_logs(unsynced_outs, logs)
+        finally:
+            # leave the deferred mode even if a step or a callback raises
+            if isinstance(self._adapter, DynamicGraphAdapter):
+                self._adapter._deferred = False
+                self._adapter._pending_metric_outs = []
         self._reset_metrics()
 
         if mode == 'predict':
@@ -2967,6 +3033,26 @@ class Model:
 
         return out_specs
 
+    def _update_logs(self, outs, logs):
+        if isinstance(self._adapter, DynamicGraphAdapter):
+            self._adapter._flush_metrics()
+
+        if self._metrics and self._loss:
+            metrics = [[float(l) for l in outs[0]]]
+        elif self._loss:
+            metrics = [[float(l) for l in outs]]
+        else:
+            metrics = []
+
+        # metrics
+        for metric in self._metrics:
+            res = metric.accumulate()
+            metrics.extend(to_list(res))
+
+        assert len(self._metrics_name()) == len(metrics)
+        for k, v in zip(self._metrics_name(), metrics):
+            logs[k] = v
+
     def _reset_metrics(self):
         for metric in self._metrics:
             metric.reset()
@@ -215,6 +215,14 @@ class DistributedBatchSampler(BatchSampler):
             batch indices. Default False.
         drop_last(bool, optional): whether drop the last incomplete(less than a mini-batch) batch dataset size.
             Default False.
+        shard_aware(bool, optional): whether to assign whole shards of the dataset to
+            every rank, so that a rank only reads its own shard files. The dataset
+            should have the attribute `shard_ranges`, the [start, end) of the
+            indices of every shard, e.g. :ref:`api_paddle_vision_datasets_RecordDataset`.
+            The shards are assigned to balance the numbers of samples of the ranks,
+            and the samples of a rank are padded by repeating to the max number of
+            samples of all the ranks.
+            Default False.
 
     Returns:
         DistributedBatchSampler, return an iterable object for indices iterating.
@@ -264,6 +272,7 @@ class DistributedBatchSampler(BatchSampler):
         rank: int | None = None,
         shuffle: bool = False,
         drop_last: bool = False,
+        shard_aware: bool = False,
     ) -> None:
         self.dataset = dataset
 
@@ -297,15 +306,71 @@ class DistributedBatchSampler(BatchSampler):
 
         self.drop_last = drop_last
         self.epoch = 0
-        self.num_samples = int(math.ceil(len(self.dataset) * 1.0 / self.nranks))
+        self.shard_aware = shard_aware
+        if shard_aware:
+            shard_ranges = getattr(dataset, "shard_ranges", None)
+            assert (
+                shard_ranges is not None
+            ), "the dataset should have the attribute shard_ranges when shard_aware is True"
+            assert len(shard_ranges) >= self.nranks, (
+                f"the number of shards {len(shard_ranges)} should not be less "
+                f"than the number of ranks {self.nranks} when shard_aware is True"
+            )
+            # assign the largest shard to the rank with the least samples
+            self._rank_shards = [[] for _ in range(self.nranks)]
+            rank_sizes = [0] * self.nranks
+            for shard_id in sorted(
+                range(len(shard_ranges)),
+                key=lambda i: shard_ranges[i][0] - shard_ranges[i][1],
+            ):
+                rank = rank_sizes.index(min(rank_sizes))
+                self._rank_shards[rank].append(shard_id)
+                start, end = shard_ranges[shard_id]
+                rank_sizes[rank] += end - start
+            self.num_samples = max(rank_sizes)
+        else:
+            self.num_samples = int(
+                math.ceil(len(self.dataset) * 1.0 / self.nranks)
+            )
         self.total_size = self.num_samples * self.nranks
 
         # TODO(dev): consider to make it as public argument, acc_steps is only used
         # in auto-parallel
         self._acc_steps = 1
 
-    def __iter__(self) -> Iterator[list[int]]:
+    def _get_shard_indices(self):
+        shard_ranges = self.dataset.shard_ranges
+        indices = np.concatenate(
+            [np.zeros([0], dtype=np.int64)]
+            + [
+                np.arange(*shard_ranges[shard_id])
+                for shard_id in sorted(self._rank_shards[self.local_rank])
+            ]
+        )
+        if self.shuffle:
+            np.random.RandomState(self.epoch).shuffle(indices)
+            self.epoch += 1
+        # pad by repeating to make all the ranks have the same number of samples
+        if len(indices) < self.num_samples:
+            indices = np.resize(indices, self.num_samples)
+        return indices.tolist()
+
+    def _iter_batches(self, indices):
         local_batch_size = self.batch_size * self._acc_steps
+        batch_indices = []
+        for idx in indices:
+            batch_indices.append(idx)
+            if len(batch_indices) == local_batch_size:
+                yield batch_indices
+                batch_indices = []
+        if not self.drop_last and len(batch_indices) > 0:
+            yield batch_indices
+
+    def __iter__(self) -> Iterator[list[int]]:
+        if self.shard_aware:
+            yield from self._iter_batches(self._get_shard_indices())
+            return
+
         num_samples = len(self.dataset)
         indices = np.arange(num_samples).tolist()
         # add extra samples to make it evenly divisible
@@ -351,16 +416,7 @@ class DistributedBatchSampler(BatchSampler):
             indices = _get_indices_by_batch_size(indices)
 
         assert len(indices) == self.num_samples
-        _sample_iter = iter(indices)
-
-        batch_indices = []
-        for idx in _sample_iter:
-            batch_indices.append(idx)
-            if len(batch_indices) == local_batch_size:
-                yield batch_indices
-                batch_indices = []
-        if not self.drop_last and len(batch_indices) > 0:
-            yield batch_indices
+        yield from self._iter_batches(indices)
 
     def __len__(self) -> int:
         local_batch_size = self.batch_size * self._acc_steps
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import numbers
+import operator
 from collections.abc import Mapping, Sequence
 
 import numpy as np
@@ -109,3 +110,161 @@ def default_convert_fn(batch):
         return [default_convert_fn(d) for d in batch]
     else:
         return batch
+
+
+class _SchemaMismatchError(Exception):
+    pass
+
+
+# leaf kinds of sample schema, same dispatch order as default_collate_fn
+_NDARRAY = 0
+_TENSOR = 1
+_NUMBER = 2
+_STRING = 3
+
+
+def _infer_schema(sample):
+    """
+    Infer the nested structure of a sample as a hashable schema, return
+    None if sample contains data default_collate_fn can not collate.
+    """
+    if isinstance(sample, np.ndarray):
+        return (_NDARRAY, sample.shape, sample.dtype)
+    elif isinstance(sample, paddle.Tensor):
+        return (_TENSOR,)
+    elif isinstance(sample, numbers.Number):
+        return (_NUMBER,)
+    elif isinstance(sample, (str, bytes)):
+        return (_STRING,)
+    elif isinstance(sample, Mapping):
+        children = []
+        for key in sample:
+            child = _infer_schema(sample[key])
+            if child is None:
+                return None
+            children.append((key, child))
+        return (Mapping, tuple(children))
+    elif isinstance(sample, Sequence):
+        children = []
+        for field in sample:
+            child = _infer_schema(field)
+            if child is None:
+                return None
+            children.append(child)
+        return (Sequence, tuple(children))
+    return None
+
+
+def _compile_schema(schema, path=(), leaves=None, sequences=None):
+    """
+    Compile schema to the key path of each leaf field and each sequence
+    field, a field of the whole batch can be gathered by chained
+    itemgetter maps without python level dispatch on each sample.
+    """
+    if leaves is None:
+        leaves, sequences = [], []
+    kind, *args = schema
+    if kind is Mapping:
+        for key, child in args[0]:
+            _compile_schema(child, (*path, key), leaves, sequences)
+    elif kind is Sequence:
+        sequences.append((path, len(args[0])))
+        for idx, child in enumerate(args[0]):
+            _compile_schema(child, (*path, idx), leaves, sequences)
+    else:
+        leaves.append((path, schema))
+    return leaves, sequences
+
+
+def _gather(batch, path):
+    fields = batch
+    for key in path:
+        fields = map(operator.itemgetter(key), fields)
+    return list(fields)
+
+
+class _SchemaCollateFn:
+    """
+    Schema cached fast path of :code:`default_collate_fn`. Sample schema
+    is inferred from the first sample of a batch and cached with the
+    compiled field paths, each leaf field of the whole batch is gathered
+    and stacked by one vectorized copy. If samples in batch do not match
+    the schema, the batch fallbacks to :code:`default_collate_fn`.
+
+    Args:
+        reuse_buffers(bool): whether to stack numpy array fields into
+            preallocated buffers which are reused among batches. Only set
+            it True if collated batch is consumed(copied) before collating
+            next batch. Default False.
+    """
+
+    def __init__(self, reuse_buffers=False):
+        self.reuse_buffers = reuse_buffers
+        self._schema = None
+        self._leaves = None
+        self._sequences = None
+        self._buffers = {}
+
+    def _collate_leaf(self, leaf_idx, schema, fields):
+        kind, *args = schema
+        if kind == _NDARRAY:
+            shape = (len(fields), *args[0])
+            dtype = args[1]
+            if self.reuse_buffers:
+                out = self._buffers.get(leaf_idx)
+                if out is None or out.shape != shape:
+                    out = np.empty(shape, dtype=dtype)
+                    self._buffers[leaf_idx] = out
+                # NOTE: casting='no' keeps the same output dtype with
+                # np.stack, mismatched dtype or shape raises and fallbacks
+                np.copyto(out, fields, casting='no')
+                return out
+            out = np.array(fields)
+            if out.shape != shape or out.dtype != dtype:
+                raise _SchemaMismatchError("fields mismatch with schema")
+            return out
+        elif kind == _TENSOR:
+            return paddle.stack(fields, axis=0)
+        elif kind == _NUMBER:
+            return np.array(fields)
+        return fields
+
+    def _build(self, schema, outputs):
+        kind, *args = schema
+        if kind is Mapping:
+            return {key: self._build(child, outputs) for key, child in args[0]}
+        elif kind is Sequence:
+            return [self._build(child, outputs) for child in args[0]]
+        return next(outputs)
+
+    def __call__(self, batch):
+        if len(batch) == 0:
+            return default_collate_fn(batch)
+
+        schema = _infer_schema(batch[0])
+        if schema is None:
+            return default_collate_fn(batch)
+        if schema != self._schema:
+            self._schema = schema
+            self._leaves, self._sequences = _compile_schema(schema)
+            self._buffers = {}
+
+        try:
+            for path, fields_num in self._sequences:
+                if any(n != fields_num for n in map(len, _gather(batch, path))):
+                    raise _SchemaMismatchError(
+                        "fields number not same among samples in a batch"
+                    )
+            outputs = [
+                self._collate_leaf(idx, leaf_schema, _gather(batch, path))
+                for idx, (path, leaf_schema) in enumerate(self._leaves)
+            ]
+        except (
+            _SchemaMismatchError,
+            KeyError,
+            IndexError,
+            TypeError,
+            ValueError,
+        ):
+            return default_collate_fn(batch)
+        return self._build(schema, iter(outputs))
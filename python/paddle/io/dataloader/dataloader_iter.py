@@ -37,8 +37,9 @@ from ..multiprocess_utils import (
     _set_SIGCHLD_handler,
 )
 from .batch_sampler import _InfiniteIterableSampler
-from .collate import default_collate_fn, default_convert_fn
+from .collate import _SchemaCollateFn, default_convert_fn
 from .flat import _flatten_batch, _restore_batch
+from .shm_ring import _RingSlotBatch, _SharedMemoryRing
 from .worker import (
     _DatasetKind,
     _IterableDatasetStopIteration,
@@ -99,6 +100,8 @@ class _DataLoaderIterBase:
         self._use_buffer_reader = loader.use_buffer_reader
         self._prefetch_factor = loader.prefetch_factor
         self._use_shared_memory = loader.use_shared_memory
+        self._shm_ring_size = loader.shm_ring_size
+        self._shm_ring_slot_size = loader.shm_ring_slot_size
         self._timeout = (
             loader.timeout if loader.timeout > 0 else MP_STATUS_CHECK_INTERVAL
         )
@@ -108,7 +111,12 @@ class _DataLoaderIterBase:
 
         self._sampler_iter = iter(self._index_sampler)
         if self._auto_collate_batch:
-            self._collate_fn = loader.collate_fn or default_collate_fn
+            # NOTE: collated batch is copied into DenseTensor before next
+            # batch collating in single-process mode and shared memory
+            # mode, stacking buffers can be reused among batches
+            self._collate_fn = loader.collate_fn or _SchemaCollateFn(
+                reuse_buffers=self._num_workers == 0 or self._use_shared_memory
+            )
         else:
             self._collate_fn = loader.collate_fn or default_convert_fn
 
@@ -442,6 +450,7 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         self._workers = []
         self._worker_status = []
         self._indices_queues = []
+        self._shm_rings = []
         self._workers_idx_cycle = itertools.cycle(range(self._num_workers))
 
         # create data_queue for workers
@@ -456,6 +465,16 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
             indices_queue = multiprocessing.Queue()
             indices_queue.cancel_join_thread()
             self._indices_queues.append(indices_queue)
+            # NOTE: each worker owns a preallocated shared memory ring, batch
+            # written into the ring will not be pickled by data_queue
+            shm_ring = None
+            if self._shm_ring_size > 0:
+                shm_ring = _SharedMemoryRing(
+                    self._shm_ring_size,
+                    self._shm_ring_slot_size,
+                    multiprocessing.Queue(),
+                )
+            self._shm_rings.append(shm_ring)
             worker = multiprocessing.Process(
                 target=_worker_loop,
                 args=(
@@ -473,6 +492,7 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     self._use_shared_memory,
                     self._base_seed,
                     self._worker_shm_buffer_size,
+                    shm_ring,
                 ),
             )
             worker.daemon = True
@@ -560,7 +580,11 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                 else:
                     data = self._reader.read_next()
 
-        # 3. reset all states
+        # 3. reset all states, ring slots held by dropped batches
+        # should be given back to workers
+        for info in self._task_infos.values():
+            if len(info) == 3 and isinstance(info[1], _RingSlotBatch):
+                self._release_ring_slot(info[1])
         self._send_idx = 0
         self._rcvd_idx = 0
         self._batches_outstanding = 0
@@ -602,6 +626,11 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     for q in self._indices_queues:
                         q.cancel_join_thread()
                         q.close()
+                    for shm_ring in self._shm_rings:
+                        if shm_ring is not None:
+                            shm_ring.free_slots.cancel_join_thread()
+                            shm_ring.free_slots.close()
+                            shm_ring.close()
             finally:
                 core._erase_process_pids(id(self))
                 self._shutdown = True
@@ -628,7 +657,10 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     try:
                         # pack as DenseTensorArray
                         array = core.DenseTensorArray()
-                        if self._use_shared_memory:
+                        if isinstance(batch, _RingSlotBatch):
+                            for tensor in self._read_ring_slot(batch):
+                                array.append(tensor)
+                        elif self._use_shared_memory:
                             for tensor in batch:
                                 array.append(tensor)
                         else:
@@ -651,6 +683,26 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     finally:
                         self._rcvd_idx += 1
 
+    def _read_ring_slot(self, slot_batch):
+        # NOTE: arrays read from ring are views of shared memory, they are
+        # set into DenseTensor once here and the slot can be reused by the
+        # worker at once, no mmap file is created or unlinked per tensor
+        shm_ring = self._shm_rings[slot_batch.worker_id]
+        tensors = []
+        try:
+            for arr in shm_ring.read(slot_batch.slot_id, slot_batch.metas):
+                tensor = core.DenseTensor()
+                tensor.set(arr, core.CPUPlace())
+                tensors.append(tensor)
+        finally:
+            shm_ring.release(slot_batch.slot_id)
+        return tensors
+
+    def _release_ring_slot(self, slot_batch):
+        shm_ring = self._shm_rings[slot_batch.worker_id]
+        if shm_ring is not None:
+            shm_ring.release(slot_batch.slot_id)
+
     def _get_data(self):
         while not self._thread_done_event.is_set():
             # For IterableDataset, batch indices is generated infinitely
@@ -0,0 +1,161 @@
+#   Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import queue
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+# every array written into a slot starts at a multiple of this value
+_SLOT_ALIGNMENT = 64
+
+
+def _align(nbytes):
+    return (nbytes + _SLOT_ALIGNMENT - 1) // _SLOT_ALIGNMENT * _SLOT_ALIGNMENT
+
+
+class _RingSlotBatch:
+    """
+    Placeholder sent through the result queue instead of the batch data
+    when a worker wrote the batch into its shared memory ring, only the
+    slot index and array metas are pickled.
+    """
+
+    def __init__(self, worker_id, slot_id, metas):
+        self.worker_id = worker_id
+        self.slot_id = slot_id
+        # list of (offset, shape, dtype_str), one per flattened field
+        self.metas = metas
+
+
+class _SharedMemoryRing:
+    """
+    A preallocated shared memory slab split into ``num_slots`` slots of
+    ``slot_size`` bytes, owned by the main process and attached by one
+    DataLoader worker. Free slot ids are handed to the worker through
+    ``free_slots`` queue, the worker writes collated arrays into a free
+    slot and the main process gives the slot back after consuming it.
+
+    Args:
+        num_slots(int): slot number of the ring.
+        slot_size(int): bytes of each slot.
+        free_slots(multiprocessing.Queue): queue of free slot ids.
+        name(str|None): name of an existing shared memory block to attach,
+            None to create a new one. Default None.
+    """
+
+    def __init__(self, num_slots, slot_size, free_slots, name=None):
+        self.num_slots = num_slots
+        self.slot_size = _align(slot_size)
+        self.free_slots = free_slots
+        self._owner = name is None
+        if self._owner:
+            self._shm = shared_memory.SharedMemory(
+                create=True, size=self.num_slots * self.slot_size
+            )
+            for slot_id in range(self.num_slots):
+                self.free_slots.put(slot_id)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            # NOTE: the block is unlinked by the main process, do not let
+            # the resource tracker of the worker unlink it on exit.
+            try:
+                resource_tracker.unregister(self._shm._name, "shared_memory")
+            except Exception:
+                pass
+        self._closed = False
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def __reduce__(self):
+        # workers started by spawn attach the block by name, forked
+        # workers inherit the mapping directly
+        return (
+            _SharedMemoryRing,
+            (self.num_slots, self.slot_size, self.free_slots, self.name),
+        )
+
+    def fits(self, arrays):
+        nbytes = 0
+        for arr in arrays:
+            if not isinstance(arr, np.ndarray) or arr.dtype.hasobject:
+                return False
+            nbytes += _align(arr.nbytes)
+        return nbytes <= self.slot_size
+
+    def acquire(self):
+        """
+        Get a free slot id without blocking, return None if all slots are
+        in use.
+        """
+        try:
+            return self.free_slots.get_nowait()
+        except queue.Empty:
+            return None
+
+    def release(self, slot_id):
+        if not self._closed:
+            self.free_slots.put(slot_id)
+
+    def write(self, slot_id, arrays):
+        """
+        Copy arrays into slot ``slot_id`` and return their metas.
+        """
+        base = slot_id * self.slot_size
+        offset = 0
+        metas = []
+        for arr in arrays:
+            dst = np.ndarray(
+                arr.shape,
+                dtype=arr.dtype,
+                buffer=self._shm.buf,
+                offset=base + offset,
+            )
+            np.copyto(dst, arr, casting='no')
+            metas.append((offset, arr.shape, arr.dtype.str))
+            offset += _align(arr.nbytes)
+        return metas
+
+    def read(self, slot_id, metas):
+        """
+        Return arrays of slot ``slot_id`` as views of the shared memory,
+        the views are only valid before the slot is released.
+        """
+        base = slot_id * self.slot_size
+        return [
+            np.ndarray(
+                shape,
+                dtype=np.dtype(dtype),
+                buffer=self._shm.buf,
+                offset=base + offset,
+            )
+            for offset, shape, dtype in metas
+        ]
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._shm.close()
+        except BufferError:
+            # views are still referenced, memory is released on gc
+            pass
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
@@ -31,6 +31,7 @@ from ..multiprocess_utils import (
 )
 from .fetcher import _IterableDatasetFetcher, _MapDatasetFetcher
 from .flat import _flatten_batch
+from .shm_ring import _RingSlotBatch
 
 if TYPE_CHECKING:
     from paddle.io import Dataset
@@ -278,6 +279,21 @@ def _generate_states(base_seed=0, worker_id=0):
     return states
 
 
+def _write_to_ring(shm_ring, worker_id, batch):
+    # NOTE: write the flattened batch into a free slot of the shared memory
+    # ring, only slot index and array metas will be sent by the result
+    # queue. Return None to fallback to the queue transport if batch
+    # cannot be written, e.g. all slots are in use or batch is too large.
+    arrays = [b.numpy() if isinstance(b, paddle.Tensor) else b for b in batch]
+    if not shm_ring.fits(arrays):
+        return None
+    slot_id = shm_ring.acquire()
+    if slot_id is None:
+        return None
+    metas = shm_ring.write(slot_id, arrays)
+    return _RingSlotBatch(worker_id, slot_id, metas)
+
+
 def _worker_loop(
     dataset,
     dataset_kind,
@@ -293,6 +309,7 @@ def _worker_loop(
     use_shared_memory,
     base_seed,
     shm_cache_size=0,
+    shm_ring=None,
 ):
     try:
         # NOTE: [ mmap files clear ] When the child process exits unexpectedly,
@@ -391,6 +408,11 @@ def _worker_loop(
                 if isinstance(batch, _WorkerException):
                     out_queue.put((idx, batch, None))
                 batch, structure = _flatten_batch(batch)
+                if shm_ring is not None:
+                    slot_batch = _write_to_ring(shm_ring, worker_id, batch)
+                    if slot_batch is not None:
+                        out_queue.put((idx, slot_batch, structure))
+                        continue
                 if use_shared_memory:
 
                     def numpy2lodtensor(arr):
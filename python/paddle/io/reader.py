@@ -358,6 +358,16 @@ class DataLoader:
             worker id on each subprocess starting if not set as None. Default
             None.
         persistent_workers(bool, optional): whether to keep the workers in the DataLoader. Default False.
+        shm_ring_size (int, optional): slot number of the preallocated shared
+            memory ring of each worker. If :attr:`shm_ring_size` > 0, workers
+            write collated numpy arrays into a free slot of the ring in place
+            and only the slot index and batch structure are sent through the
+            inter-process queue, batches which cannot be written into the ring
+            (e.g. all slots in use or batch larger than a slot) fallback to
+            the queue transport. Only enabled in multi-process mode. Default 0.
+        shm_ring_slot_size (int, optional): bytes of each slot of the shared
+            memory ring, should be larger than the bytes of a batch. Default
+            64MB.
 
     Returns:
         DataLoader: an iterable object for data iterating, each element of the generated data is a Tensor.
@@ -440,6 +450,8 @@ class DataLoader:
     num_workers: int
     dataset_kind: _DatasetKind
     use_shared_memory: bool
+    shm_ring_size: int
+    shm_ring_slot_size: int
     timeout: int
     batch_sampler: BatchSampler | _InfiniteIterableSampler | None
     drop_last: bool
@@ -463,6 +475,8 @@ class DataLoader:
         timeout: int = 0,
         worker_init_fn: Callable[[int], None] | None = None,
         persistent_workers: bool = False,
+        shm_ring_size: int = 0,
+        shm_ring_slot_size: int = 64 * 1024 * 1024,
     ) -> None:
         self.return_list = return_list
         self.collate_fn = collate_fn
@@ -503,6 +517,15 @@ class DataLoader:
         if use_shared_memory and num_workers == 0:
             self.use_shared_memory = False
 
+        assert (
+            shm_ring_size >= 0
+        ), "shm_ring_size should be a non-negative value"
+        assert (
+            shm_ring_slot_size > 0
+        ), "shm_ring_slot_size should be a positive value"
+        self.shm_ring_size = shm_ring_size if num_workers > 0 else 0
+        self.shm_ring_slot_size = shm_ring_slot_size
+
         assert timeout >= 0, "timeout should be a non-negative value"
         self.timeout = timeout
 
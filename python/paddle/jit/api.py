@@ -92,6 +92,8 @@ if TYPE_CHECKING:
     from paddle._typing import NestedStructure
     from paddle.static import InputSpec
 
+    from .dy2static.shape_bucket import ShapeBucketPolicy
+
     class _SaveOptions(TypedDict):
         output_spec: NotRequired[Sequence[Tensor | int]]
         with_hook: NotRequired[bool]
@@ -181,6 +183,7 @@ def _check_and_set_backend(backend, build_strategy):
 class _ToStaticOptions(TypedDict):
     property: NotRequired[bool]
     full_graph: NotRequired[bool]
+    shape_bucket: NotRequired[ShapeBucketPolicy]
 
 
 class _ToStaticDecorator(Protocol):
@@ -252,7 +255,10 @@ def to_static(
             None. When backend is `CINN`, CINN compiler will be used to speed up
             training and inference.
         kwargs: Support keys including `property`, set `property` to True if the function
-            is python property.
+            is python property. And `shape_bucket`, a ShapeBucketPolicy to pad the
+            dynamic axes of the input tensors up to bucket sizes, so that inputs of
+            different sizes in a bucket share one traced program. The max_programs
+            of ShapeBucketPolicy only works with `full_graph=True`.
 
     Returns:
         Tensor(s): containing the numerical result.
@@ -281,6 +287,7 @@ def to_static(
     """
     property = kwargs.get("property", False)
     full_graph = kwargs.get("full_graph", None)
+    shape_bucket = kwargs.get("shape_bucket", None)
 
     def decorated(python_func):
         """
@@ -315,6 +322,7 @@ def to_static(
                 build_strategy=build_strategy,
                 property=property,
                 backend=backend,
+                shape_bucket=shape_bucket,
             ),
         )
 
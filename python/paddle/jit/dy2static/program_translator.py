@@ -425,7 +425,14 @@ class StaticFunction(Generic[_InputT, _RetT]):
 
         self._input_spec = input_spec
         self._function_spec = FunctionSpec(function, input_spec)
-        self._program_cache = ProgramCache()
+        self._shape_bucket = kwargs.get("shape_bucket", None)
+        self._program_cache = ProgramCache(
+            max_size=(
+                self._shape_bucket.max_programs
+                if self._shape_bucket is not None
+                else None
+            )
+        )
         self._descriptor_cache = weakref.WeakKeyDictionary()
         # Note: Hold a reference to ProgramTranslator for switching `enable_to_static`.
         self._program_trans = ProgramTranslator()
@@ -545,8 +552,33 @@ class StaticFunction(Generic[_InputT, _RetT]):
                 "following API: paddle.disable_static()."
             )
 
+        if self._shape_bucket is not None:
+            return self._call_with_shape_bucket(*args, **kwargs)
         return self._perform_call(*args, **kwargs)
 
+    def _call_with_shape_bucket(self, *args, **kwargs):
+        """
+        Pad the inputs up to the bucket sizes of the shape bucket policy
+        and record the statistics of the bucket.
+        """
+        args, kwargs = self._function_spec.unified_args_and_kwargs(args, kwargs)
+        args, kwargs, bucket, numels = self._shape_bucket.pad_inputs(
+            self._function_spec.args_name, args, kwargs
+        )
+        trace_count = self._trace_count()
+        outputs = self._perform_call(*args, **kwargs)
+        self._shape_bucket.record(
+            bucket, numels, self._trace_count() > trace_count
+        )
+        return outputs
+
+    def _trace_count(self):
+        """
+        The count of the programs traced, which is used to record whether a
+        call of the shape bucket policy traces.
+        """
+        return self._program_cache.trace_count
+
     def _is_train_mode(self) -> bool:
         if self.class_instance is not None:
             if not hasattr(self.class_instance, 'training'):
@@ -771,9 +803,23 @@ class SymbolicStaticFunction(StaticFunction):
                 "full_graph=False don't support input_spec arguments. It will not produce any effect.\n"
                 "You can set full_graph=True, then you can assign input spec.\n"
             )
+        shape_bucket = kwargs.get("shape_bucket", None)
+        if shape_bucket is not None and shape_bucket.max_programs is not None:
+            warnings.warn(
+                "full_graph=False don't support the max_programs of ShapeBucketPolicy. It will not produce any effect.\n"
+                "The translated codes are cached by SOT, you can set full_graph=True to bound the number of programs.\n"
+            )
         super().__init__(function, input_spec, **kwargs)
         self.last_call_input_spec = None
 
+    def _trace_count(self):
+        from ..sot.opcode_translator.executor.executor_cache import (
+            OpcodeExecutorCache,
+        )
+
+        # the codes are translated by SOT instead of the program cache
+        return OpcodeExecutorCache().translate_count
+
     def _perform_call(self, *args, **kwargs):
         from ..sot import symbolic_translate
 
@@ -1616,12 +1662,15 @@ class ProgramCache:
     Wrapper class for the program functions defined by dygraph function.
     """
 
-    def __init__(self):
+    def __init__(self, max_size=None):
         # {hash_id : (concrete_program, partial_layer)}
         self._caches = collections.OrderedDict()
         # trace mostly recent used program
         self._recent_key = None
         self._recent_cache_key = None
+        # the least recently used programs are evicted beyond max_size
+        self._max_size = max_size
+        self.trace_count = 0
 
     def _build_once(self, cache_key):
         # TODO(Aurelius84): Need a global FLAGS to enable/disable to_prim
@@ -1692,6 +1741,12 @@ class ProgramCache:
         self._recent_key = item_id
         if item_id not in self._caches:
             self._caches[item_id] = self._build_once(item)
+            self.trace_count += 1
+            if (
+                self._max_size is not None
+                and len(self._caches) > self._max_size
+            ):
+                self._caches.popitem(last=False)
             # Note: raise warnings if number of traced program is more than `max_tracing_count`
             current_tracing_count = len(self._caches)
             if current_tracing_count > MAX_TRACED_PROGRAM_COUNT:
@@ -1699,6 +1754,8 @@ class ProgramCache:
                     f"Current traced program number: {current_tracing_count} > `max_tracing_count`:{MAX_TRACED_PROGRAM_COUNT}. Too much cached programs will bring expensive overhead. "
                     "The reason may be: (1) passing tensors with different shapes, (2) passing python objects instead of tensors."
                 )
+        elif self._max_size is not None:
+            self._caches.move_to_end(item_id)
 
         return self._caches[item_id]
 
@@ -0,0 +1,209 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import TYPE_CHECKING
+
+import paddle
+from paddle.base import core
+from paddle.utils import map_structure
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+__all__ = []
+
+
+class ShapeBucketPolicy:
+    """
+    Pad the dynamic axes of the input tensors of a function decorated by
+    ``paddle.jit.to_static`` up to the sizes of buckets, so that the inputs
+    of different sizes in the same bucket share one traced program, e.g.
+    the batches of variable-length sequences.
+
+    The function receives the padded tensors. With the default pad_value 0,
+    the padded positions of a 0/1 attention mask are masked out, and the
+    padded token ids are 0. The outputs keep the padded sizes.
+
+    The policy records the calls, traces and element counts of every
+    bucket, see ``stats``. With ``full_graph=False``, a trace is a call
+    that translates any code by SOT.
+
+    Args:
+        axes(int|Sequence[int], optional): The dynamic axes of the input
+            tensors, the tensors whose rank is not greater than an axis are
+            not padded on it. Default: 1.
+        boundaries(Sequence[int]|None, optional): The upper bounds of the
+            buckets. A size is padded up to the smallest boundary not less
+            than it, the sizes greater than all the boundaries are not
+            padded. If None, the sizes are padded up to the next power of
+            two. Default: None.
+        pad_value(int|float, optional): The value to pad. Default: 0.
+        min_size(int, optional): The min size of a power-of-two bucket.
+            Default: 1.
+        input_names(Sequence[str]|None, optional): The names of arguments
+            to pad, all the tensor arguments are padded if None.
+            Default: None.
+        max_programs(int|None, optional): The max number of programs cached
+            by the decorated function, the least recently used programs are
+            evicted. It only works with ``full_graph=True``, the codes
+            translated with ``full_graph=False`` are cached by SOT, which
+            warns and ignores it. Default: None, which means unbounded.
+
+    Examples:
+        .. code-block:: python
+
+            >>> # doctest: +SKIP('`paddle.jit.to_static` can not run in xdoctest')
+            >>> import paddle
+            >>> from paddle.jit.dy2static.shape_bucket import ShapeBucketPolicy
+
+            >>> policy = ShapeBucketPolicy(axes=1, boundaries=[32, 64, 128])
+            >>> @paddle.jit.to_static(full_graph=True, shape_bucket=policy)
+            ... def embed(ids, mask):
+            ...     return (ids * mask).sum(axis=1)
+            >>> for seq_len in [20, 25, 40]:
+            ...     ids = paddle.randint(1, 100, [4, seq_len])
+            ...     out = embed(ids, paddle.ones_like(ids))
+            >>> print(embed.get_traced_count())
+            2
+            >>> print(policy.stats())
+            {(32, 32): {'calls': 2, 'traces': 1, 'numel': 512, 'padded_numel': 152}, (64, 64): {'calls': 1, 'traces': 1, 'numel': 512, 'padded_numel': 192}}
+    """
+
+    def __init__(
+        self,
+        axes: int | Sequence[int] = 1,
+        boundaries: Sequence[int] | None = None,
+        pad_value: float = 0,
+        min_size: int = 1,
+        input_names: Sequence[str] | None = None,
+        max_programs: int | None = None,
+    ):
+        self.axes = sorted({axes} if isinstance(axes, int) else set(axes))
+        if any(axis < 0 for axis in self.axes):
+            raise ValueError(
+                f"The axes of ShapeBucketPolicy should be non-negative, but received {axes}."
+            )
+        if boundaries is not None:
+            boundaries = sorted(set(boundaries))
+            if not boundaries or boundaries[0] <= 0:
+                raise ValueError(
+                    f"The boundaries of ShapeBucketPolicy should be positive, but received {boundaries}."
+                )
+        if max_programs is not None and max_programs <= 0:
+            raise ValueError(
+                f"The max_programs of ShapeBucketPolicy should be positive, but received {max_programs}."
+            )
+        self.boundaries = boundaries
+        self.pad_value = pad_value
+        self.min_size = min_size
+        self.input_names = None if input_names is None else set(input_names)
+        self.max_programs = max_programs
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def bucket_size(self, size: int) -> int:
+        """
+        Get the size of the bucket a size falls in.
+        """
+        if size <= 0:
+            return size
+        if self.boundaries is None:
+            return max(1 << (size - 1).bit_length(), self.min_size)
+        index = bisect.bisect_left(self.boundaries, size)
+        if index == len(self.boundaries):
+            return size
+        return self.boundaries[index]
+
+    def _pad(self, tensor, bucket, numels):
+        if (
+            not isinstance(tensor, core.eager.Tensor)
+            or len(tensor.shape) <= self.axes[0]
+        ):
+            return tensor
+        numel = int(tensor.size)
+        shape = list(tensor.shape)
+        for axis in self.axes:
+            if axis >= len(shape):
+                break
+            size = self.bucket_size(shape[axis])
+            bucket.append(size)
+            if size == shape[axis]:
+                continue
+            pad_shape = list(shape)
+            pad_shape[axis] = size - shape[axis]
+            tensor = paddle.concat(
+                [
+                    tensor,
+                    paddle.full(pad_shape, self.pad_value, dtype=tensor.dtype),
+                ],
+                axis=axis,
+            )
+            shape[axis] = size
+        numels[0] += numel
+        numels[1] += int(tensor.size)
+        return tensor
+
+    def pad_inputs(self, arg_names, args, kwargs):
+        """
+        Pad the tensors in args and kwargs, the args are unified with
+        arg_names by FunctionSpec.
+
+        Returns:
+            The padded args and kwargs, the bucket of the inputs and the
+            numels of the inputs before and after padding.
+        """
+        bucket = []
+        numels = [0, 0]
+
+        def pad(name, value):
+            if self.input_names is not None and name not in self.input_names:
+                return value
+            return map_structure(
+                lambda tensor: self._pad(tensor, bucket, numels), value
+            )
+
+        args = tuple(pad(name, arg) for name, arg in zip(arg_names, args))
+        kwargs = {name: pad(name, value) for name, value in kwargs.items()}
+        return args, kwargs, tuple(bucket), numels
+
+    def record(self, bucket, numels, traced: bool) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(
+                bucket,
+                {"calls": 0, "traces": 0, "numel": 0, "padded_numel": 0},
+            )
+            stats["calls"] += 1
+            stats["traces"] += int(traced)
+            stats["numel"] += numels[1]
+            stats["padded_numel"] += numels[1] - numels[0]
+
+    def stats(self) -> dict[tuple[int, ...], dict[str, int]]:
+        """
+        Get the statistics of each bucket, keyed by the bucket sizes of the
+        padded axes of the input tensors. ``calls - traces`` is the number
+        of the calls hitting the cached program, and
+        ``padded_numel / numel`` is the ratio of the padded elements.
+        """
+        with self._lock:
+            return {
+                bucket: dict(stats) for bucket, stats in self._stats.items()
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
@@ -15,6 +15,7 @@
 from __future__ import annotations
 
 import gc
+import heapq
 import traceback
 from typing import TYPE_CHECKING, List, Tuple
 
@@ -22,6 +23,7 @@ from paddle.base.dygraph.base import sot_simulation_mode_guard
 
 from ...profiler import EventGuard, event_register
 from ...psdb import NO_FALLBACK_CODES
+from ...symbolic.compile_cache import COMPILE_LOCK
 from ...utils import (
     ENV_SOT_ALLOW_DYNAMIC_SHAPE,
     BreakGraphError,
@@ -49,6 +51,100 @@ dummy_guard.expr = "lambda frame: True"
 dummy_guard.inlined_expr = "lambda frame: True"
 
 
+class GuardIndex:
+    """
+    A hash index of the guarded functions of a code object. The guards of
+    different specializations of a code mostly share the same comparisons
+    like `{}.shape[0] == 3`, and only differ in the constants compared with.
+    The left sides shared by all guards are computed once from the frame as
+    the key, and the guards comparing with the same constants are grouped
+    in a bucket of the key, so that only the guards in the bucket are
+    checked in most cases whatever the number of guarded functions is.
+
+    The index only decides the order of checking, the guards not in the
+    bucket are still checked after them, so a guard passed is never missed.
+
+    Attributes:
+        guarded_fns (GuardedFunctions): The guarded functions indexed.
+        key_exprs (list[str]): The expressions of the key.
+    """
+
+    def __init__(self, guarded_fns: GuardedFunctions):
+        self.guarded_fns = guarded_fns
+        self.num_indexed = 0
+        self.key_exprs = []
+        self.key_fn = None
+        self.buckets = {}
+        self.unindexed = []
+
+    def rebuild(self):
+        guarded_fns = self.guarded_fns
+        self.num_indexed = len(guarded_fns)
+        self.key_exprs = []
+        self.key_fn = None
+        self.buckets = {}
+        self.unindexed = []
+
+        equality_guards = [
+            getattr(guard_fn, "equality_guards", None)
+            for _, guard_fn in guarded_fns
+        ]
+        indexed = [i for i, guards in enumerate(equality_guards) if guards]
+        if len(indexed) < 2:
+            return
+        common_exprs = set.intersection(
+            *(set(equality_guards[i].keys()) for i in indexed)
+        )
+        # only the expressions distinguishing the guards are in the key
+        key_exprs = sorted(
+            expr
+            for expr in common_exprs
+            if len({equality_guards[i][expr] for i in indexed}) > 1
+        )
+        if not key_exprs:
+            return
+        try:
+            key_fn = eval(
+                "lambda frame: (" + ", ".join(key_exprs) + ",)",
+                guarded_fns[indexed[0]][1].__globals__,
+            )
+        except Exception as e:
+            log(2, f"[Cache]: Failed to build the guard index: {e}\n")
+            return
+        indexed = set(indexed)
+        for i, guards in enumerate(equality_guards):
+            if i in indexed:
+                key = tuple(guards[expr] for expr in key_exprs)
+                self.buckets.setdefault(key, []).append(i)
+            else:
+                self.unindexed.append(i)
+        self.key_exprs = key_exprs
+        self.key_fn = key_fn
+        log(3, f"[Cache]: Index the guards by {key_exprs}\n")
+
+    def iter_candidates(self, frame: types.FrameType):
+        """
+        Iterate the guarded functions, the ones in the bucket of the frame
+        come first.
+        """
+        if self.num_indexed != len(self.guarded_fns):
+            self.rebuild()
+        if self.key_fn is None:
+            yield from self.guarded_fns
+            return
+        try:
+            candidates = self.buckets.get(self.key_fn(frame), [])
+        except Exception:
+            candidates = []
+        visited = set()
+        for i in heapq.merge(candidates, self.unindexed):
+            visited.add(i)
+            yield self.guarded_fns[i]
+        for i, guarded_fn in enumerate(self.guarded_fns):
+            if i not in visited:
+                yield guarded_fn
+
+
 class OpcodeExecutorCache(metaclass=Singleton):
     """
     A singleton class that implements a cache for translated instructions.
@@ -57,17 +153,20 @@ class OpcodeExecutorCache(metaclass=Singleton):
     Attributes:
         cache (dict): A dictionary that maps code objects to tuples of a cache getter function and a list of guarded functions.
         translate_count (int): The count of how many instructions have been translated. It is used to test whether the cache hits.
+        guard_indices (dict): A dictionary that maps code objects to the GuardIndex of their guarded functions.
     """
 
-    MAX_CACHE_SIZE = 20
+    MAX_CACHE_SIZE = 200
     cache: dict[types.CodeType, GuardedFunctions]
     translate_count: int
     code_symbolic_inputs: dict[types.CodeType, dict[str, None | dict[int, int]]]
+    guard_indices: dict[types.CodeType, GuardIndex]
 
     def __init__(self):
         self.cache = {}
         self.translate_count = 0
         self.code_symbolic_inputs = {}
+        self.guard_indices = {}
 
     def get_symbolic_inputs(
         self, code: types.CodeType
@@ -82,6 +181,7 @@ class OpcodeExecutorCache(metaclass=Singleton):
         self.cache.clear()
         self.translate_count = 0
         self.code_symbolic_inputs.clear()
+        self.guard_indices.clear()
 
     def dump_state(self):
         return {
@@ -95,6 +195,15 @@ class OpcodeExecutorCache(metaclass=Singleton):
         self.translate_count = state["translate_count"]
         self.code_symbolic_inputs = state["code_symbolic_inputs"]
 
+    def get_guard_index(
+        self, code: types.CodeType, guarded_fns: GuardedFunctions
+    ) -> GuardIndex:
+        guard_index = self.guard_indices.get(code)
+        # the cache may be replaced by load_state
+        if guard_index is None or guard_index.guarded_fns is not guarded_fns:
+            guard_index = self.guard_indices[code] = GuardIndex(guarded_fns)
+        return guard_index
+
     def __call__(self, frame: types.FrameType, **kwargs) -> CustomCode:
         code: types.CodeType = frame.f_code
         if code not in self.cache:
@@ -121,11 +230,8 @@ class OpcodeExecutorCache(metaclass=Singleton):
             CustomCode: The custom code object if a matching guard function is found, otherwise None.
         """
 
-        if len(guarded_fns) >= self.MAX_CACHE_SIZE:
-            log(2, "[Cache]: Exceed max cache size, skip it\n")
-            return CustomCode(None, False)
-
-        for custom_code, guard_fn in guarded_fns:
+        guard_index = self.get_guard_index(frame.f_code, guarded_fns)
+        for custom_code, guard_fn in guard_index.iter_candidates(frame):
             try:
                 with EventGuard("try guard"):
                     guard_result = guard_fn(frame)
@@ -158,6 +264,9 @@ class OpcodeExecutorCache(metaclass=Singleton):
                 continue
 
         log(2, "[Cache]: all guards missed\n")
+        if len(guarded_fns) >= self.MAX_CACHE_SIZE:
+            log(2, "[Cache]: Exceed max cache size, skip it\n")
+            return CustomCode(None, False)
         new_custom_code, guard_fn = self.translate(frame, **kwargs)
         if guard_fn is not None:
             guarded_fns.append((new_custom_code, guard_fn))
@@ -181,7 +290,10 @@ class OpcodeExecutorCache(metaclass=Singleton):
         """
         self.before_translate_hook(frame)
         self.translate_count += 1
-        custom_new_code, guard_fn = start_translate(frame, **kwargs)
+        # wait for the critical section of the subgraph compiling in
+        # background, if any
+        with COMPILE_LOCK:
+            custom_new_code, guard_fn = start_translate(frame, **kwargs)
         return custom_new_code, guard_fn
 
     def analyse_guard_global_object(self, guard_fn):
@@ -14,6 +14,7 @@
 
 from __future__ import annotations
 
+import re
 import types
 import weakref
 from functools import cached_property
@@ -98,6 +99,8 @@ class FasterStringifiedExpression(StringifiedExpression):
         free_vars: dict[str, Any],
     ):
         self.faster_guard = faster_guard
+        # the python comparison of the guard, which is used to index guards
+        self.original_expr_template = expr_template
         if ENV_SOT_ENABLE_FASTER_GUARD.get():
             original_expr_template = expr_template
             guard_cls_name = faster_guard.__class__.__name__
@@ -116,6 +119,52 @@ class FasterStringifiedExpression(StringifiedExpression):
         super().__init__(expr_template, sub_exprs, free_vars)
 
 
+# Matches the guards like `{}.shape[0] == 3`, whose left side is computed from
+# the frame and right side is a constant.
+EQUALITY_GUARD_PATTERN = re.compile(
+    r"^(?P<lhs>[^=]*\{\d*\}[^=]*) == (?P<rhs>[^{}=]+)$"
+)
+
+
+def get_equality_guards(
+    stringified_guard: StringifiedExpression,
+) -> list[tuple[str, Any]]:
+    """
+    Split a guard like `{}.shape[0] == 3` into the inlined expression of the
+    left side and the value of the right side, which are used to index the
+    guards by the values computed from the frame. A guard joined by `and`
+    is split into each part.
+
+    The parts which are not a comparison with a hashable constant are
+    skipped.
+    """
+    expr_template = getattr(
+        stringified_guard,
+        "original_expr_template",
+        stringified_guard.expr_template,
+    )
+    if " or " in expr_template:
+        return []
+    equality_guards = []
+    for template in expr_template.split(" and "):
+        match = EQUALITY_GUARD_PATTERN.match(template)
+        if match is None:
+            continue
+        try:
+            value = eval(match.group("rhs"), dict(stringified_guard.free_vars))
+            hash(value)
+            lhs = match.group("lhs").format(
+                *[
+                    sub_expr.inlined_expr
+                    for sub_expr in stringified_guard.sub_exprs
+                ]
+            )
+        except Exception:
+            continue
+        equality_guards.append((lhs, value))
+    return equality_guards
+
+
 def union_free_vars(*free_vars: dict[str, Any]):
     return {k: v for d in free_vars for k, v in d.items()}
 
@@ -135,6 +184,7 @@ def make_guard(stringified_guards: list[StringifiedExpression]) -> Guard:
             guard = lambda frame: True
             guard.expr = "lambda frame: True"
             guard.original_guard = guard
+            guard.equality_guards = {}
             return guard
 
         free_vars = union_free_vars(
@@ -152,6 +202,10 @@ def make_guard(stringified_guards: list[StringifiedExpression]) -> Guard:
         log(3, f"[Guard]: {inlined_guard_expr}\n")
         guard.inlined_expr = inlined_guard_expr
         guard.expr = guard_expr
+        guard.equality_guards = {}
+        for expr in stringified_guards:
+            for lhs, value in get_equality_guards(expr):
+                guard.equality_guards.setdefault(lhs, value)
 
         assert callable(guard), "guard must be callable."
 
@@ -15,6 +15,10 @@
 from __future__ import annotations
 
 import inspect
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import TYPE_CHECKING
 
 import paddle
@@ -25,6 +29,7 @@ from paddle.framework import _dygraph_tracer, use_pir_api
 from ..infer_meta import convert_meta_to_input_spec
 from ..profiler import EventGuard
 from ..utils import (
+    ENV_SOT_ASYNC_COMPILE,
     ENV_SOT_EXPORT,
     Cache,
     GraphLogger,
@@ -41,6 +46,8 @@ from .export import export
 from .interpreter import compile_sir
 
 if TYPE_CHECKING:
+    from concurrent.futures import Future
+
     from paddle.static import InputSpec
 
     from .symbolic_context import SymbolicTraceContext
@@ -68,6 +75,20 @@ def _is_computation_op(op):
     return not _is_builtin_op(op) and op.name() not in ["pd_op.data"]
 
 
+def _count_statements(context, sir):
+    # the statements of the SIRs called are counted, since they are built
+    # into the same program
+    count = 0
+    for statement in sir.statements:
+        if statement.type == "call":
+            count += _count_statements(
+                context, context.get_sir(statement.sir_name)
+            )
+        else:
+            count += 1
+    return count
+
+
 class UniqueIdGenerator:
     def __init__(self):
         self._id = 0
@@ -93,19 +114,201 @@ class TensorIdAllocator(metaclass=Singleton):
         # return tensor._get_tensor_ptr()
 
 
+class CompileLock:
+    """
+    Building static programs switches the global default programs, so the
+    translation and the compilation of subgraphs are serialized by this
+    lock. ``with lock:`` is used on the calling thread, and it takes
+    precedence over :meth:`background`, so a new subgraph waits for at most
+    one critical section of the background compilation instead of the whole
+    compile queue.
+
+    Attributes:
+        blocked_calls (int): The number of times the calling thread waited
+            for the lock.
+        blocked_time (float): The time in seconds the calling thread waited
+            for the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._cond = threading.Condition()
+        self._waiters = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._cond:
+            self.blocked_calls = 0
+            self.blocked_time = 0.0
+
+    def acquire(self):
+        if self._lock.acquire(blocking=False):
+            return
+        start = time.perf_counter()
+        with self._cond:
+            self._waiters += 1
+        try:
+            self._lock.acquire()
+        finally:
+            with self._cond:
+                self._waiters -= 1
+                self.blocked_calls += 1
+                self.blocked_time += time.perf_counter() - start
+                self._cond.notify_all()
+
+    def release(self):
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    @contextmanager
+    def background(self):
+        """
+        Hold the lock in background after the waiting calling threads.
+        """
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._waiters == 0)
+            self._lock.acquire()
+            with self._cond:
+                if self._waiters == 0:
+                    break
+            # a calling thread started waiting, give the lock to it
+            self._lock.release()
+        try:
+            yield
+        finally:
+            self._lock.release()
+
+
+COMPILE_LOCK = CompileLock()
+
+
+class AsyncCompileWorker(metaclass=Singleton):
+    """
+    Build the static programs of subgraphs in a background thread. Before
+    the program of a subgraph is ready, the subgraph runs eagerly, so that
+    a new subgraph never blocks the step on its compilation.
+
+    Attributes:
+        queue_depth (int): The number of subgraphs waiting or being compiled.
+        max_queue_depth (int): The max queue depth since the stats are reset.
+        num_compiled (int): The number of subgraphs compiled in background.
+        num_failed (int): The number of subgraphs failed to compile in
+            background, they are compiled again when they are called.
+        eager_calls/compiled_calls (int): The number of subgraph calls run
+            eagerly/by the compiled programs.
+        eager_time/compiled_time (float): The host time in seconds spent on
+            the eager/compiled subgraph calls.
+        blocked_calls/blocked_time: The times and the time in seconds the
+            calling thread waited for ``COMPILE_LOCK``, see
+            :class:`CompileLock`.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._lock = threading.Lock()
+        self.queue_depth = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self.max_queue_depth = self.queue_depth
+            self.num_compiled = 0
+            self.num_failed = 0
+            self.eager_calls = 0
+            self.compiled_calls = 0
+            self.eager_time = 0.0
+            self.compiled_time = 0.0
+        COMPILE_LOCK.reset_stats()
+
+    def submit(self, compile_fn) -> Future:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    1, thread_name_prefix="sot_async_compile"
+                )
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        return self._executor.submit(self._compile, compile_fn)
+
+    def _compile(self, compile_fn):
+        try:
+            result = compile_fn()
+            with self._lock:
+                self.num_compiled += 1
+            return result
+        except:
+            with self._lock:
+                self.num_failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.queue_depth -= 1
+
+    def wait(self):
+        """
+        Wait until all the subgraphs submitted are compiled.
+        """
+        with self._lock:
+            executor = self._executor
+        if executor is not None:
+            # the subgraphs are compiled in order by a single thread
+            executor.submit(lambda: None).result()
+
+    def record(self, compiled: bool, usetime: float):
+        with self._lock:
+            if compiled:
+                self.compiled_calls += 1
+                self.compiled_time += usetime
+            else:
+                self.eager_calls += 1
+                self.eager_time += usetime
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            return {
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "num_compiled": self.num_compiled,
+                "num_failed": self.num_failed,
+                "eager_calls": self.eager_calls,
+                "compiled_calls": self.compiled_calls,
+                "eager_time": self.eager_time,
+                "compiled_time": self.compiled_time,
+                "blocked_calls": COMPILE_LOCK.blocked_calls,
+                "blocked_time": COMPILE_LOCK.blocked_time,
+            }
+
+
 class FallbackWrapper:
     """
     Used to store and call static graph methods generated by paddle.jit.to_static
     """
 
-    def __init__(self, compiled_fn, SIR, is_training: bool):
+    def __init__(
+        self,
+        compiled_fn,
+        SIR,
+        is_training: bool,
+        num_statements: int | None = None,
+    ):
         self.compiled_fn = compiled_fn
         self.partial_program = None
         self.concrete_program = None
         self.SIR = SIR  # for debug
         self.is_training = is_training
+        self.num_statements = (
+            len(SIR) if num_statements is None else num_statements
+        )
         self.exported = False
         self.is_first_call = True
+        self.compile_future = None
+        self.async_compile_done = False
 
     def amp_cast_inputs(self, args, kwargs):
         """Prepare inputs for amp, cast float16 into float32 if needed."""
@@ -130,19 +333,31 @@ class FallbackWrapper:
             false_fn=lambda x: x,
         )
 
+    def get_input_spec(self):
+        return convert_meta_to_input_spec(
+            tuple(
+                self.SIR.symbol_meta_map[symbol] for symbol in self.SIR.inputs
+            )
+        )
+
+    def build_partial_program(self, *args, **kwargs):
+        concrete_program, partial_program = (
+            self.compiled_fn.get_concrete_program(*args, **kwargs)
+        )
+        partial_program.training = self.is_training
+        return concrete_program, partial_program
+
     def graph_size(self):
+        if self.partial_program is None and ENV_SOT_ASYNC_COMPILE.get():
+            # the program will be built in background, so the size compared
+            # with MIN_GRAPH_SIZE is estimated by the statements of the SIR
+            # instead of building the program on the translating thread
+            return self.num_statements
         if self.partial_program is None:
-            input_spec = convert_meta_to_input_spec(
-                tuple(
-                    self.SIR.symbol_meta_map[symbol]
-                    for symbol in self.SIR.inputs
-                )
-            )
             (
                 self.concrete_program,
                 self.partial_program,
-            ) = self.compiled_fn.get_concrete_program(input_spec)
-            self.partial_program.training = self.is_training
+            ) = self.build_partial_program(self.get_input_spec())
         if use_pir_api():
             global_block_ops = (
                 self.concrete_program.main_program.global_block().ops
@@ -217,8 +432,66 @@ class FallbackWrapper:
             self.graph_size(),
         )
 
+    def compile_in_background(self):
+        # build the program and create the runnable program in two critical
+        # sections, a new subgraph translated meanwhile waits for one of them
+        with COMPILE_LOCK.background():
+            concrete_program, partial_program = (
+                self.concrete_program,
+                self.partial_program,
+            )
+            if partial_program is None:
+                concrete_program, partial_program = self.build_partial_program(
+                    self.get_input_spec()
+                )
+        # create the runnable program ahead of the first compiled call
+        with COMPILE_LOCK.background():
+            partial_program.program  # noqa: B018
+        return concrete_program, partial_program
+
+    def is_compiling_async(self) -> bool:
+        """
+        Whether the subgraph should run eagerly while its static program is
+        being compiled in background. The compiled program is swapped in by
+        the first call after the compilation is done.
+        """
+        if self.compile_future is None:
+            # the AMP state of the caller is not seen by the worker thread
+            if not ENV_SOT_ASYNC_COMPILE.get() or amp_state() is not None:
+                self.async_compile_done = True
+                return False
+            self.compile_future = AsyncCompileWorker().submit(
+                self.compile_in_background
+            )
+        if not self.compile_future.done():
+            return True
+        try:
+            (
+                self.concrete_program,
+                self.partial_program,
+            ) = self.compile_future.result()
+        except Exception as e:
+            log(
+                2,
+                f"[AsyncCompile] Failed to compile {self.SIR.name} in background, compile it again: {e}\n",
+            )
+        self.compile_future = None
+        self.async_compile_done = True
+        return False
+
+    def eager_call(self, *args, **kwargs):
+        with EventGuard(f"FallbackWrapper: eager run {self.SIR.name}"):
+            start = time.perf_counter()
+            outputs = self.compiled_fn.dygraph_function(*args, **kwargs)
+            clear_eager_tensor_name(outputs)
+            AsyncCompileWorker().record(False, time.perf_counter() - start)
+            return outputs
+
     def __call__(self, *args, **kwargs):
+        if not self.async_compile_done and self.is_compiling_async():
+            return self.eager_call(*args, **kwargs)
         with EventGuard(f"FallbackWrapper: {self.SIR.name}"):
+            start = time.perf_counter()
             if StepInfoManager().need_back_trace:
                 trace_back_frames()
 
@@ -237,12 +510,13 @@ class FallbackWrapper:
                 ),
             )
             if self.partial_program is None:
-                with EventGuard("FallbackWrapper: get_concrete_program"):
+                with EventGuard(
+                    "FallbackWrapper: get_concrete_program"
+                ), COMPILE_LOCK:
                     (
                         self.concrete_program,
                         self.partial_program,
-                    ) = self.compiled_fn.get_concrete_program(*args, **kwargs)
-                    self.partial_program.training = self.is_training
+                    ) = self.build_partial_program(*args, **kwargs)
             with EventGuard("FallbackWrapper: sot call partial_program"):
                 outputs = self.partial_program.sot_call(*args, **kwargs)
 
@@ -264,6 +538,7 @@ class FallbackWrapper:
                 self.exported = True
 
             self.is_first_call = False
+            AsyncCompileWorker().record(True, time.perf_counter() - start)
             return outputs
 
 
@@ -328,4 +603,7 @@ class CompileSIRCache(Cache, metaclass=Singleton):
             ),
             context.get_sir(sir_name),
             is_training=kwargs['training'],
+            num_statements=_count_statements(
+                context, context.get_sir(sir_name)
+            ),
         )
@@ -18,6 +18,7 @@ from .envs import (  # noqa: F401
     ENV_COST_MODEL,
     ENV_MIN_GRAPH_SIZE,
     ENV_SOT_ALLOW_DYNAMIC_SHAPE,
+    ENV_SOT_ASYNC_COMPILE,
     ENV_SOT_ENABLE_FASTER_GUARD,
     ENV_SOT_ENABLE_GUARD_TREE,
     ENV_SOT_EXPORT,
@@ -26,6 +27,7 @@ from .envs import (  # noqa: F401
     ENV_SOT_WITH_CONTROL_FLOW,
     ENV_STRICT_MODE,
     allow_dynamic_shape_guard,
+    async_compile_guard,
     cost_model_guard,
     export_guard,
     faster_guard_guard,
@@ -58,6 +58,7 @@ ENV_SOT_COLLECT_INFO = StringListEnvironmentVariable("SOT_COLLECT_INFO", [])
 ENV_SOT_FORCE_FALLBACK_SIR_IDS = StringEnvironmentVariable(
     "SOT_FORCE_FALLBACK_SIR_IDS", ""
 )
+ENV_SOT_ASYNC_COMPILE = BooleanEnvironmentVariable("SOT_ASYNC_COMPILE", False)
 
 
 @contextmanager
@@ -112,3 +113,9 @@ def guard_tree_guard(value: bool):
 def sot_step_profiler_guard(value: bool):
     with EnvironmentVariableGuard(ENV_ENABLE_SOT_STEP_PROFILER, value):
         yield
+
+
+@contextmanager
+def async_compile_guard(value: bool):
+    with EnvironmentVariableGuard(ENV_SOT_ASYNC_COMPILE, value):
+        yield
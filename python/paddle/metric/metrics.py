@@ -338,6 +338,22 @@ class Accuracy(Metric):
         res = res[0] if len(self.topk) == 1 else res
         return res
 
+    def merge(self, other: Accuracy) -> None:
+        """
+        Merge the states of another Accuracy instance, e.g. the instance
+        of another worker or rank, into this instance.
+
+        Args:
+            other (Accuracy): the Accuracy instance with the same topk.
+        """
+        if tuple(self.topk) != tuple(other.topk):
+            raise ValueError(
+                f"Cannot merge Accuracy with topk {other.topk} into topk {self.topk}."
+            )
+        for i in range(len(self.topk)):
+            self.total[i] += other.total[i]
+            self.count[i] += other.count[i]
+
     def _init_name(self, name: str | None) -> None:
         name = name or 'acc'
         if self.maxk != 1:
@@ -455,16 +471,13 @@ class Precision(Metric):
             raise ValueError("The 'labels' must be a numpy ndarray or Tensor.")
 
         sample_num = labels.shape[0]
-        preds = np.floor(preds + 0.5).astype("int32")
+        preds = np.floor(preds + 0.5).astype("int32").reshape([sample_num])
+        labels = labels.reshape([sample_num])
 
-        for i in range(sample_num):
-            pred = preds[i]
-            label = labels[i]
-            if pred == 1:
-                if pred == label:
-                    self.tp += 1
-                else:
-                    self.fp += 1
+        pos_preds = preds == 1
+        tp = int(np.count_nonzero(pos_preds & (labels == 1)))
+        self.tp += tp
+        self.fp += int(np.count_nonzero(pos_preds)) - tp
 
     def reset(self) -> None:
         """
@@ -483,6 +496,17 @@ class Precision(Metric):
         ap = self.tp + self.fp
         return float(self.tp) / ap if ap != 0 else 0.0
 
+    def merge(self, other: Precision) -> None:
+        """
+        Merge the states of another Precision instance, e.g. the instance
+        of another worker or rank, into this instance.
+
+        Args:
+            other (Precision): the Precision instance to merge.
+        """
+        self.tp += other.tp
+        self.fp += other.fp
+
     def name(self) -> str:
         """
         Returns metric name
@@ -594,16 +618,13 @@ class Recall(Metric):
             raise ValueError("The 'labels' must be a numpy ndarray or Tensor.")
 
         sample_num = labels.shape[0]
-        preds = np.rint(preds).astype("int32")
+        preds = np.rint(preds).astype("int32").reshape([sample_num])
+        labels = labels.reshape([sample_num])
 
-        for i in range(sample_num):
-            pred = preds[i]
-            label = labels[i]
-            if label == 1:
-                if pred == label:
-                    self.tp += 1
-                else:
-                    self.fn += 1
+        pos_labels = labels == 1
+        tp = int(np.count_nonzero(pos_labels & (preds == 1)))
+        self.tp += tp
+        self.fn += int(np.count_nonzero(pos_labels)) - tp
 
     def accumulate(self) -> float:
         """
@@ -615,6 +636,17 @@ class Recall(Metric):
         recall = self.tp + self.fn
         return float(self.tp) / recall if recall != 0 else 0.0
 
+    def merge(self, other: Recall) -> None:
+        """
+        Merge the states of another Recall instance, e.g. the instance
+        of another worker or rank, into this instance.
+
+        Args:
+            other (Recall): the Recall instance to merge.
+        """
+        self.tp += other.tp
+        self.fn += other.fn
+
     def reset(self) -> None:
         """
         Resets all of the metric state.
@@ -633,7 +665,10 @@ class Auc(Metric):
     """
     The auc metric is for binary classification.
     Refer to https://en.wikipedia.org/wiki/Receiver_operating_characteristic#Area_under_the_curve.
-    Please notice that the auc metric is implemented with python, which may be a little bit slow.
+    Please notice that the auc metric is implemented with numpy, predictions
+    are counted into `num_thresholds + 1` buckets, the states of Auc instances
+    with the same `num_thresholds` can be merged by :code:`merge` without the
+    predictions, e.g. to reduce the Auc of all workers or ranks.
 
     The `auc` function creates four local variables, `true_positives`,
     `true_negatives`, `false_positives` and `false_negatives` that are used to
@@ -752,14 +787,20 @@ class Auc(Metric):
         elif not _is_numpy_(preds):
             raise ValueError("The 'preds' must be a numpy ndarray or Tensor.")
 
-        for i, lbl in enumerate(labels):
-            value = preds[i, 1]
-            bin_idx = int(value * self._num_thresholds)
-            assert bin_idx <= self._num_thresholds
-            if lbl:
-                self._stat_pos[bin_idx] += 1.0
-            else:
-                self._stat_neg[bin_idx] += 1.0
+        sample_num = labels.shape[0]
+        if sample_num == 0:
+            return
+        labels = labels.reshape([sample_num]).astype(bool)
+        bin_idx = (preds[:sample_num, 1] * self._num_thresholds).astype("int64")
+        assert bin_idx.max() <= self._num_thresholds
+
+        _num_pred_buckets = self._num_thresholds + 1
+        self._stat_pos += np.bincount(
+            bin_idx[labels], minlength=_num_pred_buckets
+        )
+        self._stat_neg += np.bincount(
+            bin_idx[~labels], minlength=_num_pred_buckets
+        )
 
     @staticmethod
     def trapezoid_area(x1: float, x2: float, y1: float, y2: float) -> float:
@@ -772,25 +813,42 @@ class Auc(Metric):
         Return:
             float: the area under auc curve
         """
-        tot_pos = 0.0
-        tot_neg = 0.0
-        auc = 0.0
-
-        idx = self._num_thresholds
-        while idx >= 0:
-            tot_pos_prev = tot_pos
-            tot_neg_prev = tot_neg
-            tot_pos += self._stat_pos[idx]
-            tot_neg += self._stat_neg[idx]
-            auc += self.trapezoid_area(
-                tot_neg, tot_neg_prev, tot_pos, tot_pos_prev
+        # accumulate buckets from the largest threshold, each bucket adds a
+        # trapezoid between the previous and current (fp, tp) points
+        tot_pos = np.cumsum(self._stat_pos[::-1])
+        tot_neg = np.cumsum(self._stat_neg[::-1])
+        tot_pos_prev = np.concatenate([[0.0], tot_pos[:-1]])
+        tot_neg_prev = np.concatenate([[0.0], tot_neg[:-1]])
+        auc = float(
+            np.sum(
+                self.trapezoid_area(
+                    tot_neg, tot_neg_prev, tot_pos, tot_pos_prev
+                )
             )
-            idx -= 1
+        )
 
+        tot_pos = tot_pos[-1]
+        tot_neg = tot_neg[-1]
         return (
             auc / tot_pos / tot_neg if tot_pos > 0.0 and tot_neg > 0.0 else 0.0
         )
 
+    def merge(self, other: Auc) -> None:
+        """
+        Merge the bucket states of another Auc instance, e.g. the instance
+        of another worker or rank, into this instance.
+
+        Args:
+            other (Auc): the Auc instance with the same num_thresholds.
+        """
+        if self._num_thresholds != other._num_thresholds:
+            raise ValueError(
+                f"Cannot merge Auc with num_thresholds {other._num_thresholds} "
+                f"into num_thresholds {self._num_thresholds}."
+            )
+        self._stat_pos += other._stat_pos
+        self._stat_neg += other._stat_neg
+
     def reset(self) -> None:
         """
         Reset states and result
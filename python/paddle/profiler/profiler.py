@@ -37,6 +37,8 @@ from paddle.profiler import utils
 from .profiler_statistic import (
     SortedKeys,
     StatisticData,
+    StreamingStatistic,
+    _build_streaming_table,
     _build_table,
     gen_layer_flops,
 )
@@ -372,6 +374,9 @@ class Profiler:
         profile_memory (bool, optional): If it is True, collect tensor memory allocation and release information. Default: False.
         custom_device_types (list, optional): If targets contain profiler.ProfilerTarget.CUSTOM_DEVICE, custom_device_types select the custom device type for profiling. The default value represents all custom devices will be selected.
         with_flops (bool, optional): If it is True, the flops of the op will be calculated. Default: False.
+        streaming (bool, optional): If it is True, the profiling data is folded into running statistics with fixed-size histograms at the end of every recorded step and then dropped,
+            so that the memory is bounded when profiling a long time. The statistics are printed by ``summary`` and can be read by ``streaming_statistic.to_dict()`` at any step,
+            while ``on_trace_ready`` only receives the data of the last recorded steps. Default: False.
 
     Examples:
         1. profiling range [2, 5).
@@ -499,6 +504,7 @@ class Profiler:
     profile_memory: bool
     with_flops: bool
     emit_nvtx: bool
+    streaming_statistic: StreamingStatistic | None
 
     def __init__(
         self,
@@ -514,6 +520,7 @@ class Profiler:
         emit_nvtx: bool = False,
         custom_device_types: list[str] = [],
         with_flops: bool = False,
+        streaming: bool = False,
     ) -> None:
         supported_targets = _get_supported_targets()
         if targets:
@@ -576,6 +583,7 @@ class Profiler:
         self.profile_memory = profile_memory
         self.with_flops = with_flops
         self.emit_nvtx = emit_nvtx
+        self.streaming_statistic = StreamingStatistic() if streaming else None
 
     def __enter__(self) -> Self:
         self.start()
@@ -683,7 +691,7 @@ class Profiler:
             self.current_state == ProfilerState.RECORD
             or self.current_state == ProfilerState.RECORD_AND_RETURN
         ):
-            self.profiler_result = self.profiler.stop()
+            self.profiler_result = self._stop_recording()
             if self.on_trace_ready:
                 self.on_trace_ready(self)
         utils._is_profiler_used = False
@@ -811,14 +819,22 @@ class Profiler:
                 warn(
                     "Improper schedule: RECORD->CLOSED, profiler will not saving data"
                 )
-                self.profiler.stop()
+                self._stop_recording()
 
             if self.current_state == ProfilerState.READY:  # RECORD -> READY
                 warn(
                     "Improper schedule: RECORD->READY, profiler will stop and re-prepare"
                 )
-                self.profiler.stop()
+                self._stop_recording()
                 self.profiler.prepare()
+            if (
+                self.current_state == ProfilerState.RECORD
+                and self.streaming_statistic is not None
+            ):  # RECORD -> RECORD
+                # fold the closed step, so the data is not accumulated
+                self._stop_recording()
+                self.profiler.prepare()
+                self.profiler.start()
             if (
                 self.current_state == ProfilerState.RECORD_AND_RETURN
             ):  # RECORD -> RECORD_AND_RETURN
@@ -829,27 +845,33 @@ class Profiler:
             if (
                 self.current_state == ProfilerState.CLOSED
             ):  # RECORD_AND_RETURN -> CLOSED
-                self.profiler_result = self.profiler.stop()
+                self.profiler_result = self._stop_recording()
             if (
                 self.current_state == ProfilerState.READY
             ):  # RECORD_AND_RETURN -> READY
-                self.profiler_result = self.profiler.stop()
+                self.profiler_result = self._stop_recording()
                 self.profiler.prepare()
             if (
                 self.current_state == ProfilerState.RECORD
             ):  # RECORD_AND_RETURN -> RECORD
-                self.profiler_result = self.profiler.stop()
+                self.profiler_result = self._stop_recording()
                 self.profiler.prepare()
                 self.profiler.start()
             if (
                 self.current_state == ProfilerState.RECORD_AND_RETURN
             ):  # RECORD_AND_RETURN -> RECORD_AND_RETURN
-                self.profiler_result = self.profiler.stop()
+                self.profiler_result = self._stop_recording()
                 self.profiler.prepare()
                 self.profiler.start()
             if self.on_trace_ready:
                 self.on_trace_ready(self)
 
+    def _stop_recording(self):
+        result = self.profiler.stop()
+        if self.streaming_statistic is not None:
+            self.streaming_statistic.fold(result.get_data())
+        return result
+
     def export(self, path: str = "", format: str = "json") -> None:
         r"""
         Exports the tracing data to file.
@@ -890,6 +912,7 @@ class Profiler:
     ) -> None:
         r"""
         Print the Summary table. Currently support overview, model, distributed, operator, memory manipulation and user-defined summary.
+        When the profiler is created with ``streaming=True``, the running statistics of all the folded steps are printed with percentiles instead, and ``op_detail``, ``thread_sep`` and ``views`` are ignored.
 
         Args:
             sorted_by( :ref:`SortedKeys <api_paddle_profiler_SortedKeys>` , optional): how to rank the op table items, default value is SortedKeys.CPUTotal.
@@ -919,7 +942,15 @@ class Profiler:
         if isinstance(views, SummaryView):
             views = [views]
 
-        if self.profiler_result:
+        if self.streaming_statistic is not None:
+            print(
+                _build_streaming_table(
+                    self.streaming_statistic,
+                    sorted_by=sorted_by,
+                    time_unit=time_unit,
+                )
+            )
+        elif self.profiler_result:
             statistic_data = StatisticData(
                 self.profiler_result.get_data(),
                 self.profiler_result.get_extra_info(),
@@ -23,6 +23,7 @@ from .statistic_helper import (
     merge_ranges,
     merge_self_ranges,
     sum_ranges,
+    to_range_array,
 )
 
 _AllTracerEventType = [
@@ -379,7 +380,9 @@ class TimeRangeSummary:
                         self.call_times[devicenode.type] += 1
 
             for event_type, time_ranges in CPUTimeRange.items():
-                time_ranges = merge_self_ranges(time_ranges, is_sorted=False)
+                time_ranges = merge_self_ranges(
+                    to_range_array(time_ranges), is_sorted=False
+                )
                 self.CPUTimeRange[event_type] = merge_ranges(
                     self.CPUTimeRange[event_type], time_ranges, is_sorted=True
                 )
@@ -387,7 +390,7 @@ class TimeRangeSummary:
                 for event_type, event_time_ranges in device_time_ranges.items():
                     for stream_id, time_ranges in event_time_ranges.items():
                         time_ranges = merge_self_ranges(
-                            time_ranges, is_sorted=False
+                            to_range_array(time_ranges), is_sorted=False
                         )
                         self.GPUTimeRange[device_id][event_type] = merge_ranges(
                             self.GPUTimeRange[device_id][event_type],
@@ -482,10 +485,10 @@ class DistributedSummary:
         self.cpu_calls = len(set(self.cpu_communication_range))
         self.gpu_calls = len(set(self.gpu_communication_range))
         self.cpu_communication_range = merge_self_ranges(
-            self.cpu_communication_range, is_sorted=False
+            to_range_array(self.cpu_communication_range), is_sorted=False
         )
         self.gpu_communication_range = merge_self_ranges(
-            self.gpu_communication_range, is_sorted=False
+            to_range_array(self.gpu_communication_range), is_sorted=False
         )
         self.communication_range = merge_ranges(
             self.cpu_communication_range,
@@ -493,7 +496,7 @@ class DistributedSummary:
             is_sorted=True,
         )
         self.computation_range = merge_self_ranges(
-            self.computation_range, is_sorted=False
+            to_range_array(self.computation_range), is_sorted=False
         )
         self.overlap_range = intersection_ranges(
             self.communication_range, self.computation_range, is_sorted=True
@@ -871,6 +874,315 @@ class StatisticData:
         self.memory_summary.parse(node_trees)
 
 
+class StreamingHistogram:
+    r"""
+    Log-linear histogram of durations in ns with a fixed number of buckets,
+    every power of two is split into 16 linear sub-buckets like HDR
+    histogram, so the relative error of percentiles is within 1/16.
+    """
+
+    SUB_BUCKET_BITS = 4
+    MAX_EXPONENT = 48
+
+    def __init__(self):
+        self.counts = [0] * ((self.MAX_EXPONENT + 2) << self.SUB_BUCKET_BITS)
+        self.count = 0
+
+    def _index(self, value):
+        value = min(int(value), (1 << (self.MAX_EXPONENT + 5)) - 1)
+        exponent = max(value.bit_length() - self.SUB_BUCKET_BITS - 1, 0)
+        return (exponent << self.SUB_BUCKET_BITS) + (value >> exponent)
+
+    def _bucket_range(self, index):
+        if index < (2 << self.SUB_BUCKET_BITS):
+            return index, index + 1
+        exponent = (index >> self.SUB_BUCKET_BITS) - 1
+        mantissa = index - (exponent << self.SUB_BUCKET_BITS)
+        return mantissa << exponent, (mantissa + 1) << exponent
+
+    def add(self, value):
+        self.counts[self._index(max(value, 0))] += 1
+        self.count += 1
+
+    def merge(self, other):
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.count += other.count
+
+    def percentile(self, q):
+        r"""
+        Get the q-th percentile, q is within [0, 100].
+        """
+        if self.count == 0:
+            return 0
+        rank = max(int(self.count * q / 100.0 + 0.5), 1)
+        accumulated = 0
+        for index, count in enumerate(self.counts):
+            accumulated += count
+            if accumulated >= rank:
+                low, high = self._bucket_range(index)
+                return (low + high - 1) / 2
+        return 0
+
+
+class StreamingStatistic:
+    r"""
+    Fold the profiling data of each step into running statistics of every
+    operator, layer, kernel, user defined event and model perspective event,
+    the node trees are not kept after folded, so the memory is bounded by
+    the number of distinct event names rather than the profiled steps.
+    """
+
+    class Item:
+        def __init__(self, name):
+            self.name = name
+            self.call = 0
+            self.cpu_time = 0
+            self.max_cpu_time = 0
+            self.min_cpu_time = float('inf')
+            self.gpu_time = 0
+            self.max_gpu_time = 0
+            self.min_gpu_time = float('inf')
+            self.cpu_histogram = StreamingHistogram()
+            self.gpu_histogram = StreamingHistogram()
+
+        @property
+        def avg_cpu_time(self):
+            return self.cpu_time / self.call
+
+        @property
+        def avg_gpu_time(self):
+            return self.gpu_time / self.call
+
+        def add_cpu_time(self, time):
+            self.max_cpu_time = max(self.max_cpu_time, time)
+            self.min_cpu_time = min(self.min_cpu_time, time)
+            self.cpu_time += time
+            self.cpu_histogram.add(time)
+
+        def add_gpu_time(self, time):
+            self.max_gpu_time = max(self.max_gpu_time, time)
+            self.min_gpu_time = min(self.min_gpu_time, time)
+            self.gpu_time += time
+            self.gpu_histogram.add(time)
+
+        def to_dict(self, percentiles):
+            result = {
+                'calls': self.call,
+                'cpu_total': self.cpu_time,
+                'cpu_avg': self.avg_cpu_time,
+                'cpu_max': self.max_cpu_time,
+                'cpu_min': self.min_cpu_time,
+                'gpu_total': self.gpu_time,
+                'gpu_avg': self.avg_gpu_time,
+                'gpu_max': self.max_gpu_time,
+                'gpu_min': self.min_gpu_time,
+            }
+            for q in percentiles:
+                result[f'cpu_p{q}'] = self.cpu_histogram.percentile(q)
+                result[f'gpu_p{q}'] = self.gpu_histogram.percentile(q)
+            return result
+
+    def __init__(self):
+        self.num_folds = 0
+        self.operator_items = {}
+        self.layer_items = {}
+        self.kernel_items = {}
+        self.userdefined_items = {}
+        self.memory_manipulation_items = {}
+        self.model_perspective_items = {}
+
+    @staticmethod
+    def _add_host_item(items, name, node):
+        if name not in items:
+            items[name] = StreamingStatistic.Item(name)
+        item = items[name]
+        item.call += 1
+        item.add_cpu_time(node.cpu_time)
+        item.add_gpu_time(node.gpu_time)
+
+    def fold(self, nodetrees):
+        r"""
+        Fold the node trees of the profiling data into the statistics.
+        """
+        node_statistic_trees, thread2host_statistic_nodes = wrap_tree(nodetrees)
+        for host_statistic_nodes in thread2host_statistic_nodes.values():
+            for node in host_statistic_nodes[1:]:  # skip root node
+                if node.type == TracerEventType.Operator:
+                    self._add_host_item(self.operator_items, node.name, node)
+                elif node.type == TracerEventType.Forward:
+                    self._add_host_item(self.layer_items, node.name, node)
+                elif node.type in (
+                    TracerEventType.UserDefined,
+                    TracerEventType.PythonUserDefined,
+                ):
+                    name = node.name.lower()
+                    if (
+                        'memcpy' in name
+                        or 'memorycopy' in name
+                        or 'memset' in name
+                    ):
+                        self._add_host_item(
+                            self.memory_manipulation_items, node.name, node
+                        )
+                    elif node.type == TracerEventType.PythonUserDefined:
+                        self._add_host_item(
+                            self.userdefined_items, node.name, node
+                        )
+            for device_node in get_device_nodes(host_statistic_nodes[0]):
+                if device_node.type == TracerEventType.Kernel:
+                    name = device_node.name
+                    if name not in self.kernel_items:
+                        self.kernel_items[name] = StreamingStatistic.Item(name)
+                    self.kernel_items[name].call += 1
+                    self.kernel_items[name].add_gpu_time(
+                        device_node.end_ns - device_node.start_ns
+                    )
+
+        model_perspective_names = {
+            TracerEventType.Forward: 'Forward',
+            TracerEventType.Backward: 'Backward',
+            TracerEventType.Optimization: 'Optimization',
+            TracerEventType.Dataloader: 'Dataloader',
+            TracerEventType.ProfileStep: 'ProfileStep',
+        }
+        for root_statistic_node in node_statistic_trees.values():
+            deque = collections.deque()
+            deque.append(root_statistic_node)
+            while deque:
+                current_node = deque.popleft()
+                for child in current_node.children_node:
+                    if child.type in model_perspective_names:
+                        self._add_host_item(
+                            self.model_perspective_items,
+                            model_perspective_names[child.type],
+                            child,
+                        )
+                    # find first model perspective node under ProfileStep
+                    if child.type not in model_perspective_names or (
+                        child.type == TracerEventType.ProfileStep
+                    ):
+                        deque.append(child)
+        self.num_folds += 1
+
+    def to_dict(self, percentiles=(50, 90, 99)):
+        r"""
+        Get the statistics as a dict of category to {name: metrics}, the
+        times are in ns.
+        """
+        categories = {
+            'model': self.model_perspective_items,
+            'layer': self.layer_items,
+            'operator': self.operator_items,
+            'kernel': self.kernel_items,
+            'memory_manipulation': self.memory_manipulation_items,
+            'userdefined': self.userdefined_items,
+        }
+        return {
+            category: {
+                name: item.to_dict(percentiles) for name, item in items.items()
+            }
+            for category, items in categories.items()
+        }
+
+
+def _build_streaming_table(
+    streaming_statistic,
+    sorted_by=SortedKeys.CPUTotal,
+    time_unit='ms',
+    row_limit=100,
+):
+    r"""
+    Build the summary table of the statistics folded by StreamingStatistic.
+    """
+    sort_keys = {
+        SortedKeys.CPUTotal: lambda item: item.cpu_time,
+        SortedKeys.CPUAvg: lambda item: item.avg_cpu_time,
+        SortedKeys.CPUMax: lambda item: item.max_cpu_time,
+        SortedKeys.CPUMin: lambda item: item.min_cpu_time,
+        SortedKeys.GPUTotal: lambda item: item.gpu_time,
+        SortedKeys.GPUAvg: lambda item: item.avg_gpu_time,
+        SortedKeys.GPUMax: lambda item: item.max_gpu_time,
+        SortedKeys.GPUMin: lambda item: item.min_gpu_time,
+    }
+    unit_scale = {'s': 1e9, 'ms': 1e6, 'us': 1e3, 'ns': 1}[time_unit]
+
+    def format_time(time):
+        if time == float('inf'):
+            return '-'
+        return f'{time / unit_scale:.2f}'
+
+    headers = [
+        'Name',
+        'Calls',
+        'CPU Total',
+        'CPU Avg',
+        'CPU P50',
+        'CPU P99',
+        'CPU Max',
+        'GPU Total',
+        'GPU Avg',
+        'GPU P50',
+        'GPU P99',
+        'GPU Max',
+    ]
+    name_column_width = 40
+    number_column_width = 12
+    row_format = f'{{:<{name_column_width}}}  ' + '  '.join(
+        [f'{{:<{number_column_width}}}'] * (len(headers) - 1)
+    )
+    line_length = name_column_width + (len(headers) - 1) * (
+        number_column_width + 2
+    )
+
+    result = [
+        f'Streaming Summary of {streaming_statistic.num_folds} folds, Time Unit: {time_unit}',
+        '',
+    ]
+    for title, items in [
+        ('Model Summary', streaming_statistic.model_perspective_items),
+        ('Layer Summary', streaming_statistic.layer_items),
+        ('Operator Summary', streaming_statistic.operator_items),
+        ('Kernel Summary', streaming_statistic.kernel_items),
+        (
+            'Memory Manipulation Summary',
+            streaming_statistic.memory_manipulation_items,
+        ),
+        ('UserDefined Summary', streaming_statistic.userdefined_items),
+    ]:
+        if len(items) == 0:
+            continue
+        sorted_items = sorted(
+            items.values(), key=sort_keys[sorted_by], reverse=True
+        )
+        result.append(title.center(line_length, '-'))
+        result.append(row_format.format(*headers))
+        result.append('-' * line_length)
+        for item in sorted_items[:row_limit]:
+            name = item.name
+            if len(name) > name_column_width:
+                name = name[: name_column_width - 3] + '...'
+            result.append(
+                row_format.format(
+                    name,
+                    item.call,
+                    format_time(item.cpu_time),
+                    format_time(item.avg_cpu_time),
+                    format_time(item.cpu_histogram.percentile(50)),
+                    format_time(item.cpu_histogram.percentile(99)),
+                    format_time(item.max_cpu_time),
+                    format_time(item.gpu_time),
+                    format_time(item.avg_gpu_time),
+                    format_time(item.gpu_histogram.percentile(50)),
+                    format_time(item.gpu_histogram.percentile(99)),
+                    format_time(item.max_gpu_time),
+                )
+            )
+        result.append('-' * line_length)
+        result.append('')
+    return '\n'.join(result)
+
+
 def _build_table(
     statistic_data,
     sorted_by=SortedKeys.CPUTotal,
@@ -1024,7 +1336,7 @@ def _build_table(
         ) in statistic_data.time_range_summary.CPUTimeRangeSum.items():
             if event_type != TracerEventType.Communication:
                 cpu_type_time[event_type] = value
-        if statistic_data.distributed_summary.cpu_communication_range:
+        if len(statistic_data.distributed_summary.cpu_communication_range) > 0:
             cpu_type_time[TracerEventType.Communication] = sum_ranges(
                 statistic_data.distributed_summary.cpu_communication_range
             )
@@ -1066,7 +1378,7 @@ def _build_table(
                 )
         for event_type, time_range in gpu_time_range.items():
             gpu_type_time[event_type] = sum_ranges(time_range)
-        if statistic_data.distributed_summary.gpu_communication_range:
+        if len(statistic_data.distributed_summary.gpu_communication_range) > 0:
             gpu_type_time[TracerEventType.Communication] = sum_ranges(
                 statistic_data.distributed_summary.gpu_communication_range
             )
@@ -1228,7 +1540,7 @@ def _build_table(
 
     if views is None or SummaryView.DistributedView in views:
         # ----- Print Distribution Summary Report ----- #
-        if statistic_data.distributed_summary.communication_range:
+        if len(statistic_data.distributed_summary.communication_range) > 0:
             headers = [
                 'Name',
                 'Total Time',
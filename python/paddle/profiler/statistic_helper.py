@@ -12,217 +12,182 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+# The time ranges are lists of (start, end) tuples. The operations below
+# convert them to a pair of numpy arrays of starts and ends, and work on the
+# sorted arrays with searchsorted/cumulative operations instead of walking
+# the ranges one by one in python, a trace may hold millions of ranges.
+# A (N, 2) numpy array is accepted in place of the list as well, and the
+# result is a numpy array then, so that a chain of operations converts the
+# ranges once.
+
+import numpy as np
+
+
+def _to_arrays(ranges):
+    array = np.asarray(ranges).reshape([-1, 2])
+    return array[:, 0], array[:, 1]
+
+
+def _merge_arrays(starts, ends, is_sorted=False):
+    if len(starts) == 0:
+        return starts, ends
+    if not is_sorted:
+        order = np.argsort(starts, kind='stable')
+        starts = starts[order]
+        ends = ends[order]
+    max_ends = np.maximum.accumulate(ends)
+    # a range starts a new group if it starts after all the previous ends
+    is_first = np.empty(len(starts), dtype=bool)
+    is_first[0] = True
+    np.greater(starts[1:], max_ends[:-1], out=is_first[1:])
+    first_indices = np.flatnonzero(is_first)
+    last_indices = np.append(first_indices[1:] - 1, len(starts) - 1)
+    return starts[first_indices], max_ends[last_indices]
+
+
+def _expand(lo, hi):
+    """
+    Get the flattened indices [lo[i], hi[i]) of all i, and the i of them.
+    """
+    counts = np.maximum(hi - lo, 0)
+    owners = np.repeat(np.arange(len(lo)), counts)
+    offsets = np.arange(len(owners)) - np.repeat(
+        np.cumsum(counts) - counts, counts
+    )
+    return owners, lo[owners] + offsets
+
+
+def _intersect_arrays(starts1, ends1, starts2, ends2):
+    # range j of list2 overlaps range i of list1 if end2 > start1 and
+    # start2 < end1, an empty range1 also overlaps the range2 starting
+    # at it.
+    is_empty = starts1 == ends1
+    lo = np.searchsorted(ends2, starts1, side='right')
+    hi = np.where(
+        is_empty,
+        np.searchsorted(starts2, ends1, side='right'),
+        np.searchsorted(starts2, ends1, side='left'),
+    )
+    indices1, indices2 = _expand(lo, hi)
+    return (
+        np.maximum(starts1[indices1], starts2[indices2]),
+        np.minimum(ends1[indices1], ends2[indices2]),
+    )
+
+
+def _subtract_arrays(starts1, ends1, starts2, ends2):
+    # range i of list1 is split by the ranges of list2 overlapping it, an
+    # empty range1 is removed if it is covered by [start2, end2).
+    is_empty = starts1 == ends1
+    lo = np.searchsorted(ends2, starts1, side='right')
+    hi = np.where(is_empty, lo, np.searchsorted(starts2, ends1, side='left'))
+    counts = np.maximum(hi - lo, 0)
+    # range i has counts[i] + 1 pieces: [start1, start2[lo]), ...,
+    # [end2[hi - 1], end1)
+    indices1, indices2 = _expand(lo, hi + 1)
+    is_first = np.zeros(len(indices1), dtype=bool)
+    is_first[np.cumsum(counts + 1) - counts - 1] = True
+    is_last = np.zeros(len(indices1), dtype=bool)
+    is_last[np.cumsum(counts + 1) - 1] = True
+    piece_starts = np.where(
+        is_first, starts1[indices1], ends2[np.maximum(indices2 - 1, 0)]
+    )
+    piece_ends = np.where(
+        is_last,
+        ends1[indices1],
+        starts2[np.minimum(indices2, len(starts2) - 1)],
+    )
+    covered = np.zeros(len(starts1), dtype=bool)
+    in_range = lo < len(starts2)
+    covered[in_range] = (starts2[lo[in_range]] <= starts1[in_range]) & is_empty[
+        in_range
+    ]
+    keep = np.where(
+        is_empty[indices1],
+        ~covered[indices1],
+        piece_ends > piece_starts,
+    )
+    return piece_starts[keep], piece_ends[keep]
+
+
+def _from_arrays(starts, ends, as_array):
+    if as_array:
+        return np.stack([starts, ends], axis=1)
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def _is_array(*range_lists):
+    return any(isinstance(ranges, np.ndarray) for ranges in range_lists)
+
+
+def to_range_array(ranges):
+    """
+    Convert a list of (start, end) tuples in nanoseconds to a (N, 2) array.
+    """
+    return np.array(ranges, dtype=np.int64).reshape([-1, 2])
+
 
 def sum_ranges(ranges):
-    result = 0
-    for time_range in ranges:
-        result += time_range[1] - time_range[0]
-    return result
+    if len(ranges) == 0:
+        return 0
+    starts, ends = _to_arrays(ranges)
+    return (ends - starts).sum().item()
 
 
 def merge_self_ranges(src_ranges, is_sorted=False):
-    merged_ranges = []
-    if len(src_ranges) > 0:
-        if not is_sorted:
-            src_ranges.sort(key=lambda x: x[0])
-        cur_indx = 0
-        merged_ranges.append((src_ranges[cur_indx][0], src_ranges[cur_indx][1]))
-        for cur_indx in range(1, len(src_ranges)):
-            if src_ranges[cur_indx][1] > merged_ranges[-1][1]:
-                if src_ranges[cur_indx][0] <= merged_ranges[-1][1]:
-                    merged_ranges[-1] = (
-                        merged_ranges[-1][0],
-                        src_ranges[cur_indx][1],
-                    )
-                else:
-                    merged_ranges.append(
-                        (src_ranges[cur_indx][0], src_ranges[cur_indx][1])
-                    )
-    return merged_ranges
+    if len(src_ranges) == 0:
+        return src_ranges[:0] if _is_array(src_ranges) else []
+    return _from_arrays(
+        *_merge_arrays(*_to_arrays(src_ranges), is_sorted),
+        _is_array(src_ranges),
+    )
 
 
 def merge_ranges(range_list1, range_list2, is_sorted=False):
-    merged_ranges = []
-    if not is_sorted:
-        range_list1 = merge_self_ranges(range_list1)
-        range_list2 = merge_self_ranges(range_list2)
-    len1 = len(range_list1)
-    len2 = len(range_list2)
-    if len1 == 0 and len2 == 0:
-        return merged_ranges
-    elif len1 == 0:
-        return range_list2
-    elif len2 == 0:
-        return range_list1
-    else:
-        indx1 = 0
-        indx2 = 0
-        range1 = range_list1[indx1]
-        range2 = range_list2[indx2]
-        if range1[0] < range2[0]:
-            merged_ranges.append(range1)
-            indx1 += 1
-        else:
-            merged_ranges.append(range2)
-            indx2 += 1
-        while indx1 < len1 and indx2 < len2:
-            range1 = range_list1[indx1]
-            range2 = range_list2[indx2]
-            if range1[0] < range2[0]:
-                if range1[1] > merged_ranges[-1][1]:
-                    if range1[0] <= merged_ranges[-1][1]:
-                        merged_ranges[-1] = (merged_ranges[-1][0], range1[1])
-                    else:
-                        merged_ranges.append((range1[0], range1[1]))
-                    indx1 += 1
-                else:
-                    indx1 += 1
-            else:
-                if range2[1] > merged_ranges[-1][1]:
-                    if range2[0] <= merged_ranges[-1][1]:
-                        merged_ranges[-1] = (merged_ranges[-1][0], range2[1])
-                    else:
-                        merged_ranges.append((range2[0], range2[1]))
-                    indx2 += 1
-                else:
-                    indx2 += 1
-
-        while indx1 < len1:
-            range1 = range_list1[indx1]
-            if range1[1] > merged_ranges[-1][1]:
-                if range1[0] <= merged_ranges[-1][1]:
-                    merged_ranges[-1] = (merged_ranges[-1][0], range1[1])
-                else:
-                    merged_ranges.append((range1[0], range1[1]))
-                indx1 += 1
-            else:
-                indx1 += 1
-        while indx2 < len2:
-            range2 = range_list2[indx2]
-            if range2[1] > merged_ranges[-1][1]:
-                if range2[0] <= merged_ranges[-1][1]:
-                    merged_ranges[-1] = (merged_ranges[-1][0], range2[1])
-                else:
-                    merged_ranges.append((range2[0], range2[1]))
-                indx2 += 1
-            else:
-                indx2 += 1
-    return merged_ranges
+    if len(range_list1) == 0:
+        return range_list2 if is_sorted else merge_self_ranges(range_list2)
+    elif len(range_list2) == 0:
+        return range_list1 if is_sorted else merge_self_ranges(range_list1)
+    # the union of two merged lists is the merged concatenation of them
+    starts1, ends1 = _to_arrays(range_list1)
+    starts2, ends2 = _to_arrays(range_list2)
+    return _from_arrays(
+        *_merge_arrays(
+            np.concatenate([starts1, starts2]), np.concatenate([ends1, ends2])
+        ),
+        _is_array(range_list1, range_list2),
+    )
 
 
 def intersection_ranges(range_list1, range_list2, is_sorted=False):
-    result_range = []
     if len(range_list1) == 0 or len(range_list2) == 0:
-        return result_range
+        if _is_array(range_list1, range_list2):
+            return np.empty([0, 2], dtype=np.int64)
+        return []
+    starts1, ends1 = _to_arrays(range_list1)
+    starts2, ends2 = _to_arrays(range_list2)
     if not is_sorted:
-        range_list1 = merge_self_ranges(range_list1)
-        range_list2 = merge_self_ranges(range_list2)
-
-    len1 = len(range_list1)
-    len2 = len(range_list2)
-    indx1 = 0
-    indx2 = 0
-    range1 = range_list1[indx1]
-    range2 = range_list2[indx2]
-    while indx1 < len1 and indx2 < len2:
-        if range2[1] <= range1[0]:
-            indx2 += 1
-            if indx2 == len2:
-                break
-            range2 = range_list2[indx2]
-
-        elif range2[0] <= range1[0] and range2[1] < range1[1]:
-            assert range2[1] > range1[0]
-            result_range.append((range1[0], range2[1]))
-            range1 = (range2[1], range1[1])
-            indx2 += 1
-            if indx2 == len2:
-                break
-            range2 = range_list2[indx2]
-
-        elif range2[0] <= range1[0]:
-            assert range2[1] >= range1[1]
-            result_range.append(range1)
-            range2 = (range1[1], range2[1])
-            indx1 += 1
-            if indx1 == len1:
-                break
-            range1 = range_list1[indx1]
-
-        elif range2[1] < range1[1]:
-            assert range2[0] > range1[0]
-            result_range.append(range2)
-            range1 = (range2[1], range1[1])
-            indx2 += 1
-            if indx2 == len2:
-                break
-            range2 = range_list2[indx2]
-
-        elif range2[0] < range1[1]:
-            assert range2[1] >= range1[1]
-            result_range.append((range2[0], range1[1]))
-            range2 = (range1[1], range2[1])
-            indx1 += 1
-            if indx1 == len1:
-                break
-            range1 = range_list1[indx1]
-
-        else:
-            assert range2[0] >= range1[1]
-            indx1 += 1
-            if indx1 == len1:
-                break
-            range1 = range_list1[indx1]
-    return result_range
+        starts1, ends1 = _merge_arrays(starts1, ends1)
+        starts2, ends2 = _merge_arrays(starts2, ends2)
+    return _from_arrays(
+        *_intersect_arrays(starts1, ends1, starts2, ends2),
+        _is_array(range_list1, range_list2),
+    )
 
 
 def subtract_ranges(range_list1, range_list2, is_sorted=False):
-    result_range = []
-    if not is_sorted:
-        range_list1 = merge_self_ranges(range_list1)
-        range_list2 = merge_self_ranges(range_list2)
     if len(range_list1) == 0:
-        return result_range
+        if _is_array(range_list1, range_list2):
+            return np.empty([0, 2], dtype=np.int64)
+        return []
     if len(range_list2) == 0:
-        return range_list1
-
-    len1 = len(range_list1)
-    len2 = len(range_list2)
-    indx1 = 0
-    indx2 = 0
-    range1 = range_list1[indx1]
-    range2 = range_list2[indx2]
-
-    while indx1 < len(range_list1):
-        if indx2 == len(range_list2):
-            result_range.append(range1)
-            indx1 += 1
-            if indx1 == len1:
-                break
-            range1 = range_list1[indx1]
-        elif range2[1] <= range1[0]:
-            indx2 += 1
-            if indx2 != len2:
-                range2 = range_list2[indx2]
-        elif range2[0] <= range1[0] and range2[1] < range1[1]:
-            range1 = (range2[1], range1[1])
-            indx2 += 1
-            if indx2 != len2:
-                range2 = range_list2[indx2]
-        elif range2[0] <= range1[0]:
-            assert range2[1] >= range1[1]
-            range2 = (range1[1], range2[1])
-            indx1 += 1
-            if indx1 != len1:
-                range1 = range_list1[indx1]
-        elif range2[0] < range1[1]:
-            assert range2[0] > range1[0]
-            result_range.append((range1[0], range2[0]))
-            range1 = (range2[0], range1[1])
-        else:
-            assert range2[0] >= range1[1]
-            result_range.append(range1)
-            indx1 += 1
-            if indx1 != len1:
-                range1 = range_list1[indx1]
-    return result_range
+        return range_list1 if is_sorted else merge_self_ranges(range_list1)
+    starts1, ends1 = _to_arrays(range_list1)
+    starts2, ends2 = _to_arrays(range_list2)
+    if not is_sorted:
+        starts1, ends1 = _merge_arrays(starts1, ends1)
+        starts2, ends2 = _merge_arrays(starts2, ends2)
+    return _from_arrays(
+        *_subtract_arrays(starts1, ends1, starts2, ends2),
+        _is_array(range_list1, range_list2),
+    )
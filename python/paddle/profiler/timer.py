@@ -15,6 +15,8 @@
 import timeit
 from collections import OrderedDict
 
+from .profiler_statistic import StreamingHistogram
+
 
 class Stack:
     """
@@ -348,6 +350,267 @@ class TimeAverager:
         return float(self._total_iters) / self._total_time
 
 
+class PhaseRecords:
+    """
+    The sampled costs of a phase, the latest costs are kept in a ring buffer
+    and all the costs are counted into a histogram for the percentiles.
+    """
+
+    def __init__(self, capacity):
+        self.ring = [0.0] * capacity
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.min = float('inf')
+        self.histogram = StreamingHistogram()
+
+    def record(self, usetime):
+        # NOTE: only the training thread writes the records, the readers
+        # copy them without lock and may see a record being written.
+        self.ring[self.count % len(self.ring)] = usetime
+        self.total += usetime
+        if usetime > self.max:
+            self.max = usetime
+        if usetime < self.min:
+            self.min = usetime
+        self.histogram.add(usetime * 1e9)
+        self.count += 1
+
+    def recent(self):
+        """
+        Get the costs in the ring buffer from the oldest to the latest.
+        """
+
+        count = self.count
+        capacity = len(self.ring)
+        if count <= capacity:
+            return self.ring[:count]
+        start = count % capacity
+        return self.ring[start:] + self.ring[:start]
+
+    def summary(self, percentiles):
+        if self.count == 0:
+            return {'count': 0}
+        summary = {
+            'count': self.count,
+            'total': self.total,
+            'avg': self.total / self.count,
+            'max': self.max,
+            'min': self.min,
+        }
+        for q in percentiles:
+            summary[f'p{q:g}'] = self.histogram.percentile(q) / 1e9
+        return summary
+
+
+class _PhaseTimer:
+    def __init__(self, telemetry, phase):
+        self.telemetry = telemetry
+        self.phase = phase
+        self.start_time = None
+
+    def __enter__(self):
+        if self.telemetry.sampling:
+            self.start_time = timeit.default_timer()
+        return self
+
+    def __exit__(self, *args):
+        if self.start_time is not None:
+            self.telemetry.record(
+                self.phase, timeit.default_timer() - self.start_time
+            )
+            self.start_time = None
+
+
+class TelemetryHook(Hook):
+    """
+    A hook for sampling the cost of every phase of steps, such as reading
+    data, forward, backward and optimization. It is disabled by default,
+    after `enable` is called, one step out of every `sample_interval` steps
+    is timed and the other steps cost nothing but a check. The cost of the
+    reader and the whole step are timed automatically, the other phases are
+    timed by `phase`.
+
+    The records are pulled by `snapshot` as a dict or `to_prometheus` as the
+    Prometheus text format, e.g. by an exporter thread.
+
+    Examples:
+        .. code-block:: python
+
+            >>> # doctest: +SKIP('it is an example of the training loop')
+            >>> from paddle.profiler.timer import benchmark
+            >>> telemetry = benchmark().telemetry
+            >>> telemetry.enable(sample_interval=10)
+            >>> for image, label in loader():
+            ...     with telemetry.phase('forward'):
+            ...         loss = model(image, label)
+            ...     with telemetry.phase('backward'):
+            ...         loss.backward()
+            ...     with telemetry.phase('optimizer'):
+            ...         opt.step()
+            ...         opt.clear_grad()
+            ...     benchmark().step()
+            >>> print(telemetry.snapshot()['batch']['p99'])
+            >>> # doctest: -SKIP
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.sampling = False
+        self.sample_interval = 1
+        self.capacity = 1024
+        self.percentiles = (50, 90, 99)
+        self.num_steps = 0
+        self.num_sampled_steps = 0
+        self.records = OrderedDict()
+        self.start_time = None
+        self.start_reader = None
+
+    def enable(self, sample_interval=1, capacity=1024, percentiles=None):
+        """
+        Start sampling the steps.
+
+        Args:
+            sample_interval(int, optional): Time one step out of every
+                sample_interval steps. Default: 1.
+            capacity(int, optional): The number of the latest costs kept for
+                every phase. Default: 1024.
+            percentiles(list, optional): The percentiles reported, each one
+                is within [0, 100]. Default: [50, 90, 99].
+        """
+
+        assert sample_interval >= 1, "sample_interval should be at least 1."
+        assert capacity >= 1, "capacity should be at least 1."
+        if capacity != self.capacity:
+            self.records.clear()
+        self.sample_interval = sample_interval
+        self.capacity = capacity
+        if percentiles is not None:
+            self.percentiles = tuple(percentiles)
+        self.enabled = True
+        self.sampling = True
+        self.start_time = timeit.default_timer()
+
+    def disable(self):
+        """
+        Stop sampling the steps, the records are kept.
+        """
+
+        self.enabled = False
+        self.sampling = False
+        self.start_time = None
+        self.start_reader = None
+
+    def reset(self):
+        """
+        Clear the records.
+        """
+
+        self.records.clear()
+        self.num_steps = 0
+        self.num_sampled_steps = 0
+
+    def record(self, phase, usetime):
+        """
+        Record the cost of a phase in seconds for the current step, it is
+        dropped if the step is not sampled.
+        """
+
+        if not self.sampling:
+            return
+        records = self.records.get(phase)
+        if records is None:
+            records = self.records[phase] = PhaseRecords(self.capacity)
+        records.record(usetime)
+
+    def phase(self, phase):
+        """
+        A context manager timing the phase for the current step.
+        """
+
+        return _PhaseTimer(self, phase)
+
+    def before_reader(self, benchmark):
+        if self.sampling:
+            self.start_reader = timeit.default_timer()
+
+    def after_reader(self, benchmark):
+        if self.start_reader is not None:
+            self.record('reader', timeit.default_timer() - self.start_reader)
+            self.start_reader = None
+
+    def after_step(self, benchmark):
+        if not self.enabled:
+            return
+        now = timeit.default_timer()
+        if self.sampling:
+            self.num_sampled_steps += 1
+            if self.start_time is not None:
+                self.record('batch', now - self.start_time)
+        self.num_steps += 1
+        self.sampling = self.num_steps % self.sample_interval == 0
+        self.start_time = now if self.sampling else None
+
+    def snapshot(self, recent=False):
+        """
+        Get the summary of the records of every phase, the costs are in
+        seconds.
+
+        Args:
+            recent(bool, optional): Whether to include the latest costs in
+                the ring buffer of every phase. Default: False.
+
+        Returns:
+            dict: The summary of every phase, including the count, total,
+            avg, max, min and the percentiles like p50.
+        """
+
+        snapshot = {
+            'steps': self.num_steps,
+            'sampled_steps': self.num_sampled_steps,
+            'sample_interval': self.sample_interval,
+        }
+        for phase, records in list(self.records.items()):
+            summary = records.summary(self.percentiles)
+            if recent:
+                summary['recent'] = records.recent()
+            snapshot[phase] = summary
+        return snapshot
+
+    def to_prometheus(self, prefix='paddle_step'):
+        """
+        Get the records as the Prometheus text exposition format, every
+        phase is a label of the summary metric `{prefix}_phase_seconds`.
+        """
+
+        lines = [
+            f'# HELP {prefix}_steps_total The number of steps.',
+            f'# TYPE {prefix}_steps_total counter',
+            f'{prefix}_steps_total {self.num_steps}',
+            f'# HELP {prefix}_sampled_steps_total The number of sampled steps.',
+            f'# TYPE {prefix}_sampled_steps_total counter',
+            f'{prefix}_sampled_steps_total {self.num_sampled_steps}',
+            f'# HELP {prefix}_phase_seconds The cost of the phases of the sampled steps.',
+            f'# TYPE {prefix}_phase_seconds summary',
+        ]
+        for phase, records in list(self.records.items()):
+            summary = records.summary(self.percentiles)
+            if summary['count'] == 0:
+                continue
+            for q in self.percentiles:
+                lines.append(
+                    f'{prefix}_phase_seconds{{phase="{phase}",quantile="{q / 100:g}"}} '
+                    f'{summary[f"p{q:g}"]:.9g}'
+                )
+            lines.append(
+                f'{prefix}_phase_seconds_sum{{phase="{phase}"}} {summary["total"]:.9g}'
+            )
+            lines.append(
+                f'{prefix}_phase_seconds_count{{phase="{phase}"}} {summary["count"]}'
+            )
+        return '\n'.join(lines) + '\n'
+
+
 class Benchmark:
     """
     A tool for the statistics of model performance. The `before_reader`
@@ -358,10 +621,20 @@ class Benchmark:
 
     def __init__(self):
         self.num_samples = None
-        self.hooks = OrderedDict(timer_hook=TimerHook())
+        self.hooks = OrderedDict(
+            timer_hook=TimerHook(), telemetry_hook=TelemetryHook()
+        )
         self.current_event = None
         self.events = Stack()
 
+    @property
+    def telemetry(self):
+        """
+        The TelemetryHook sampling the cost of the phases of steps.
+        """
+
+        return self.hooks['telemetry_hook']
+
     def step(self, num_samples=None):
         """
         Record the statistic for the current step. It will be called in
@@ -16,13 +16,16 @@ from __future__ import annotations
 
 import itertools
 import logging
+import mmap
 import multiprocessing
+import pickle
 import random
 import sys
+import traceback
 import warnings
 from itertools import zip_longest
-from queue import Queue
-from threading import Thread
+from queue import Empty, Queue
+from threading import Condition, Event, Thread
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -71,6 +74,13 @@ _U = TypeVar('_U')
 
 _Reader: TypeAlias = Callable[[], Generator[_T, None, None]]
 
+# The max bytes of the shared memory of a process reader, which is split into
+# a slot for every chunk in flight, the chunks larger than a slot are sent
+# through the queue instead.
+_SHARED_MEMORY_SIZE = 256 * 1024 * 1024
+# The seconds to wait for a result before checking the worker processes.
+_WORKER_CHECK_INTERVAL = 5
+
 
 def cache(reader: _Reader[_T]) -> _Reader[_T]:
     """
@@ -473,23 +483,125 @@ class XmapEndSignal:
     pass
 
 
+class _SharedMemorySlots:
+    """
+    The slots of an anonymous shared memory inherited by the forked worker
+    processes. A chunk of samples is pickled into a slot with its buffers out
+    of band, so that the data of numpy arrays is copied into the shared memory
+    directly instead of going through a pipe.
+
+    A slot is acquired before a chunk is sent and released after the chunk is
+    consumed, so the number of the slots bounds the chunks in flight.
+    """
+
+    def __init__(self, num_slots, total_size):
+        self.slot_size = max(total_size // num_slots, mmap.PAGESIZE)
+        self._buffer = mmap.mmap(-1, num_slots * self.slot_size)
+        self._free = fork_context.Queue()
+        for slot in range(num_slots):
+            self._free.put(slot)
+
+    def acquire(self):
+        return self._free.get()
+
+    def release(self, slot):
+        self._free.put(slot)
+
+    def write(self, slot, obj):
+        buffers = []
+        header = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+        raws = [header] + [buffer.raw() for buffer in buffers]
+        sizes = [
+            len(raw) if isinstance(raw, bytes) else raw.nbytes for raw in raws
+        ]
+        if sum(sizes) > self.slot_size:
+            return "inline", obj
+        offset = slot * self.slot_size
+        for raw, size in zip(raws, sizes):
+            self._buffer[offset : offset + size] = raw
+            offset += size
+        return "shm", sizes
+
+    def read(self, slot, kind, value):
+        if kind == "inline":
+            return value
+        with memoryview(self._buffer) as view:
+            offset = slot * self.slot_size
+            raws = []
+            for size in value:
+                raws.append(bytearray(view[offset : offset + size]))
+                offset += size
+        return pickle.loads(raws[0], buffers=raws[1:])
+
+    def close(self):
+        self._buffer.close()
+
+
+def _get_result(results, processes):
+    # block on the queue, and check the processes from time to time in case
+    # a worker is killed without sending its result
+    while True:
+        try:
+            return results.get(timeout=_WORKER_CHECK_INTERVAL)
+        except Empty:
+            for p in processes:
+                if p.exitcode is not None and p.exitcode != 0:
+                    raise RuntimeError(
+                        f"The worker process (pid {p.pid}) exited unexpectedly with exit code {p.exitcode}."
+                    )
+
+
+def _stop_processes(processes, finished):
+    for p in processes:
+        if finished:
+            p.join()
+        elif p.is_alive():
+            p.terminate()
+            p.join()
+
+
+def _xmap_process_worker(mapper, tasks, results, slots):
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        chunk_id, slot, samples = task
+        try:
+            kind, value = slots.write(slot, [mapper(s) for s in samples])
+        except Exception:
+            kind, value = "error", traceback.format_exc()
+        results.put((chunk_id, slot, kind, value))
+
+
 def xmap_readers(
     mapper: Callable[[_T], _U],
     reader: _Reader[_T],
     process_num: int,
     buffer_size: int,
     order: bool = False,
+    use_process: bool = False,
+    chunk_size: int = 16,
 ) -> _Reader[_U]:
     """
-    Use multi-threads to map samples from reader by a mapper defined by user.
+    Use multi-threads or multi-processes to map samples from reader by a mapper
+    defined by user.
 
     Args:
         mapper (callable): a function to map the data from reader.
         reader (callable): a data reader which yields the data.
-        process_num (int): thread number to handle original sample.
+        process_num (int): thread or process number to handle original sample.
         buffer_size (int): size of the queue to read data in.
         order (bool): whether to keep the data order from original reader.
             Default False.
+        use_process (bool): whether to map the samples in the processes forked
+            from the current process, which is not limited by the GIL for the
+            CPU bound mapper. The samples are sent to the processes in chunks,
+            and the mapped samples are sent back through the shared memory.
+            At most max(process_num, buffer_size / chunk_size) chunks are in
+            flight, including the chunks buffered to keep the order. It is not
+            supported on windows. Default False.
+        chunk_size (int): the number of samples in a chunk, only useful when
+            use_process is True. Default 16.
 
     Returns:
         callable: a decorated reader with data mapping.
@@ -523,15 +635,16 @@ def xmap_readers(
 
     # define a worker to handle samples from in_queue by mapper
     # and put mapped samples into out_queue by order
-    def order_handle_worker(in_queue, out_queue, mapper, out_order):
+    def order_handle_worker(in_queue, out_queue, mapper, out_order, turn):
         ins = in_queue.get()
         while not isinstance(ins, XmapEndSignal):
             order, sample = ins
             r = mapper(sample)
-            while order != out_order[0]:
-                pass
-            out_queue.put(r)
-            out_order[0] += 1
+            with turn:
+                turn.wait_for(lambda: order == out_order[0])
+                out_queue.put(r)
+                out_order[0] += 1
+                turn.notify_all()
             ins = in_queue.get()
         in_queue.put(end)
         out_queue.put(end)
@@ -548,7 +661,7 @@ def xmap_readers(
         # start several handle_workers
         target = order_handle_worker if order else handle_worker
         args = (
-            (in_queue, out_queue, mapper, out_order)
+            (in_queue, out_queue, mapper, out_order, Condition())
             if order
             else (in_queue, out_queue, mapper)
         )
@@ -572,6 +685,90 @@ def xmap_readers(
             else:
                 yield sample
 
+    # define a worker to send the chunks of samples to the processes, a slot
+    # is acquired for every chunk to bound the chunks in flight
+    def feed_worker(tasks, results, slots, stop):
+        chunk_id = 0
+        try:
+            samples = reader()
+            while True:
+                chunk = list(itertools.islice(samples, chunk_size))
+                if not chunk:
+                    break
+                slot = slots.acquire()
+                if stop.is_set():
+                    return
+                tasks.put((chunk_id, slot, chunk))
+                chunk_id += 1
+            results.put((chunk_id, None, "end", None))
+        except Exception:
+            results.put((chunk_id, None, "error", traceback.format_exc()))
+
+    def process_xreader():
+        num_slots = max(process_num, -(-buffer_size // chunk_size))
+        slots = _SharedMemorySlots(num_slots, _SHARED_MEMORY_SIZE)
+        tasks = fork_context.Queue()
+        results = fork_context.Queue()
+        workers = [
+            fork_context.Process(
+                target=_xmap_process_worker,
+                args=(mapper, tasks, results, slots),
+                daemon=True,
+            )
+            for _ in range(process_num)
+        ]
+        for w in workers:
+            w.start()
+        stop = Event()
+        t = Thread(target=feed_worker, args=(tasks, results, slots, stop))
+        t.daemon = True
+        t.start()
+
+        finished = False
+        try:
+            num_chunks = None
+            num_done = 0
+            # the mapped chunks waiting for the previous chunks, which hold
+            # their slots until they are yielded
+            pending = {}
+            while num_chunks is None or num_done < num_chunks:
+                chunk_id, slot, kind, value = _get_result(results, workers)
+                if kind == "end":
+                    num_chunks = chunk_id
+                    continue
+                if kind == "error":
+                    raise RuntimeError(
+                        f"xmap_readers failed to map the samples:\n{value}"
+                    )
+                chunk = slots.read(slot, kind, value)
+                if not order:
+                    slots.release(slot)
+                    num_done += 1
+                    yield from chunk
+                    continue
+                pending[chunk_id] = (slot, chunk)
+                while num_done in pending:
+                    slot, chunk = pending.pop(num_done)
+                    slots.release(slot)
+                    num_done += 1
+                    yield from chunk
+            for _ in workers:
+                tasks.put(None)
+            finished = True
+        finally:
+            # wake up the feed worker waiting for a slot
+            stop.set()
+            slots.release(None)
+            _stop_processes(workers, finished)
+            slots.close()
+
+    if use_process:
+        if sys.platform == 'win32':
+            raise NotImplementedError(
+                "The use_process of xmap_readers is not supported on windows."
+            )
+        assert chunk_size > 0, "chunk_size should be positive."
+        return process_xreader
     return xreader
 
 
@@ -579,6 +776,8 @@ def multiprocess_reader(
     readers: Sequence[_Reader[_T]],
     use_pipe: bool = True,
     queue_size: int = 1000,
+    use_shared_memory: bool = False,
+    chunk_size: int = 16,
 ) -> _Reader[list[_T]]:
     """
     This API use python ``multiprocessing`` to read data from ``readers`` parallelly,
@@ -599,6 +798,12 @@ def multiprocess_reader(
         queue_size (int, optional): only useful when ``use_pipe`` is False - ``multiprocess.Queue``
             is used, default 1000. Increase this value can speed up the data reading, and more memory
             will be consumed.
+        use_shared_memory (bool, optional): whether to send the samples in chunks through the shared
+            memory instead of ``multiprocess.Pipe`` or ``multiprocess.Queue``, which avoids encoding
+            the samples by json and supports the samples of numpy arrays. At most
+            max(len(readers), queue_size / chunk_size) chunks are in flight, default False.
+        chunk_size (int, optional): the number of samples in a chunk, only useful when
+            ``use_shared_memory`` is True, default 16.
 
     Returns:
         ``generator``: a new reader which can be run parallelly
@@ -761,7 +966,61 @@ def multiprocess_reader(
                 else:
                     yield sample
 
-    if use_pipe:
+    def _read_into_shared_memory(reader, results, slots):
+        try:
+            samples = reader()
+            while True:
+                slot = slots.acquire()
+                chunk = list(itertools.islice(samples, chunk_size))
+                if not chunk:
+                    slots.release(slot)
+                    break
+                if any(sample is None for sample in chunk):
+                    raise ValueError("sample has None!")
+                results.put((slot, *slots.write(slot, chunk)))
+            results.put((None, "end", None))
+        except Exception:
+            results.put((None, "error", traceback.format_exc()))
+
+    def shared_memory_reader():
+        num_slots = max(len(readers), -(-queue_size // chunk_size))
+        slots = _SharedMemorySlots(num_slots, _SHARED_MEMORY_SIZE)
+        results = fork_context.Queue()
+        processes = [
+            fork_context.Process(
+                target=_read_into_shared_memory,
+                args=(reader, results, slots),
+                daemon=True,
+            )
+            for reader in readers
+        ]
+        for p in processes:
+            p.start()
+
+        finished = False
+        try:
+            finish_num = 0
+            while finish_num < len(readers):
+                slot, kind, value = _get_result(results, processes)
+                if kind == "end":
+                    finish_num += 1
+                elif kind == "error":
+                    raise ValueError(
+                        f"multiprocess_reader failed to read data:\n{value}"
+                    )
+                else:
+                    chunk = slots.read(slot, kind, value)
+                    slots.release(slot)
+                    yield from chunk
+            finished = True
+        finally:
+            _stop_processes(processes, finished)
+            slots.close()
+
+    if use_shared_memory:
+        assert chunk_size > 0, "chunk_size should be positive."
+        return shared_memory_reader
+    elif use_pipe:
         return pipe_reader
     else:
         return queue_reader
@@ -78,6 +78,43 @@ def safe_entropy(reference_distr_P, P_sum, candidate_distr_Q, Q_sum):
     return (tmp_sum1 - tmp_sum2) / P_sum
 
 
+def _kl_divergences(hist, candidates, quant_range, P_sum):
+    '''
+    Calculate the KL-divergences of the candidate thresholds at once, which
+    are the same as expand_quantized_bins and safe_entropy for every
+    candidate, by the prefix sums of the hist.
+    '''
+    prefix_sum = np.concatenate([[0.0], np.cumsum(hist)])
+    prefix_nonzero = np.concatenate([[0], np.cumsum(hist != 0)])
+    hist_log = hist * np.log(np.where(hist > 0, hist, 1.0))
+    prefix_log = np.concatenate([[0.0], np.cumsum(hist_log)])
+
+    i = candidates[:, None]
+    # the merged bins [starts, ends) of every candidate, the last merged
+    # bin ends at the candidate
+    num_merged_bins = i // quant_range
+    idx = np.arange(quant_range)[None, :]
+    starts = idx * num_merged_bins
+    ends = np.where(idx == quant_range - 1, i, (idx + 1) * num_merged_bins)
+    quantized_sum = prefix_sum[ends] - prefix_sum[starts]
+    nonzero = prefix_nonzero[ends] - prefix_nonzero[starts]
+    # the expanded bins of Q are the average of the merged bin on the
+    # nonzero bins of P, which are the nonzero bins of the hist
+    avg_bin_ele = quantized_sum / np.maximum(nonzero, 1)
+    log_avg = np.log(np.where(nonzero > 0, avg_bin_ele, 1.0))
+    Q_sum = (avg_bin_ele * nonzero).sum(axis=1)
+
+    candidates_sum = prefix_sum[candidates]
+    outliers_count = P_sum - candidates_sum
+    last_P = hist[candidates - 1] + outliers_count
+    P_log_P = prefix_log[candidates - 1] + last_P * np.log(last_P)
+    P_log_Q = (quantized_sum * log_avg).sum(axis=1)
+    P_log_Q += outliers_count * log_avg[:, -1]
+    return (
+        P_log_P + P_sum * np.log(Q_sum) - P_sum * np.log(P_sum) - P_log_Q
+    ) / P_sum
+
+
 def cal_kl_threshold(hist, bin_width, bits):
     '''
     Using the KL-divergence method to get the more precise threshold.
@@ -92,47 +129,26 @@ def cal_kl_threshold(hist, bin_width, bits):
     starting_iter = int((hist_bins - 1) * 0.5)
     quant_range = 2 ** (bits - 1) - 1
 
-    P_sum = np.sum(np.array(hist).ravel())
-    min_kl_divergence = 0
+    hist = np.asarray(hist, dtype=np.float64)
+    P_sum = np.sum(hist)
+    candidates = np.arange(max(starting_iter, 1), hist_bins)
+    candidates = candidates[hist[candidates - 1] != 0]
     min_kl_index = 0
-    kl_inited = False
-
-    for i in range(starting_iter, hist_bins):
-        reference_distr_P = hist[0:i].tolist()
-        outliers_count = sum(hist[i:])
-        if reference_distr_P[i - 1] == 0:
-            continue
-        reference_distr_P[i - 1] += outliers_count
-        reference_distr_bins = reference_distr_P[:]
-        candidate_distr_Q = hist[0:i].tolist()
-        num_merged_bins = int(i / quant_range)
-        candidate_distr_Q_quantized = [0] * quant_range
-        j_start = 0
-        j_end = num_merged_bins
-        for idx in range(quant_range):
-            candidate_distr_Q_quantized[idx] = sum(
-                candidate_distr_Q[j_start:j_end]
-            )
-            j_start += num_merged_bins
-            j_end += num_merged_bins
-            if (idx + 1) == quant_range - 1:
-                j_end = i
-        candidate_distr_Q = expand_quantized_bins(
-            candidate_distr_Q_quantized, reference_distr_bins
-        )
-        Q_sum = sum(candidate_distr_Q)
-        kl_divergence = safe_entropy(
-            reference_distr_P, P_sum, candidate_distr_Q, Q_sum
+    if len(candidates) > 0:
+        # bound the memory of the [candidates, quant_range] arrays
+        chunk_size = max(1, 2**20 // quant_range)
+        kl_divergences = np.concatenate(
+            [
+                _kl_divergences(
+                    hist,
+                    candidates[start : start + chunk_size],
+                    quant_range,
+                    P_sum,
+                )
+                for start in range(0, len(candidates), chunk_size)
+            ]
         )
-        if not kl_inited:
-            min_kl_divergence = kl_divergence
-            min_kl_index = i
-            kl_inited = True
-        elif kl_divergence < min_kl_divergence:
-            min_kl_divergence = kl_divergence
-            min_kl_index = i
-        else:
-            pass
+        min_kl_index = int(candidates[np.argmin(kl_divergences)])
     if min_kl_index == 0:
         while starting_iter > 0:
             if hist[starting_iter] == 0:
@@ -0,0 +1,211 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+
+
+def _scale_rates():
+    # the rates of the abs max searched by algo = mse or emd
+    rates = []
+    s = 0.3
+    while s <= 1.0:
+        rates.append(s)
+        s += 0.02
+    return np.array(rates)
+
+
+SCALE_RATES = _scale_rates()
+
+
+def channel_abs_max(tensor, quant_axis=None):
+    '''
+    Get the abs max of a tensor, or the abs max of every channel on
+    quant_axis as a list.
+    '''
+    tensor = np.abs(tensor)
+    if quant_axis is None:
+        return float(np.max(tensor))
+    axes = tuple(i for i in range(tensor.ndim) if i != quant_axis)
+    return np.max(tensor, axis=axes).tolist()
+
+
+def channel_min_max(tensor, quant_axis=None):
+    '''
+    Get the min and max of a tensor, or the min and max of every channel on
+    quant_axis as lists.
+    '''
+    if quant_axis is None:
+        return float(np.min(tensor)), float(np.max(tensor))
+    axes = tuple(i for i in range(tensor.ndim) if i != quant_axis)
+    return (
+        np.min(tensor, axis=axes).tolist(),
+        np.max(tensor, axis=axes).tolist(),
+    )
+
+
+def _coarsen(*arrays):
+    # double the range of the bins in place by merging every two adjacent
+    # bins into the middle half
+    for values in arrays:
+        half = len(values) // 2
+        quarter = len(values) // 4
+        merged = values.reshape([half, 2]).sum(axis=1)
+        values[:] = 0
+        values[quarter : quarter + half] = merged
+
+
+class StreamingHistogram:
+    '''
+    The histogram of the values of a tensor in all the calibration batches,
+    which keeps the count, the sum and the sum of squares of every bin, so
+    the quantization loss of the values in a bin can be calculated exactly
+    unless the bin is split by a rounding boundary.
+
+    The bins cover [-bound, bound], where bound is a power of two not less
+    than the abs max. When a batch exceeds the bound, the bound is doubled
+    by merging every two adjacent bins, so every batch is read only once and
+    the histograms of different batches or processes can be merged.
+
+    Args:
+        bins(int): The number of bins, which should be a multiple of 4.
+    '''
+
+    def __init__(self, bins=8192):
+        assert bins % 4 == 0, "The bins should be a multiple of 4."
+        self.bins = bins
+        self.bound = None
+        self.abs_max = 0.0
+        self.count = np.zeros(bins, dtype=np.float64)
+        self.sum = np.zeros(bins, dtype=np.float64)
+        self.square_sum = np.zeros(bins, dtype=np.float64)
+
+    def _grow(self, abs_max):
+        if self.bound is None:
+            self.bound = 2.0 ** np.ceil(np.log2(max(abs_max, 1e-8)))
+            return
+        while abs_max > self.bound:
+            _coarsen(self.count, self.sum, self.square_sum)
+            self.bound *= 2
+
+    def update(self, tensor):
+        '''
+        Add the values of a tensor to the histogram.
+        '''
+        values = np.asarray(tensor, dtype=np.float64).ravel()
+        if values.size == 0:
+            return
+        abs_max = float(np.max(np.abs(values)))
+        self._grow(abs_max)
+        self.abs_max = max(self.abs_max, abs_max)
+        index = ((values / self.bound + 1.0) * (self.bins // 2)).astype(
+            np.int64
+        )
+        np.clip(index, 0, self.bins - 1, out=index)
+        self.count += np.bincount(index, minlength=self.bins)
+        self.sum += np.bincount(index, weights=values, minlength=self.bins)
+        self.square_sum += np.bincount(
+            index, weights=values * values, minlength=self.bins
+        )
+
+    def merge(self, other):
+        '''
+        Add the values of another histogram of the same bins.
+        '''
+        assert self.bins == other.bins, "The bins should be the same."
+        if other.bound is None:
+            return
+        self._grow(other.bound)
+        other_count = other.count.copy()
+        other_sum = other.sum.copy()
+        other_square_sum = other.square_sum.copy()
+        bound = other.bound
+        while bound < self.bound:
+            _coarsen(other_count, other_sum, other_square_sum)
+            bound *= 2
+        self.count += other_count
+        self.sum += other_sum
+        self.square_sum += other_square_sum
+        self.abs_max = max(self.abs_max, other.abs_max)
+
+
+def _quant_levels(values, scales, bits, onnx_format):
+    bins = 2 ** (bits - 1) - 1
+    if onnx_format:
+        return np.clip(np.round(values / scales * bins), -bins - 1, bins)
+    return np.round(np.clip(values, 0.0, scales) / scales * bins)
+
+
+def calibration_losses(hist, scales, bits, onnx_format, algo):
+    '''
+    Calculate the mse or emd losses of quantizing the values in the hist by
+    all the scales at once. The values in a bin are quantized to the level
+    of the bin, or split between the two levels of a bin by the rounding
+    boundary as if they are uniform in the bin.
+    '''
+    nonzero = np.nonzero(hist.count)[0]
+    count = hist.count[nonzero]
+    value_sum = hist.sum[nonzero]
+    square_sum = hist.square_sum[nonzero]
+    total = count.sum()
+
+    bins = 2 ** (bits - 1) - 1
+    scales = np.asarray(scales, dtype=np.float64)[:, None]
+    width = 2 * hist.bound / hist.bins
+    lower = nonzero * width - hist.bound
+    lower_levels = _quant_levels(lower, scales, bits, onnx_format)
+    upper_levels = _quant_levels(lower + width, scales, bits, onnx_format)
+    boundary = (lower_levels + 0.5) * scales / bins
+    lower_ratio = np.where(
+        lower_levels == upper_levels,
+        1.0,
+        np.clip((boundary - lower) / width, 0.0, 1.0),
+    )
+    lower_values = lower_levels * scales / bins
+    upper_values = upper_levels * scales / bins
+    # the mean of the quantized values and their squares in every bin
+    quant_mean = lower_ratio * lower_values + (1 - lower_ratio) * upper_values
+    quant_square = (
+        lower_ratio * lower_values * lower_values
+        + (1 - lower_ratio) * upper_values * upper_values
+    )
+    if algo == "mse":
+        return (
+            square_sum.sum()
+            - 2 * (quant_mean * value_sum).sum(axis=1)
+            + quant_square @ count
+        ) / total
+    assert algo == "emd", f"Unsupported calibration algo {algo}."
+    mean = value_sum.sum() / total
+    std = np.sqrt(max(square_sum.sum() / total - mean * mean, 0.0))
+    quant_mean = quant_mean @ count / total
+    quant_std = np.sqrt(
+        np.maximum(quant_square @ count / total - quant_mean * quant_mean, 0.0)
+    )
+    return np.abs(mean - quant_mean) + np.abs(std - quant_std)
+
+
+def search_scale(hist, bits, onnx_format, algo):
+    '''
+    Search the scale of the min mse or emd loss in SCALE_RATES of the abs
+    max of the hist.
+
+    Returns:
+        The scale and its loss.
+    '''
+    abs_max = hist.abs_max if hist.abs_max > 0 else 1e-8
+    scales = SCALE_RATES * abs_max
+    losses = calibration_losses(hist, scales, bits, onnx_format, algo)
+    # the last one of the equal losses like the sequential search
+    index = len(losses) - 1 - int(np.argmin(losses[::-1]))
+    return float(scales[index]), float(losses[index])
@@ -13,8 +13,11 @@
 # limitations under the License.
 
 import logging
+import multiprocessing
 import os
 import shutil
+import sys
+import traceback
 
 import numpy as np
 
@@ -27,11 +30,18 @@ from paddle.base.framework import IrGraph, _get_var
 
 from ... import static
 from ...framework import core
+from ...io import RandomSampler
 from ...utils import unique_name
 from ..log_helper import get_logger
 from . import utils
 from .adaround import run_adaround
 from .cal_kl_threshold import cal_kl_threshold
+from .calibration import (
+    StreamingHistogram,
+    channel_abs_max,
+    channel_min_max,
+    search_scale,
+)
 from .quant_config import (
     SUPPORT_QUANTIZATION_OP_DICT,
     ARMCPUQuantizer,
@@ -89,6 +99,24 @@ def _remove_ctrl_vars(graph):
     return graph
 
 
+def _calibration_worker(ptq, rank, conn):
+    # run in the forked process with a copy of the model and the scope
+    ptq._executor = static.Executor(ptq._place)
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            stage, stats = message
+            ptq._merge_calibration_stats(stage, stats)
+            ptq._run_calibration(stage, rank, ptq._num_workers)
+            conn.send(("done", ptq._calibration_stats(stage)))
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+    finally:
+        conn.close()
+
+
 def _apply_pass(
     scope, graph, pass_name, attrs=None, attr_values=None, debug=False
 ):
@@ -149,6 +177,7 @@ class PostTrainingQuantization:
         scale_dict=None,
         return_graph=False,
         deploy_backend=None,
+        num_workers=1,
     ):
         """
         Constructor.
@@ -242,6 +271,18 @@ class PostTrainingQuantization:
             deploy_backend(str, optional): Deploy backend, it can be None, `TensorRT`,
                 `MKLDNN`, `ARM`. And it will extend the new backend. Default is None,
                 which means to use the default general quantization configuration.
+            num_workers(int, optional): The number of processes to run the
+                calibration batches. If num_workers > 1, the current process
+                and num_workers - 1 forked processes run every num_workers-th
+                batch respectively, and the statistics of activations in all
+                the processes are merged to calculate the thresholds. Every
+                process iterates the data_loader, so the data_loader should
+                be cheap compared to the model, and it must be deterministic,
+                i.e. yield the same batches in the same order in every
+                process without shuffling or random augmentation, otherwise
+                some batches are calibrated twice and others are skipped. It
+                only supports the executor on CPU and all the algos except
+                'ptf'. Default is 1.
         Returns:
             None
 
@@ -346,6 +387,25 @@ class PostTrainingQuantization:
 
         # Define variables
         self._place = self._executor.place
+        self._num_workers = num_workers
+        self._calibration_workers = []
+        assert num_workers > 0, "The num_workers should be greater than 0."
+        if num_workers > 1:
+            if sys.platform == 'win32':
+                raise NotImplementedError(
+                    "The num_workers > 1 is not supported on windows."
+                )
+            assert isinstance(
+                self._place, core.CPUPlace
+            ), "The num_workers > 1 only supports the executor on CPU."
+            assert algo != "ptf", "The num_workers > 1 does not support ptf."
+            batch_sampler = getattr(data_loader, 'batch_sampler', None)
+            assert not (
+                getattr(batch_sampler, 'shuffle', False)
+                or isinstance(
+                    getattr(batch_sampler, 'sampler', None), RandomSampler
+                )
+            ), "The num_workers > 1 requires the data_loader without shuffle."
         self._program = None
         self._feed_list = None
         self._fetch_list = None
@@ -365,7 +425,8 @@ class PostTrainingQuantization:
         self._quantized_var_max = {}
         # The vars for algo = avg
         self._quantized_var_avg = {}
-        # The best loss of algo = mse
+        # The histograms and the best loss of algo = mse or emd
+        self._act_calibration_histogram = {}
         self._best_calibration_loss = {}
         # The threshold for algo = abs_max, mse or avg
         self._quantized_threshold = {}
@@ -425,47 +486,16 @@ class PostTrainingQuantization:
         self._collect_target_varnames()
         self._set_activation_persistable()
 
-        if self._algo in ["KL", "hist"]:
-            batch_id = 0
-            with tqdm(
-                total=self._batch_nums,
-                bar_format='Preparation stage, Run batch:|{bar}| {n_fmt}/{total_fmt}',
-                ncols=80,
-            ) as t:
-                for data in self._data_loader():
-                    self._executor.run(
-                        program=self._program,
-                        feed=data,
-                        fetch_list=self._fetch_list,
-                        return_numpy=False,
-                        scope=self._scope,
-                    )
-                    self._collect_activation_abs_min_max()
-                    batch_id += 1
-                    t.update()
-                    if self._batch_nums and batch_id >= self._batch_nums:
-                        break
-            self._init_sampling_act_histogram()
-
-        batch_id = 0
-        with tqdm(
-            total=self._batch_nums,
-            bar_format='Sampling stage, Run batch:|{bar}| {n_fmt}/{total_fmt}',
-            ncols=80,
-        ) as t:
-            for data in self._data_loader():
-                self._executor.run(
-                    program=self._program,
-                    feed=data,
-                    fetch_list=self._fetch_list,
-                    return_numpy=False,
-                    scope=self._scope,
-                )
-                self._sampling()
-                batch_id += 1
-                t.update()
-                if self._batch_nums and batch_id >= self._batch_nums:
-                    break
+        self._start_calibration_workers()
+        finished = False
+        try:
+            if self._algo in ["KL", "hist"]:
+                self._calibrate("Preparation")
+                self._init_sampling_act_histogram()
+            self._calibrate("Sampling")
+            finished = True
+        finally:
+            self._stop_calibration_workers(finished)
 
         if self._algo == 'avg':
             for var_name in self._quantized_act_var_name:
@@ -478,6 +508,9 @@ class PostTrainingQuantization:
         if self._algo in ["KL", "hist"]:
             self._calculate_kl_hist_threshold()
 
+        if self._algo in ["mse", "emd"]:
+            self._calculate_mse_emd_threshold()
+
         if self._round_type == 'adaround':
             self._adaround_apply()
 
@@ -722,6 +755,171 @@ class PostTrainingQuantization:
                 var.persistable = False
                 self._scope.find_var(var.name).get_tensor()._clear()
 
+    def _start_calibration_workers(self):
+        if self._num_workers == 1:
+            return
+        context = multiprocessing.get_context("fork")
+        for rank in range(1, self._num_workers):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(
+                target=_calibration_worker, args=(self, rank, child_conn)
+            )
+            process.daemon = True
+            process.start()
+            child_conn.close()
+            self._calibration_workers.append((process, parent_conn))
+
+    def _stop_calibration_workers(self, finished):
+        for process, conn in self._calibration_workers:
+            if finished:
+                conn.send(None)
+                process.join()
+            else:
+                process.terminate()
+            conn.close()
+        self._calibration_workers = []
+
+    def _calibrate(self, stage):
+        '''
+        Run the calibration batches of the stage in all the processes, and
+        merge the statistics of the workers into the current process.
+        '''
+        stats = self._calibration_stats(stage)
+        for _, conn in self._calibration_workers:
+            conn.send((stage, stats))
+        self._run_calibration(stage, 0, self._num_workers)
+        for rank, (_, conn) in enumerate(self._calibration_workers, 1):
+            try:
+                status, stats = conn.recv()
+            except EOFError:
+                raise RuntimeError(
+                    f"The calibration worker {rank} exited unexpectedly."
+                )
+            if status == "error":
+                raise RuntimeError(
+                    f"The calibration worker {rank} failed:\n{stats}"
+                )
+            self._merge_calibration_stats(stage, stats)
+
+    def _run_calibration_batches(self, rank, num_workers):
+        for batch_id, data in enumerate(self._data_loader()):
+            if batch_id % num_workers == rank:
+                self._executor.run(
+                    program=self._program,
+                    feed=data,
+                    fetch_list=self._fetch_list,
+                    return_numpy=False,
+                    scope=self._scope,
+                )
+                yield batch_id
+            if self._batch_nums and batch_id + 1 >= self._batch_nums:
+                break
+
+    def _run_calibration(self, stage, rank=0, num_workers=1):
+        '''
+        Run the calibration batches of the rank, and sample the activations
+        of every batch.
+        '''
+        if stage == "Preparation":
+            sample = self._collect_activation_abs_min_max
+        else:
+            sample = self._sampling
+        batches = self._run_calibration_batches(rank, num_workers)
+        if rank != 0:
+            for _ in batches:
+                sample()
+            return
+        with tqdm(
+            total=len(range(rank, self._batch_nums, num_workers)),
+            bar_format=stage + ' stage, Run batch:|{bar}| {n_fmt}/{total_fmt}',
+            ncols=80,
+        ) as t:
+            for _ in batches:
+                sample()
+                t.update()
+
+    def _calibration_stats(self, stage):
+        '''
+        Get the statistics of activations sampled in the stage, which are
+        merged by _merge_calibration_stats.
+        '''
+        stats = {"zero_size_var_names": self._zero_size_var_names}
+        if stage == "Preparation":
+            stats["abs_min_max"] = self._sampling_act_abs_min_max
+        elif self._algo == "abs_max":
+            stats["threshold"] = {
+                var_name: self._quantized_threshold[var_name]
+                for var_name in self._quantized_act_var_name
+                if var_name in self._quantized_threshold
+            }
+        elif self._algo == "min_max":
+            stats["min"] = {
+                var_name: self._quantized_var_min[var_name]
+                for var_name in self._quantized_act_var_name
+                if var_name in self._quantized_var_min
+            }
+            stats["max"] = {
+                var_name: self._quantized_var_max[var_name]
+                for var_name in self._quantized_act_var_name
+                if var_name in self._quantized_var_max
+            }
+        elif self._algo == "avg":
+            stats["avg"] = self._quantized_var_avg
+        elif self._algo in ["mse", "emd"]:
+            stats["histogram"] = self._act_calibration_histogram
+        elif self._algo in ["KL", "hist"]:
+            stats["histogram"] = self._sampling_act_histogram
+        return stats
+
+    def _merge_calibration_stats(self, stage, stats):
+        '''
+        Merge the statistics of activations sampled in the stage by another
+        process.
+        '''
+        self._zero_size_var_names.update(stats["zero_size_var_names"])
+        if stage == "Preparation":
+            for var_name, (min_value, max_value) in stats[
+                "abs_min_max"
+            ].items():
+                if var_name not in self._sampling_act_abs_min_max:
+                    self._sampling_act_abs_min_max[var_name] = [
+                        min_value,
+                        max_value,
+                    ]
+                else:
+                    abs_min_max = self._sampling_act_abs_min_max[var_name]
+                    abs_min_max[0] = min(abs_min_max[0], min_value)
+                    abs_min_max[1] = max(abs_min_max[1], max_value)
+        elif self._algo == "abs_max":
+            for var_name, value in stats["threshold"].items():
+                self._quantized_threshold[var_name] = max(
+                    self._quantized_threshold.get(var_name, value), value
+                )
+        elif self._algo == "min_max":
+            for var_name, value in stats["min"].items():
+                self._quantized_var_min[var_name] = min(
+                    self._quantized_var_min.get(var_name, value), value
+                )
+            for var_name, value in stats["max"].items():
+                self._quantized_var_max[var_name] = max(
+                    self._quantized_var_max.get(var_name, value), value
+                )
+        elif self._algo == "avg":
+            for var_name, values in stats["avg"].items():
+                self._quantized_var_avg.setdefault(var_name, []).extend(values)
+        elif self._algo in ["mse", "emd"]:
+            for var_name, hist in stats["histogram"].items():
+                if var_name not in self._act_calibration_histogram:
+                    self._act_calibration_histogram[var_name] = hist
+                else:
+                    self._act_calibration_histogram[var_name].merge(hist)
+        elif self._algo in ["KL", "hist"]:
+            for var_name, (hist, hist_edges) in stats["histogram"].items():
+                if var_name not in self._sampling_act_histogram:
+                    self._sampling_act_histogram[var_name] = [hist, hist_edges]
+                else:
+                    self._sampling_act_histogram[var_name][0] += hist
+
     def _sampling(self):
         '''
         Sample the min/max, abs_max or histogram in every iterations.
@@ -732,147 +930,50 @@ class PostTrainingQuantization:
             self._sample_avg()
         elif self._algo == "min_max":
             self._sample_min_max()
-        elif self._algo == "mse":
-            self._sample_mse()
-        elif self._algo == "emd":
-            self._sample_emd()
+        elif self._algo in ["mse", "emd"]:
+            self._sample_mse_emd()
         elif self._algo == "ptf":
             self._sample_ptf()
         elif self._algo in ["KL", "hist"]:
             self._sample_histogram()
 
-    def _sample_mse(self):
-        if self._quantized_threshold == {}:
-            for var_name in self._quantized_weight_var_name:
-                var_tensor = utils.load_variable_data(self._scope, var_name)
-                if self._weight_quantize_type == "abs_max":
-                    abs_max_value = float(np.max(np.abs(var_tensor)))
-                elif self._weight_quantize_type == "channel_wise_abs_max":
-                    abs_max_value = []
-                    if (
-                        self._weight_op_pairs[var_name]
-                        in utils._channelwise_quant_axis1_ops
-                    ):
-                        for i in range(var_tensor.shape[1]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[:, i])))
-                            )
-                    else:
-                        for i in range(var_tensor.shape[0]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[i])))
-                            )
-                self._quantized_threshold[var_name] = abs_max_value
-        _logger.info("MSE searching stage ...")
-        for var_name in self._quantized_act_var_name:
+    def _weight_quant_axis(self, var_name):
+        if self._weight_quantize_type == "abs_max":
+            return None
+        if (
+            self._weight_op_pairs[var_name]
+            in utils._channelwise_quant_axis1_ops
+        ):
+            return 1
+        return 0
+
+    def _sample_weight_abs_max(self):
+        for var_name in self._quantized_weight_var_name:
             var_tensor = utils.load_variable_data(self._scope, var_name)
-            if var_tensor.size == 0:
-                self._zero_size_var_names.add(var_name)
-                continue
-            var_tensor = var_tensor.flatten()
-            abs_max_value = float(np.max(np.abs(var_tensor)))
-            abs_max_value = 1e-8 if abs_max_value == 0.0 else abs_max_value
-            s = 0.3
-            if var_name not in self._best_calibration_loss:
-                self._best_calibration_loss[var_name] = float('inf')
-            while s <= 1.0:
-                scale = s * abs_max_value
-                s += 0.02
-                bins = 2 ** (self._activation_bits - 1) - 1
-                if self._onnx_format:
-                    quant_var = np.clip(
-                        np.round(var_tensor / scale * bins), -bins - 1, bins
-                    )
-                    quant_dequant_var = quant_var / bins * scale
-                else:
-                    quant_dequant_var = (
-                        np.round(np.clip(var_tensor, 0.0, scale) / scale * bins)
-                        / bins
-                        * scale
-                    )
-                mse_loss = ((var_tensor - quant_dequant_var) ** 2).mean()
-                if mse_loss <= self._best_calibration_loss[var_name]:
-                    self._best_calibration_loss[var_name] = mse_loss
-                    self._quantized_threshold[var_name] = scale
+            self._quantized_threshold[var_name] = channel_abs_max(
+                var_tensor, self._weight_quant_axis(var_name)
+            )
 
-    def _sample_emd(self):
+    def _sample_mse_emd(self):
+        '''
+        Add the activations to their histograms, and the threshold of the
+        min mse or emd loss is searched on the histograms of all the batches
+        in _calculate_mse_emd_threshold.
+        '''
         if self._quantized_threshold == {}:
-            for var_name in self._quantized_weight_var_name:
-                var_tensor = utils.load_variable_data(self._scope, var_name)
-                if self._weight_quantize_type == "abs_max":
-                    abs_max_value = float(np.max(np.abs(var_tensor)))
-                elif self._weight_quantize_type == "channel_wise_abs_max":
-                    abs_max_value = []
-                    if (
-                        self._weight_op_pairs[var_name]
-                        in utils._channelwise_quant_axis1_ops
-                    ):
-                        for i in range(var_tensor.shape[1]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[:, i])))
-                            )
-                    else:
-                        for i in range(var_tensor.shape[0]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[i])))
-                            )
-                self._quantized_threshold[var_name] = abs_max_value
-        _logger.info("EMD searching stage ...")
+            self._sample_weight_abs_max()
         for var_name in self._quantized_act_var_name:
             var_tensor = utils.load_variable_data(self._scope, var_name)
             if var_tensor.size == 0:
                 self._zero_size_var_names.add(var_name)
                 continue
-            var_tensor = var_tensor.flatten()
-            abs_max_value = float(np.max(np.abs(var_tensor)))
-            abs_max_value = 1e-8 if abs_max_value == 0.0 else abs_max_value
-            s = 0.3
-            if var_name not in self._best_calibration_loss:
-                self._best_calibration_loss[var_name] = float('inf')
-            while s <= 1.0:
-                scale = s * abs_max_value
-                s += 0.02
-                bins = 2 ** (self._activation_bits - 1) - 1
-                if self._onnx_format:
-                    quant_var = np.clip(
-                        np.round(var_tensor / scale * bins), -bins - 1, bins
-                    )
-                    quant_dequant_var = quant_var / bins * scale
-                else:
-                    quant_dequant_var = (
-                        np.round(np.clip(var_tensor, 0.0, scale) / scale * bins)
-                        / bins
-                        * scale
-                    )
-                emd_loss = np.abs(
-                    np.mean(var_tensor) - np.mean(quant_dequant_var)
-                ) + np.abs(np.std(var_tensor) - np.std(quant_dequant_var))
-                if emd_loss <= self._best_calibration_loss[var_name]:
-                    self._best_calibration_loss[var_name] = emd_loss
-                    self._quantized_threshold[var_name] = scale
+            if var_name not in self._act_calibration_histogram:
+                self._act_calibration_histogram[var_name] = StreamingHistogram()
+            self._act_calibration_histogram[var_name].update(var_tensor)
 
     def _sample_avg(self):
         if self._quantized_threshold == {}:
-            for var_name in self._quantized_weight_var_name:
-                var_tensor = utils.load_variable_data(self._scope, var_name)
-                if self._weight_quantize_type == "abs_max":
-                    abs_max_value = float(np.max(np.abs(var_tensor)))
-                elif self._weight_quantize_type == "channel_wise_abs_max":
-                    abs_max_value = []
-                    if (
-                        self._weight_op_pairs[var_name]
-                        in utils._channelwise_quant_axis1_ops
-                    ):
-                        for i in range(var_tensor.shape[1]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[:, i])))
-                            )
-                    else:
-                        for i in range(var_tensor.shape[0]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[i])))
-                            )
-                self._quantized_threshold[var_name] = abs_max_value
+            self._sample_weight_abs_max()
 
         for var_name in self._quantized_act_var_name:
             var_tensor = utils.load_variable_data(self._scope, var_name)
@@ -894,26 +995,7 @@ class PostTrainingQuantization:
 
     def _sample_abs_max(self):
         if self._quantized_threshold == {}:
-            for var_name in self._quantized_weight_var_name:
-                var_tensor = utils.load_variable_data(self._scope, var_name)
-                if self._weight_quantize_type == "abs_max":
-                    abs_max_value = float(np.max(np.abs(var_tensor)))
-                elif self._weight_quantize_type == "channel_wise_abs_max":
-                    abs_max_value = []
-                    if (
-                        self._weight_op_pairs[var_name]
-                        in utils._channelwise_quant_axis1_ops
-                    ):
-                        for i in range(var_tensor.shape[1]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[:, i])))
-                            )
-                    else:
-                        for i in range(var_tensor.shape[0]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[i])))
-                            )
-                self._quantized_threshold[var_name] = abs_max_value
+            self._sample_weight_abs_max()
 
         for var_name in self._quantized_act_var_name:
             var_tensor = utils.load_variable_data(self._scope, var_name)
@@ -930,23 +1012,9 @@ class PostTrainingQuantization:
         if self._quantized_var_min == {} and self._quantized_var_max == {}:
             for var_name in self._quantized_weight_var_name:
                 var_tensor = utils.load_variable_data(self._scope, var_name)
-                if self._weight_quantize_type == "abs_max":
-                    min_value = float(np.min(var_tensor))
-                    max_value = float(np.max(var_tensor))
-                elif self._weight_quantize_type == "channel_wise_abs_max":
-                    min_value = []
-                    max_value = []
-                    if (
-                        self._weight_op_pairs[var_name]
-                        in utils._channelwise_quant_axis1_ops
-                    ):
-                        for i in range(var_tensor.shape[1]):
-                            min_value.append(float(np.min(var_tensor[:, i])))
-                            max_value.append(float(np.max(var_tensor[:, i])))
-                    else:
-                        for i in range(var_tensor.shape[0]):
-                            min_value.append(float(np.min(var_tensor[i])))
-                            max_value.append(float(np.max(var_tensor[i])))
+                min_value, max_value = channel_min_max(
+                    var_tensor, self._weight_quant_axis(var_name)
+                )
                 self._quantized_var_min[var_name] = min_value
                 self._quantized_var_max[var_name] = max_value
 
@@ -985,26 +1053,7 @@ class PostTrainingQuantization:
         https://github.com/megvii-research/FQ-ViT/
         """
         if self._quantized_threshold == {}:
-            for var_name in self._quantized_weight_var_name:
-                var_tensor = utils.load_variable_data(self._scope, var_name)
-                if self._weight_quantize_type == "abs_max":
-                    abs_max_value = float(np.max(np.abs(var_tensor)))
-                elif self._weight_quantize_type == "channel_wise_abs_max":
-                    abs_max_value = []
-                    if (
-                        self._weight_op_pairs[var_name]
-                        in utils._channelwise_quant_axis1_ops
-                    ):
-                        for i in range(var_tensor.shape[1]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[:, i])))
-                            )
-                    else:
-                        for i in range(var_tensor.shape[0]):
-                            abs_max_value.append(
-                                float(np.max(np.abs(var_tensor[i])))
-                            )
-                self._quantized_threshold[var_name] = abs_max_value
+            self._sample_weight_abs_max()
 
         for var_name in self._quantized_act_var_name:
             var_tensor = utils.load_variable_data(self._scope, var_name)
@@ -1115,24 +1164,9 @@ class PostTrainingQuantization:
         # Abs_max threshold for weights
         for var_name in self._quantized_weight_var_name:
             weight_data = utils.load_variable_data(self._scope, var_name)
-            if self._weight_quantize_type == "abs_max":
-                weight_threshold = float(np.max(np.abs(weight_data)))
-            elif self._weight_quantize_type == "channel_wise_abs_max":
-                weight_threshold = []
-                if (
-                    self._weight_op_pairs[var_name]
-                    in utils._channelwise_quant_axis1_ops
-                ):
-                    for i in range(weight_data.shape[1]):
-                        weight_threshold.append(
-                            float(np.max(np.abs(weight_data[:, i])))
-                        )
-                else:
-                    for i in range(weight_data.shape[0]):
-                        weight_threshold.append(
-                            float(np.max(np.abs(weight_data[i])))
-                        )
-            self._quantized_var_threshold[var_name] = weight_threshold
+            self._quantized_var_threshold[var_name] = channel_abs_max(
+                weight_data, self._weight_quant_axis(var_name)
+            )
 
         for var_name in self._quantized_act_var_name:
             if (var_name in self._zero_size_var_names) and (
@@ -1150,6 +1184,20 @@ class PostTrainingQuantization:
                     self._get_hist_scaling_factor(hist, hist_edges)
                 )
 
+    def _calculate_mse_emd_threshold(self):
+        '''
+        Search the threshold of the min mse or emd loss of activations on
+        their histograms of all the batches.
+        '''
+        _logger.info(f"{self._algo.upper()} searching stage ...")
+        assert self._algo in ["mse", "emd"], "The algo should be mse or emd."
+        for var_name, hist in self._act_calibration_histogram.items():
+            threshold, loss = search_scale(
+                hist, self._activation_bits, self._onnx_format, self._algo
+            )
+            self._quantized_threshold[var_name] = threshold
+            self._best_calibration_loss[var_name] = loss
+
     def _update_program(self):
         '''
         Use QuantizationTransformPass and AddQuantDequantPass to insert
@@ -1500,6 +1548,7 @@ class PostTrainingQuantizationProgram(PostTrainingQuantization):
         cache_dir=None,
         scale_dict=None,
         return_graph=True,
+        num_workers=1,
     ):
         super().__init__(
             executor,
@@ -1532,6 +1581,7 @@ class PostTrainingQuantizationProgram(PostTrainingQuantization):
             cache_dir,
             scale_dict,
             return_graph,
+            num_workers=num_workers,
         )
         self.FLAG = False
         self._program = program
@@ -38,8 +38,11 @@ if TYPE_CHECKING:
         '.webp',
     ]
 
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 from PIL import Image
 
 import paddle
@@ -48,6 +51,11 @@ from paddle.utils import try_import
 
 __all__ = []
 
+# The index is not reused if any directory was modified within this window
+# before the index was written, since a file added to it later within the
+# same timestamp granularity (1s on many network file systems) keeps its mtime.
+_RACY_MTIME_WINDOW_NS = 3 * 10**9
+
 
 def has_valid_extension(filename: str, extensions: Sequence[str]) -> bool:
     """Checks if a file is a valid extension.
@@ -66,8 +74,168 @@ def has_valid_extension(filename: str, extensions: Sequence[str]) -> bool:
     return filename.lower().endswith(extensions)
 
 
-def make_dataset(dir, class_to_idx, extensions, is_valid_file=None):
-    images = []
+def _walk_dir(dir, is_valid_file, recursive=True):
+    """
+    Walk dir and get the valid files under every directory in the sorted
+    order of the directories, and the mtimes of the directories.
+    """
+    entries = []
+    mtimes = []
+    for root, _, fnames in os.walk(dir, followlinks=True):
+        mtimes.append((root, os.stat(root).st_mtime_ns))
+        paths = [os.path.join(root, fname) for fname in sorted(fnames)]
+        entries.append((root, [path for path in paths if is_valid_file(path)]))
+        if not recursive:
+            break
+    entries.sort(key=lambda entry: entry[0])
+    return entries, mtimes
+
+
+def _load_index(index_path, key, num_workers):
+    """
+    Load the paths and labels from the index file saved by `_save_index`,
+    return None if the index is missing, built with other arguments, or
+    any directory scanned has been modified since. The index is not trusted
+    either if any directory was modified shortly before the index was
+    written, see `_RACY_MTIME_WINDOW_NS`.
+    """
+    try:
+        # the mtime of the index is got from the same file system clock as
+        # the directories, and before loading, so that it is never newer
+        # than the index loaded
+        index_mtime = os.stat(index_path).st_mtime_ns
+        with np.load(index_path) as index:
+            if index["key"].tobytes().decode("utf-8") != key:
+                return None
+            dirs = index["dirs"].tobytes().decode("utf-8").split("\0")
+            mtimes = index["mtimes"]
+            paths = index["paths"].tobytes().decode("utf-8")
+            labels = index["labels"]
+    except (OSError, KeyError, ValueError):
+        return None
+    if len(mtimes) > 0 and mtimes.max() > index_mtime - _RACY_MTIME_WINDOW_NS:
+        return None
+
+    def get_mtime(dir):
+        try:
+            return os.stat(dir).st_mtime_ns
+        except OSError:
+            return -1
+
+    # stat the directories in parallel on the network file systems
+    with ThreadPoolExecutor(num_workers) as pool:
+        current_mtimes = np.fromiter(
+            pool.map(get_mtime, dirs), dtype=np.int64, count=len(dirs)
+        )
+    if not np.array_equal(current_mtimes, mtimes):
+        return None
+    return paths.split("\0") if paths else [], labels
+
+
+def _save_index(index_path, key, paths, labels, mtimes):
+    def to_bytes(strings):
+        return np.frombuffer("\0".join(strings).encode("utf-8"), np.uint8)
+
+    # write to a temporary file and rename, so that the processes building
+    # the same dataset never read a partial index
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                key=to_bytes([key]),
+                dirs=to_bytes([dir for dir, _ in mtimes]),
+                mtimes=np.array([m for _, m in mtimes], dtype=np.int64),
+                paths=to_bytes(paths),
+                labels=np.asarray(labels, dtype=np.int64),
+            )
+        os.replace(tmp_path, index_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _scan(
+    dirs,
+    labels,
+    is_valid_file,
+    num_workers=None,
+    recursive=None,
+    sort_dirs=False,
+    index_path=None,
+    index_key=None,
+):
+    """
+    Walk the directories in parallel threads, get the valid files and
+    the labels of the directories they are in. The files are concatenated
+    in the order of dirs, or in the sorted order of all the subdirectories
+    if sort_dirs is True. Only the files directly under dirs[i] are got if
+    recursive[i] is False.
+
+    If index_path is set, the paths and labels are loaded from the index
+    when index_key matches and the mtimes of the directories are not
+    changed, otherwise they are saved to the index.
+    """
+    if index_path is not None:
+        index = _load_index(index_path, index_key, num_workers)
+        if index is not None:
+            return index
+
+    if recursive is None:
+        recursive = [True] * len(dirs)
+    with ThreadPoolExecutor(num_workers) as pool:
+        results = list(
+            pool.map(
+                lambda args: _walk_dir(args[0], is_valid_file, args[1]),
+                zip(dirs, recursive),
+            )
+        )
+
+    entries = []
+    all_mtimes = []
+    for label, (dir_entries, mtimes) in zip(labels, results):
+        entries.extend((root, label, paths) for root, paths in dir_entries)
+        all_mtimes.extend(mtimes)
+    if sort_dirs:
+        entries.sort(key=lambda entry: entry[0])
+    paths = [path for _, _, root_paths in entries for path in root_paths]
+    path_labels = np.repeat(
+        np.array([label for _, label, _ in entries], dtype=np.int64),
+        [len(root_paths) for _, _, root_paths in entries],
+    )
+
+    if index_path is not None:
+        _save_index(index_path, index_key, paths, path_labels, all_mtimes)
+    return paths, path_labels
+
+
+def _make_index_key(root, extensions, classes=None):
+    return json.dumps(
+        {
+            "root": os.path.abspath(root),
+            "extensions": sorted(x.lower() for x in extensions),
+            "classes": classes,
+        }
+    )
+
+
+def make_dataset(
+    dir,
+    class_to_idx,
+    extensions,
+    is_valid_file=None,
+    num_workers=None,
+    index_path=None,
+):
+    """
+    Get the (path, class_index) of the valid files under the class
+    directories of dir. The class directories are walked in parallel with
+    num_workers threads.
+
+    If index_path is set and extensions is not None, the samples are saved
+    to the index file, and loaded from it later if the directories are not
+    modified.
+    """
     dir = os.path.expanduser(dir)
 
     if extensions is not None:
@@ -75,18 +243,28 @@ def make_dataset(dir, class_to_idx, extensions, is_valid_file=None):
         def is_valid_file(x):
             return has_valid_extension(x, extensions)
 
-    for target in sorted(class_to_idx.keys()):
-        d = os.path.join(dir, target)
-        if not os.path.isdir(d):
-            continue
-        for root, _, fnames in sorted(os.walk(d, followlinks=True)):
-            for fname in sorted(fnames):
-                path = os.path.join(root, fname)
-                if is_valid_file(path):
-                    item = (path, class_to_idx[target])
-                    images.append(item)
+    else:
+        # the custom is_valid_file can not be identified in the index
+        index_path = None
 
-    return images
+    targets = [
+        target
+        for target in sorted(class_to_idx.keys())
+        if os.path.isdir(os.path.join(dir, target))
+    ]
+    paths, labels = _scan(
+        [os.path.join(dir, target) for target in targets],
+        [class_to_idx[target] for target in targets],
+        is_valid_file,
+        num_workers=num_workers,
+        index_path=index_path,
+        index_key=(
+            _make_index_key(dir, extensions, class_to_idx)
+            if index_path is not None
+            else None
+        ),
+    )
+    return list(zip(paths, labels.tolist()))
 
 
 class DatasetFolder(Dataset[Tuple["_ImageDataType", int]]):
@@ -114,6 +292,16 @@ class DatasetFolder(Dataset[Tuple["_ImageDataType", int]]):
         is_valid_file (Callable|None, optional): A function that takes path of a file
             and check if the file is a valid file. Both :attr:`extensions` and
             :attr:`is_valid_file` should not be passed. Default: None.
+        num_workers (int|None, optional): The number of threads walking the class
+            directories in parallel. Default: None, which uses the default of
+            ``concurrent.futures.ThreadPoolExecutor``.
+        index_path (str|None, optional): The path of the index file of the samples.
+            If set, the samples are saved to it, and loaded from it instead of
+            walking the directories when the classes, extensions and the mtimes
+            of all the directories are unchanged. The index is not reused if
+            any directory was modified within a few seconds before it was
+            written, since the files added later may keep the mtime.
+            Default: None.
 
     Returns:
         :ref:`api_paddle_io_Dataset`. An instance of DatasetFolder.
@@ -245,6 +433,8 @@ class DatasetFolder(Dataset[Tuple["_ImageDataType", int]]):
         extensions: Sequence[_AllowedExtensions] | None = None,
         transform: _Transform[Any, Any] | None = None,
         is_valid_file: _ImageDataType | None = None,
+        num_workers: int | None = None,
+        index_path: str | None = None,
     ) -> None:
         self.root = root
         self.transform = transform
@@ -252,7 +442,12 @@ class DatasetFolder(Dataset[Tuple["_ImageDataType", int]]):
             extensions = IMG_EXTENSIONS
         classes, class_to_idx = self._find_classes(self.root)
         samples = make_dataset(
-            self.root, class_to_idx, extensions, is_valid_file
+            self.root,
+            class_to_idx,
+            extensions,
+            is_valid_file,
+            num_workers=num_workers,
+            index_path=index_path,
         )
         if len(samples) == 0:
             raise (
@@ -362,6 +557,15 @@ class ImageFolder(Dataset[List["_ImageDataType"]]):
         is_valid_file (Callable|None, optional): A function that takes path of a file
             and check if the file is a valid file. Both :attr:`extensions` and
             :attr:`is_valid_file` should not be passed. Default: None.
+        num_workers (int|None, optional): The number of threads walking the
+            subdirectories of root in parallel. Default: None, which uses the
+            default of ``concurrent.futures.ThreadPoolExecutor``.
+        index_path (str|None, optional): The path of the index file of the samples.
+            If set, the samples are saved to it, and loaded from it instead of
+            walking the directories when the extensions and the mtimes of all
+            the directories are unchanged. The index is not reused if any
+            directory was modified within a few seconds before it was written,
+            since the files added later may keep the mtime. Default: None.
 
     Returns:
         :ref:`api_paddle_io_Dataset`. An instance of ImageFolder.
@@ -476,12 +680,13 @@ class ImageFolder(Dataset[List["_ImageDataType"]]):
         extensions: Sequence[_AllowedExtensions] | None = None,
         transform: _Transform[Any, Any] | None = None,
         is_valid_file: _ImageDataType | None = None,
+        num_workers: int | None = None,
+        index_path: str | None = None,
     ) -> None:
         self.root = root
         if extensions is None:
             extensions = IMG_EXTENSIONS
 
-        samples = []
         path = os.path.expanduser(root)
 
         if extensions is not None:
@@ -489,11 +694,25 @@ class ImageFolder(Dataset[List["_ImageDataType"]]):
             def is_valid_file(x):
                 return has_valid_extension(x, extensions)
 
-        for root, _, fnames in sorted(os.walk(path, followlinks=True)):
-            for fname in sorted(fnames):
-                f = os.path.join(root, fname)
-                if is_valid_file(f):
-                    samples.append(f)
+        # walk the files of root and every subdirectory in parallel, the
+        # files are sorted by the directories as a whole
+        dirs = [path]
+        if os.path.isdir(path):
+            dirs.extend(d.path for d in os.scandir(path) if d.is_dir())
+        samples, _ = _scan(
+            dirs,
+            [0] * len(dirs),
+            is_valid_file,
+            num_workers=num_workers,
+            recursive=[False] + [True] * (len(dirs) - 1),
+            sort_dirs=True,
+            index_path=index_path,
+            index_key=(
+                _make_index_key(path, extensions)
+                if index_path is not None
+                else None
+            ),
+        )
 
         if len(samples) == 0:
             raise (
@@ -0,0 +1,381 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# This file contains the packed record format of the datasets. A dataset is
+# split into shard files, the layout of a shard file is:
+#
+#   | magic (8 bytes) | record | record | ... | padding |
+#   | index (num_records x 3 int64: offset, size, label) | JSON metadata |
+#   | footer: index offset, num_records, metadata offset, metadata size
+#     (4 x uint64, little endian), magic (8 bytes) |
+#
+# The records are the encoded bytes of the samples, e.g. the JPEG files,
+# they are read by the offsets in the index through mmap.
+
+from __future__ import annotations
+
+import io
+import json
+import mmap
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Tuple
+
+import numpy as np
+from PIL import Image
+
+import paddle
+from paddle.io import Dataset
+from paddle.utils import try_import
+
+from .folder import IMG_EXTENSIONS, make_dataset
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from typing_extensions import Self
+
+    from paddle.vision.transforms.transforms import _Transform
+
+    from ..image import _ImageBackend, _ImageDataType
+
+__all__ = []
+
+_MAGIC = b"PDREC001"
+_FOOTER = struct.Struct("<QQQQ8s")
+_ALIGNMENT = 8
+RECORD_FILE_SUFFIX = ".rec"
+
+
+class RecordFileWriter:
+    """
+    Write the records of a shard file of the packed record format read by
+    :class:`RecordDataset`.
+
+    Args:
+        path (str): The path of the shard file.
+        metadata (dict|None, optional): The JSON serializable metadata of
+            the dataset, e.g. the class names. Default: None.
+
+    Examples:
+
+        .. code-block:: python
+
+            >>> from paddle.vision.datasets.record import RecordFileWriter
+
+            >>> with RecordFileWriter("data-00000.rec", {"classes": ["cat", "dog"]}) as writer:
+            ...     writer.write(b"encoded image 0", 0)
+            ...     writer.write(b"encoded image 1", 1)
+    """
+
+    def __init__(self, path: str, metadata: dict[str, Any] | None = None):
+        self.path = path
+        self.metadata = metadata or {}
+        self._file = open(path, "wb")
+        self._file.write(_MAGIC)
+        self._offset = len(_MAGIC)
+        self._index = []
+
+    def write(self, data: bytes, label: int = -1) -> None:
+        """
+        Write the encoded bytes of a sample and its label.
+        """
+        self._file.write(data)
+        self._index.append((self._offset, len(data), label))
+        self._offset += len(data)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def close(self) -> None:
+        """
+        Write the index and the footer, and close the file.
+        """
+        if self._file.closed:
+            return
+        padding = -self._offset % _ALIGNMENT
+        self._file.write(b"\0" * padding)
+        index_offset = self._offset + padding
+        index = np.array(self._index, dtype="<i8").reshape([-1, 3])
+        self._file.write(index.tobytes())
+        metadata = json.dumps(self.metadata).encode("utf-8")
+        metadata_offset = index_offset + index.nbytes
+        self._file.write(metadata)
+        self._file.write(
+            _FOOTER.pack(
+                index_offset,
+                len(self._index),
+                metadata_offset,
+                len(metadata),
+                _MAGIC,
+            )
+        )
+        self._file.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def _read_footer(path):
+    with open(path, "rb") as f:
+        f.seek(-_FOOTER.size, os.SEEK_END)
+        footer = _FOOTER.unpack(f.read(_FOOTER.size))
+        if footer[-1] != _MAGIC:
+            raise ValueError(f"{path} is not a record file.")
+        index_offset, num_records, metadata_offset, metadata_size, _ = footer
+        f.seek(metadata_offset)
+        metadata = json.loads(f.read(metadata_size).decode("utf-8"))
+    return index_offset, num_records, metadata
+
+
+def _decode_image(data, backend):
+    if backend == 'cv2':
+        cv2 = try_import('cv2')
+        image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    return Image.open(io.BytesIO(data)).convert('RGB')
+
+
+class RecordDataset(Dataset[Tuple["_ImageDataType", int]]):
+    """
+    A map-style dataset of the packed record files written by
+    :class:`RecordFileWriter` or :func:`convert_dataset_folder`. The shard
+    files are memory mapped, and a sample is read by its offset in the
+    index of the shard without any other file access.
+
+    The samples of the shards are concatenated in order, ``shard_ranges``
+    is the range of the indices of every shard, which is used by
+    ``paddle.io.DistributedBatchSampler(shard_aware=True)`` to read whole
+    shards in every rank.
+
+    Args:
+        paths (str|list[str]): The shard files, or a directory of the shard
+            files ending with ``.rec``, which are read in the sorted order.
+        loader (Callable|None, optional): A function to decode a sample from
+            its bytes. Default: None, which decodes an image by ``backend``.
+        transform (Callable|None, optional): A function/transform that takes in
+            a sample and returns a transformed version. Default: None.
+        backend (str|None, optional): Specifies which type of image to be returned:
+            PIL.Image or numpy.ndarray. Should be one of {'pil', 'cv2'}.
+            If this option is not set, will get backend from :ref:`paddle.vision.get_image_backend <api_paddle_vision_get_image_backend>`,
+            default backend is 'pil'. Default: None.
+
+    Returns:
+        :ref:`api_paddle_io_Dataset`. An instance of RecordDataset.
+
+    Attributes:
+        metadata (dict): The metadata of the first shard file.
+        classes (list[str]|None): The class names in the metadata.
+        shard_ranges (list[tuple[int, int]]): The [start, end) of the indices
+            of every shard.
+
+    Examples:
+
+        .. code-block:: python
+
+            >>> # doctest: +SKIP('depend on external files')
+            >>> from paddle.vision.datasets import RecordDataset
+            >>> from paddle.vision.datasets.record import convert_dataset_folder
+
+            >>> paths = convert_dataset_folder("./images", "./records", num_shards=8)
+            >>> dataset = RecordDataset("./records")
+            >>> image, label = dataset[0]
+    """
+
+    def __init__(
+        self,
+        paths: str | Sequence[str],
+        loader: Callable[[bytes], Any] | None = None,
+        transform: _Transform[Any, Any] | None = None,
+        backend: _ImageBackend | None = None,
+    ) -> None:
+        if isinstance(paths, str):
+            if os.path.isdir(paths):
+                paths = sorted(
+                    os.path.join(paths, name)
+                    for name in os.listdir(paths)
+                    if name.endswith(RECORD_FILE_SUFFIX)
+                )
+            else:
+                paths = [paths]
+        if len(paths) == 0:
+            raise RuntimeError("Found 0 record files.")
+        if backend is None:
+            backend = paddle.vision.get_image_backend()
+        if backend not in ['pil', 'cv2']:
+            raise ValueError(
+                f"Expected backend are one of ['pil', 'cv2'], but got {backend}"
+            )
+        self.paths = list(paths)
+        self.loader = loader
+        self.transform = transform
+        self.backend = backend
+
+        self._index_offsets = []
+        self.shard_ranges = []
+        start = 0
+        for i, path in enumerate(self.paths):
+            index_offset, num_records, metadata = _read_footer(path)
+            if i == 0:
+                self.metadata = metadata
+            self._index_offsets.append(index_offset)
+            self.shard_ranges.append((start, start + num_records))
+            start += num_records
+        self._starts = np.array([s for s, _ in self.shard_ranges])
+        self._num_samples = start
+        self.classes = self.metadata.get("classes")
+        self._mmaps = {}
+
+    def __getstate__(self):
+        # the mmaps are opened again in the DataLoader workers
+        state = self.__dict__.copy()
+        state["_mmaps"] = {}
+        return state
+
+    def _get_shard(self, shard_id):
+        if shard_id not in self._mmaps:
+            with open(self.paths[shard_id], "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            start, end = self.shard_ranges[shard_id]
+            index = np.frombuffer(
+                buffer,
+                dtype="<i8",
+                count=(end - start) * 3,
+                offset=self._index_offsets[shard_id],
+            ).reshape([-1, 3])
+            self._mmaps[shard_id] = (buffer, index)
+        return self._mmaps[shard_id]
+
+    def get_record(self, index: int) -> tuple[bytes, int]:
+        """
+        Get the encoded bytes and the label of a sample.
+        """
+        if index < 0:
+            index += self._num_samples
+        if not 0 <= index < self._num_samples:
+            raise IndexError(
+                f"index {index} is out of range of the dataset of size {self._num_samples}"
+            )
+        shard_id = int(np.searchsorted(self._starts, index, side="right")) - 1
+        buffer, shard_index = self._get_shard(shard_id)
+        offset, size, label = shard_index[
+            index - self.shard_ranges[shard_id][0]
+        ]
+        return buffer[offset : offset + size], int(label)
+
+    @property
+    def targets(self) -> list[int]:
+        """
+        The labels of all the samples.
+        """
+        return np.concatenate(
+            [
+                self._get_shard(shard_id)[1][:, 2]
+                for shard_id in range(len(self.paths))
+            ]
+        ).tolist()
+
+    def __getitem__(self, index: int) -> tuple[_ImageDataType, int]:
+        data, label = self.get_record(index)
+        if self.loader is not None:
+            sample = self.loader(data)
+        else:
+            sample = _decode_image(data, self.backend)
+        if self.transform is not None:
+            sample = self.transform(sample)
+        return sample, label
+
+    def __len__(self) -> int:
+        return self._num_samples
+
+
+def _read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def convert_dataset_folder(
+    root: str,
+    output_dir: str,
+    num_shards: int = 1,
+    extensions: Sequence[str] | None = None,
+    shuffle: bool = True,
+    seed: int = 0,
+    num_workers: int | None = None,
+    prefix: str = "data",
+) -> list[str]:
+    """
+    Convert the files of a :class:`DatasetFolder` tree into the shard files
+    of the packed record format, the bytes of the files are stored as they
+    are and the labels are the class indices of DatasetFolder.
+
+    Args:
+        root (str): Root directory path of the DatasetFolder.
+        output_dir (str): The directory of the shard files.
+        num_shards (int, optional): The number of the shard files, the
+            samples are split into shards of almost equal sizes. Default: 1.
+        extensions (list[str]|tuple[str]|None, optional): A list of allowed
+            extensions. Default: None, which uses the image extensions of
+            DatasetFolder.
+        shuffle (bool, optional): Whether to shuffle the samples before they
+            are split, so that every shard holds the samples of all the
+            classes. Default: True.
+        seed (int, optional): The random seed of shuffle. Default: 0.
+        num_workers (int|None, optional): The number of threads walking the
+            directories and reading the files. Default: None.
+        prefix (str, optional): The prefix of the names of the shard files.
+            Default: "data".
+
+    Returns:
+        list[str]: The paths of the shard files.
+    """
+    assert num_shards > 0, "num_shards should be positive."
+    if extensions is None:
+        extensions = IMG_EXTENSIONS
+    classes = sorted(d.name for d in os.scandir(root) if d.is_dir())
+    class_to_idx = {name: i for i, name in enumerate(classes)}
+    samples = make_dataset(
+        root, class_to_idx, extensions, num_workers=num_workers
+    )
+    if len(samples) == 0:
+        raise RuntimeError(f"Found 0 files in subfolders of: {root}")
+    if shuffle:
+        order = np.random.RandomState(seed).permutation(len(samples))
+        samples = [samples[i] for i in order]
+
+    os.makedirs(output_dir, exist_ok=True)
+    metadata = {"classes": classes}
+    bounds = np.linspace(0, len(samples), num_shards + 1).astype(np.int64)
+    paths = []
+    # the max number of files read ahead of writing
+    chunk_size = 256
+    with ThreadPoolExecutor(num_workers) as pool:
+        for shard_id in range(num_shards):
+            path = os.path.join(
+                output_dir,
+                f"{prefix}-{shard_id:05d}-of-{num_shards:05d}{RECORD_FILE_SUFFIX}",
+            )
+            shard_samples = samples[bounds[shard_id] : bounds[shard_id + 1]]
+            with RecordFileWriter(path, metadata) as writer:
+                for start in range(0, len(shard_samples), chunk_size):
+                    chunk = shard_samples[start : start + chunk_size]
+                    datas = pool.map(_read_file, [p for p, _ in chunk])
+                    for data, (_, label) in zip(datas, chunk):
+                        writer.write(data, label)
+            paths.append(path)
+    return paths
@@ -21,7 +21,13 @@ import numpy as np
 
 import paddle
 import paddle.distributed as dist
+from paddle.distributed.checkpoint.incremental import compact_checkpoint
 from paddle.distributed.checkpoint.load_state_dict import get_checkpoint_files
+from paddle.distributed.checkpoint.metadata import LocalTensorIndex
+from paddle.distributed.checkpoint.stream_storage import (
+    ChunkPrefetcher,
+    mmap_local_tensors,
+)
 from paddle.distributed.checkpoint.utils import (
     flatten_state_dict,
     unflatten_state_dict,
@@ -188,6 +194,175 @@ class TestDistCheckpointUtils(test_base.CommunicationTestDistBase):
 
         ckpt_dir_tmp.cleanup()
 
+    def test_stream_save_load(self):
+        ckpt_dir_tmp = tempfile.TemporaryDirectory()
+        ckpt_dir = ckpt_dir_tmp.name
+        state_dict = {
+            "w1": paddle.rand([33, 17]),
+            "w2": paddle.arange(7, dtype="int64"),
+            "w3": paddle.to_tensor(1.5),
+        }
+        # a small buffer splits the tensors into many chunks
+        dist.save_state_dict(
+            state_dict,
+            ckpt_dir,
+            stream_save=True,
+            stream_buffer_size=256,
+            num_io_threads=2,
+        )
+
+        metadata = paddle.load(os.path.join(ckpt_dir, "0.metadata"))
+        self.assertEqual(len(metadata.storage_offsets), 3)
+        for storage_info in metadata.storage_offsets.values():
+            self.assertEqual(storage_info.offset % 64, 0)
+
+        new_state_dict = {
+            "w1": paddle.zeros([33, 17]),
+            "w2": paddle.zeros([7], dtype="int64"),
+            "w3": paddle.to_tensor(0.0),
+        }
+        dist.load_state_dict(new_state_dict, ckpt_dir)
+        for key, value in state_dict.items():
+            np.testing.assert_equal(new_state_dict[key].numpy(), value.numpy())
+
+        ckpt_dir_tmp.cleanup()
+
+    def test_stream_load_chunk(self):
+        ckpt_dir_tmp = tempfile.TemporaryDirectory()
+        ckpt_dir = ckpt_dir_tmp.name
+        w1 = paddle.rand([16, 8])
+        dist.save_state_dict({"w1": w1}, ckpt_dir, stream_save=True)
+
+        metadata = paddle.load(os.path.join(ckpt_dir, "0.metadata"))
+        mapped = mmap_local_tensors(ckpt_dir, "0_0.distcp", [metadata])
+        self.assertIsInstance(mapped["w1"], np.memmap)
+        prefetcher = ChunkPrefetcher(
+            [
+                (mapped["w1"], (4, 2), (8, 3)),
+                None,
+                (mapped["w1"], (0, 0), (16, 8)),
+            ],
+            num_io_threads=2,
+            window=1,
+        )
+        np.testing.assert_equal(prefetcher.get(0), w1.numpy()[4:12, 2:5])
+        np.testing.assert_equal(prefetcher.get(2), w1.numpy())
+        prefetcher.shutdown()
+
+        ckpt_dir_tmp.cleanup()
+
+    def test_incremental_save_load(self):
+        for stream_save in [False, True]:
+            ckpt_dir_tmp = tempfile.TemporaryDirectory()
+            ckpt_dir = ckpt_dir_tmp.name
+            state_dict = {
+                "w1": paddle.rand([8, 4]),
+                "w2": paddle.rand([16]),
+            }
+            dist.save_state_dict(
+                state_dict,
+                ckpt_dir,
+                unique_id=0,
+                stream_save=stream_save,
+                incremental=True,
+            )
+            state_dict["w2"] = state_dict["w2"] + 1
+            dist.save_state_dict(
+                state_dict,
+                ckpt_dir,
+                unique_id=1,
+                stream_save=stream_save,
+                incremental=True,
+            )
+
+            metadata = paddle.load(os.path.join(ckpt_dir, "1.metadata"))
+            self.assertEqual(
+                metadata.storage_metadata[LocalTensorIndex("w1", (0, 0))],
+                "0_0.distcp",
+            )
+            self.assertEqual(
+                metadata.storage_metadata[LocalTensorIndex("w2", (0,))],
+                "0_1.distcp",
+            )
+
+            def check_load():
+                new_state_dict = {
+                    "w1": paddle.zeros([8, 4]),
+                    "w2": paddle.zeros([16]),
+                }
+                dist.load_state_dict(new_state_dict, ckpt_dir, unique_id=1)
+                for key, value in state_dict.items():
+                    np.testing.assert_equal(
+                        new_state_dict[key].numpy(), value.numpy()
+                    )
+
+            check_load()
+
+            compact_checkpoint(ckpt_dir, unique_id=1)
+            metadata = paddle.load(os.path.join(ckpt_dir, "1.metadata"))
+            self.assertEqual(
+                set(metadata.storage_metadata.values()),
+                {"0_1.compact.distcp"},
+            )
+            os.remove(os.path.join(ckpt_dir, "0.metadata"))
+            os.remove(os.path.join(ckpt_dir, "0_0.distcp"))
+            check_load()
+
+            ckpt_dir_tmp.cleanup()
+
+    def test_incremental_compact_chain(self):
+        for stream_save in [False, True]:
+            ckpt_dir_tmp = tempfile.TemporaryDirectory()
+            ckpt_dir = ckpt_dir_tmp.name
+            state_dict = {
+                "w1": paddle.rand([8, 4]),
+                "w2": paddle.rand([16]),
+                "w3": paddle.rand([4, 4]),
+            }
+            # the default unique ids are 0, 1 and 2
+            for key in [None, "w2", "w3"]:
+                if key is not None:
+                    state_dict[key] = state_dict[key] + 1
+                dist.save_state_dict(
+                    state_dict,
+                    ckpt_dir,
+                    stream_save=stream_save,
+                    incremental=True,
+                )
+            metadata = paddle.load(os.path.join(ckpt_dir, "2.metadata"))
+            self.assertEqual(
+                [
+                    metadata.storage_metadata[LocalTensorIndex(key, offset)]
+                    for key, offset in [
+                        ("w1", (0, 0)),
+                        ("w2", (0,)),
+                        ("w3", (0, 0)),
+                    ]
+                ],
+                ["0_0.distcp", "0_1.distcp", "0_2.distcp"],
+            )
+
+            # the files referenced by the checkpoint 2 are not rewritten
+            compact_checkpoint(ckpt_dir, unique_id=1)
+            new_state_dict = {
+                key: paddle.zeros_like(value)
+                for key, value in state_dict.items()
+            }
+            dist.load_state_dict(new_state_dict, ckpt_dir)
+            for key, value in state_dict.items():
+                np.testing.assert_equal(
+                    new_state_dict[key].numpy(), value.numpy()
+                )
+
+            compact_checkpoint(ckpt_dir)
+            metadata = paddle.load(os.path.join(ckpt_dir, "2.metadata"))
+            self.assertEqual(
+                set(metadata.storage_metadata.values()),
+                {"0_2.compact.distcp"},
+            )
+
+            ckpt_dir_tmp.cleanup()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -16,6 +16,9 @@ import legacy_test.test_collective_api_base as test_base
 
 import paddle
 from paddle import base
+from paddle.distributed.communication.all_gather import (
+    all_gather_object_batch,
+)
 
 
 class TestCollectiveAllgatherObjectAPI(test_base.TestCollectiveAPIRunnerBase):
@@ -26,6 +29,13 @@ class TestCollectiveAllgatherObjectAPI(test_base.TestCollectiveAPIRunnerBase):
         with base.program_guard(main_prog, startup_program):
             object_list = []
             paddle.distributed.all_gather_object(object_list, indata)
+            # the batched objects are gathered in the same order
+            for tree in [False, True]:
+                batch_object_list, rank_list = all_gather_object_batch(
+                    [indata, rank], tree=tree
+                )
+                assert batch_object_list == object_list
+                assert rank_list == list(range(len(object_list)))
             return object_list
 
 
@@ -0,0 +1,122 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+from dygraph_to_static_utils import (
+    Dy2StTestBase,
+    test_ast_only,
+    test_sot_only,
+)
+
+import paddle
+from paddle.jit.dy2static.shape_bucket import ShapeBucketPolicy
+
+
+def masked_sum(ids, mask, scale):
+    return (ids * mask).sum(axis=1) * scale
+
+
+class TestShapeBucketPolicy(unittest.TestCase):
+    def test_bucket_size(self):
+        policy = ShapeBucketPolicy()
+        self.assertEqual(
+            [policy.bucket_size(size) for size in [0, 1, 3, 4, 5, 100]],
+            [0, 1, 4, 4, 8, 128],
+        )
+        policy = ShapeBucketPolicy(min_size=16)
+        self.assertEqual(policy.bucket_size(3), 16)
+        policy = ShapeBucketPolicy(boundaries=[64, 16, 32])
+        self.assertEqual(
+            [policy.bucket_size(size) for size in [1, 16, 17, 64, 65]],
+            [16, 16, 32, 64, 65],
+        )
+        with self.assertRaises(ValueError):
+            ShapeBucketPolicy(boundaries=[0, 8])
+        with self.assertRaises(ValueError):
+            ShapeBucketPolicy(axes=-1)
+
+
+class TestShapeBucket(Dy2StTestBase):
+    def run_seq_lens(self, static_fn, seq_lens):
+        for seq_len in seq_lens:
+            ids = paddle.randint(1, 100, [4, seq_len])
+            mask = paddle.ones_like(ids)
+            scale = paddle.to_tensor([2])
+            np.testing.assert_array_equal(
+                static_fn(ids, mask, scale=scale).numpy(),
+                masked_sum(ids, mask, scale).numpy(),
+            )
+
+    @test_ast_only
+    def test_bucketing(self):
+        policy = ShapeBucketPolicy(axes=1, boundaries=[8, 16, 32])
+        static_fn = paddle.jit.to_static(masked_sum, shape_bucket=policy)
+        self.run_seq_lens(static_fn, [3, 5, 8, 9, 12, 16, 20])
+        self.assertEqual(static_fn.get_traced_count(), 3)
+        stats = policy.stats()
+        self.assertEqual(list(stats.keys()), [(8, 8), (16, 16), (32, 32)])
+        self.assertEqual(
+            [(s["calls"], s["traces"]) for s in stats.values()],
+            [(3, 1), (3, 1), (1, 1)],
+        )
+        # 2 * 4 * (5 + 3 + 0)
+        self.assertEqual(stats[(8, 8)]["padded_numel"], 64)
+        self.assertEqual(stats[(8, 8)]["numel"], 3 * 2 * 4 * 8)
+
+    @test_ast_only
+    def test_max_programs(self):
+        policy = ShapeBucketPolicy(input_names=["ids", "mask"], max_programs=2)
+        static_fn = paddle.jit.to_static(masked_sum, shape_bucket=policy)
+        self.run_seq_lens(static_fn, [3, 7, 15, 4])
+        self.assertEqual(static_fn.get_traced_count(), 2)
+        stats = policy.stats()
+        # the program of bucket 4 is evicted by bucket 16
+        self.assertEqual(stats[(4, 4)]["traces"], 2)
+        self.assertEqual(stats[(8, 8)]["traces"], 1)
+        self.assertEqual(stats[(16, 16)]["traces"], 1)
+
+    @test_sot_only
+    def test_sot(self):
+        policy = ShapeBucketPolicy(axes=1, boundaries=[8, 16, 32])
+        static_fn = paddle.jit.to_static(masked_sum, shape_bucket=policy)
+        self.run_seq_lens(static_fn, [3, 5, 8])
+        # the padded inputs hit the code translated by SOT
+        stats = policy.stats()
+        self.assertEqual(list(stats.keys()), [(8, 8)])
+        self.assertEqual(
+            (stats[(8, 8)]["calls"], stats[(8, 8)]["traces"]), (3, 1)
+        )
+
+        # the programs are not bounded by SOT
+        policy = ShapeBucketPolicy(max_programs=2)
+        with self.assertWarns(UserWarning):
+            paddle.jit.to_static(masked_sum, shape_bucket=policy)
+
+    def test_padding(self):
+        policy = ShapeBucketPolicy()
+        static_fn = paddle.jit.to_static(masked_sum, shape_bucket=policy)
+        ids = paddle.randint(1, 100, [2, 5])
+        ids.stop_gradient = True
+        mask = paddle.ones([2, 5], dtype="float32")
+        mask.stop_gradient = False
+        out = static_fn(ids.astype("float32"), mask, paddle.to_tensor(1.0))
+        out.sum().backward()
+        np.testing.assert_array_equal(mask.grad.shape, [2, 5])
+        self.assertEqual(list(policy.stats().keys()), [(8, 8)])
+
+
+if __name__ == '__main__':
+    unittest.main()
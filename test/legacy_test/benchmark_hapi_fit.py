@@ -0,0 +1,115 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Compare the throughput of paddle.Model.fit with and without
+# deferred_metrics, e.g.
+#
+#   python benchmark_hapi_fit.py --device gpu --steps 500 --log_freq 50
+
+import argparse
+import time
+
+import numpy as np
+
+import paddle
+from paddle.io import Dataset
+from paddle.metric import Accuracy
+from paddle.nn import CrossEntropyLoss
+from paddle.static import InputSpec
+
+
+class RandomDataset(Dataset):
+    def __init__(self, num_samples, dim, num_classes):
+        self.data = np.random.random([num_samples, dim]).astype('float32')
+        self.label = np.random.randint(0, num_classes, [num_samples, 1]).astype(
+            'int64'
+        )
+
+    def __getitem__(self, idx):
+        return self.data[idx], self.label[idx]
+
+    def __len__(self):
+        return len(self.data)
+
+
+def build_model(dim, hidden, num_classes):
+    net = paddle.nn.Sequential(
+        paddle.nn.Linear(dim, hidden),
+        paddle.nn.ReLU(),
+        paddle.nn.Linear(hidden, hidden),
+        paddle.nn.ReLU(),
+        paddle.nn.Linear(hidden, num_classes),
+    )
+    model = paddle.Model(
+        net,
+        [InputSpec([None, dim], 'float32', 'x')],
+        [InputSpec([None, 1], 'int64', 'label')],
+    )
+    model.prepare(
+        paddle.optimizer.Adam(parameters=net.parameters()),
+        CrossEntropyLoss(),
+        Accuracy(topk=(1, 5)),
+    )
+    return model
+
+
+def run(args, deferred):
+    paddle.seed(2024)
+    model = build_model(args.dim, args.hidden, args.num_classes)
+    dataset = RandomDataset(
+        args.steps * args.batch_size, args.dim, args.num_classes
+    )
+    loader = paddle.io.DataLoader(
+        dataset, batch_size=args.batch_size, shuffle=False, drop_last=True
+    )
+    # warm up
+    model.fit(loader, num_iters=10, verbose=0, deferred_metrics=deferred)
+
+    paddle.device.synchronize()
+    start = time.perf_counter()
+    model.fit(
+        loader,
+        epochs=1,
+        log_freq=args.log_freq,
+        verbose=args.verbose,
+        deferred_metrics=deferred,
+    )
+    paddle.device.synchronize()
+    return args.steps * args.batch_size / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the throughput of paddle.Model.fit.'
+    )
+    parser.add_argument('--device', type=str, default='gpu')
+    parser.add_argument('--steps', type=int, default=500)
+    parser.add_argument('--batch_size', type=int, default=256)
+    parser.add_argument('--log_freq', type=int, default=50)
+    parser.add_argument('--dim', type=int, default=512)
+    parser.add_argument('--hidden', type=int, default=1024)
+    parser.add_argument('--num_classes', type=int, default=100)
+    parser.add_argument('--verbose', type=int, default=0)
+    args = parser.parse_args()
+
+    paddle.set_device(args.device)
+    eager = run(args, deferred=False)
+    deferred = run(args, deferred=True)
+    print(f"eager metrics:    {eager:.1f} samples/s")
+    print(f"deferred metrics: {deferred:.1f} samples/s")
+    print(f"speedup:          {deferred / eager:.3f}x")
+
+
+if __name__ == '__main__':
+    main()
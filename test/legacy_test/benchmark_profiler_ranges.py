@@ -0,0 +1,62 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Time the interval algebra of the profiler statistics on the kernels of a
+# long synthetic trace, e.g.
+#
+#   python benchmark_profiler_ranges.py --num 1000000
+
+import argparse
+import time
+
+import numpy as np
+
+from paddle.profiler import statistic_helper
+
+
+def random_ranges(rng, num, span, max_length):
+    starts = rng.integers(0, span, num)
+    ends = starts + rng.integers(1, max_length + 1, num)
+    return statistic_helper.to_range_array(
+        list(zip(starts.tolist(), ends.tolist()))
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the interval algebra of profiler statistics.'
+    )
+    parser.add_argument('--num', type=int, default=1000000)
+    parser.add_argument('--span', type=int, default=10**12)
+    parser.add_argument('--max_length', type=int, default=10**5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(2024)
+    communication = random_ranges(rng, args.num, args.span, args.max_length)
+    computation = random_ranges(rng, args.num, args.span, args.max_length)
+
+    start_time = time.perf_counter()
+    communication = statistic_helper.merge_self_ranges(communication)
+    computation = statistic_helper.merge_self_ranges(computation)
+    statistic_helper.merge_ranges(communication, computation, True)
+    overlap = statistic_helper.intersection_ranges(
+        communication, computation, True
+    )
+    statistic_helper.subtract_ranges(communication, overlap, True)
+    cost = time.perf_counter() - start_time
+    print(f"interval algebra of {2 * args.num} ranges costs {cost:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
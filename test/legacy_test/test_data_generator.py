@@ -10,9 +10,14 @@
 # distributed under the License is distributed on an "AS IS" BASIS,
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
+import io
+import sys
 import unittest
 
+import numpy as np
+
 from paddle.distributed import fleet
+from paddle.distributed.fleet.data_generator import read_binary_records
 
 
 class MyMultiSlotDataGenerator(fleet.MultiSlotDataGenerator):
@@ -186,5 +191,81 @@ class TestMultiSlotDataGeneratorZip(unittest.TestCase):
         my_ms_dg.run_from_memory()
 
 
+class MyMultiSlotDataGenerator_numpy(fleet.MultiSlotDataGenerator):
+    def generate_sample(self, line):
+        def data_iter():
+            ids = np.array([int(x) for x in line.split()], dtype=np.int64)
+            yield ("words", ids), ("score", ids.astype(np.float32) / 2), (
+                "label",
+                [1],
+            )
+
+        return data_iter
+
+
+class TestMultiSlotDataGeneratorNumpy(unittest.TestCase):
+    def run_from_stdin(self, data_generator, lines):
+        stdin, stdout = sys.stdin, sys.stdout
+        sys.stdin = io.StringIO("".join(lines))
+        sys.stdout = io.TextIOWrapper(io.BytesIO())
+        try:
+            data_generator.run_from_stdin()
+            return sys.stdout.buffer.getvalue()
+        finally:
+            sys.stdin, sys.stdout = stdin, stdout
+
+    def test_text(self):
+        my_ms_dg = MyMultiSlotDataGenerator_numpy()
+        my_ms_dg.set_batch(2)
+        output = self.run_from_stdin(my_ms_dg, ["1 2 3\n", "4\n", "5 6\n"])
+        self.assertEqual(
+            output.decode().splitlines(),
+            [
+                "3 1 2 3 3 0.5 1.0 1.5 1 1",
+                "1 4 1 2.0 1 1",
+                "2 5 6 2 2.5 3.0 1 1",
+            ],
+        )
+        self.assertEqual(
+            my_ms_dg._proto_info,
+            [("words", "uint64"), ("score", "float"), ("label", "uint64")],
+        )
+
+    def test_binary(self):
+        my_ms_dg = MyMultiSlotDataGenerator_numpy()
+        my_ms_dg.set_batch(2)
+        my_ms_dg.set_output_format("binary")
+        lines = ["1 2 3\n", "4\n", "5 6\n"]
+        output = self.run_from_stdin(my_ms_dg, lines)
+        samples = list(read_binary_records(io.BytesIO(output)))
+        self.assertEqual(len(samples), 3)
+        for line, sample in zip(lines, samples):
+            ids = [int(x) for x in line.split()]
+            self.assertEqual(
+                [name for name, _ in sample], ["words", "score", "label"]
+            )
+            self.assertEqual(sample[0][1].dtype, np.uint64)
+            np.testing.assert_array_equal(sample[0][1], ids)
+            self.assertEqual(sample[1][1].dtype, np.float32)
+            np.testing.assert_array_equal(sample[1][1], np.array(ids) / 2)
+            np.testing.assert_array_equal(sample[2][1], [1])
+
+        with self.assertRaises(ValueError):
+            list(read_binary_records(io.BytesIO(output[:-1])))
+        with self.assertRaises(ValueError):
+            my_ms_dg.set_output_format("json")
+
+    def test_error(self):
+        my_ms_dg = MyMultiSlotDataGenerator_numpy()
+        with self.assertRaises(ValueError):
+            my_ms_dg._gen_str([("words", np.ones([2, 2]))])
+        with self.assertRaises(ValueError):
+            my_ms_dg._gen_str([("words", np.array(["a"]))])
+        with self.assertRaises(ValueError):
+            my_ms_dg._gen_str([("words", np.array([True, False]))])
+        with self.assertRaises(ValueError):
+            my_ms_dg._gen_bytes([[("words", np.array([], dtype=np.int64))]])
+
+
 if __name__ == '__main__':
     unittest.main()
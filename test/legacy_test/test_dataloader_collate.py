@@ -0,0 +1,93 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io.dataloader.collate import _SchemaCollateFn, default_collate_fn
+
+
+def make_batch(batch_size, image_dtype='float32'):
+    return [
+        {
+            'image': np.random.random([3, 4]).astype(image_dtype),
+            'label': i,
+            'name': f'sample_{i}',
+            'extra': (np.array([i, i + 1]), float(i)),
+        }
+        for i in range(batch_size)
+    ]
+
+
+class TestSchemaCollateFn(unittest.TestCase):
+    def assert_batch_equal(self, out, expect):
+        self.assertEqual(list(out.keys()), list(expect.keys()))
+        for key in ['image', 'label']:
+            self.assertEqual(out[key].dtype, expect[key].dtype)
+            np.testing.assert_array_equal(out[key], expect[key])
+        self.assertEqual(out['name'], expect['name'])
+        for o, e in zip(out['extra'], expect['extra']):
+            np.testing.assert_array_equal(o, e)
+
+    def test_same_as_default(self):
+        for reuse_buffers in [False, True]:
+            collate_fn = _SchemaCollateFn(reuse_buffers=reuse_buffers)
+            for batch_size in [16, 16, 5]:
+                batch = make_batch(batch_size)
+                self.assert_batch_equal(
+                    collate_fn(batch), default_collate_fn(batch)
+                )
+
+    def test_reuse_buffers(self):
+        collate_fn = _SchemaCollateFn(reuse_buffers=True)
+        out1 = collate_fn(make_batch(8))['image']
+        out2 = collate_fn(make_batch(8))['image']
+        self.assertIs(out1, out2)
+
+        collate_fn = _SchemaCollateFn(reuse_buffers=False)
+        out1 = collate_fn(make_batch(8))['image']
+        out2 = collate_fn(make_batch(8))['image']
+        self.assertIsNot(out1, out2)
+
+    def test_fallback(self):
+        collate_fn = _SchemaCollateFn(reuse_buffers=True)
+        collate_fn(make_batch(8))
+
+        # schema changed
+        batch = make_batch(8, 'float64')
+        self.assert_batch_equal(collate_fn(batch), default_collate_fn(batch))
+
+        # samples mismatch with the schema of the first sample
+        batch = make_batch(8)
+        batch[3]['image'] = batch[3]['image'].astype('float64')
+        self.assert_batch_equal(collate_fn(batch), default_collate_fn(batch))
+
+        batch = make_batch(8)
+        batch[3]['extra'] = (np.array([0, 1]),)
+        with self.assertRaises(RuntimeError):
+            collate_fn(batch)
+
+    def test_tensor(self):
+        paddle.disable_static()
+        batch = [paddle.to_tensor([i, i]) for i in range(4)]
+        out = _SchemaCollateFn()(batch)
+        np.testing.assert_array_equal(
+            out.numpy(), default_collate_fn(batch).numpy()
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,6 +15,7 @@
 import os
 import shutil
 import tempfile
+import time
 import unittest
 
 import cv2
@@ -71,6 +72,62 @@ class TestFolderDatasets(unittest.TestCase):
 
         assert len(loader) == 4
 
+    def set_dir_mtimes(self, mtime_ns):
+        for root, _, _ in os.walk(self.data_dir):
+            os.utime(root, ns=(mtime_ns, mtime_ns))
+
+    def add_image(self, class_dir, name):
+        # add an image without changing the mtime of the directory, like a
+        # file added within the same timestamp granularity
+        class_dir = os.path.join(self.data_dir, class_dir)
+        stat = os.stat(class_dir)
+        cv2.imwrite(
+            os.path.join(class_dir, name), np.zeros((32, 32, 3), dtype='uint8')
+        )
+        os.utime(class_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    def test_index(self):
+        index_path = os.path.join(self.empty_dir, 'index.npz')
+        self.set_dir_mtimes(time.time_ns() - 60 * 10**9)
+        dataset_folder = DatasetFolder(
+            self.data_dir, num_workers=2, index_path=index_path
+        )
+        self.assertTrue(os.path.exists(index_path))
+        cached_folder = DatasetFolder(self.data_dir, index_path=index_path)
+        self.assertEqual(cached_folder.samples, dataset_folder.samples)
+        self.assertEqual(cached_folder.targets, [0, 0, 1, 1])
+
+        # the index is reused while the mtimes of the directories are
+        # unchanged
+        self.add_image('class_1', '2.jpg')
+        cached_folder = DatasetFolder(self.data_dir, index_path=index_path)
+        self.assertEqual(len(cached_folder), 4)
+
+        # the index is rebuilt once a directory is modified
+        self.set_dir_mtimes(time.time_ns() - 30 * 10**9)
+        cached_folder = DatasetFolder(self.data_dir, index_path=index_path)
+        self.assertEqual(len(cached_folder), 5)
+        self.assertEqual(cached_folder.samples[-1][1], 1)
+
+        # the index of another kind of dataset is not reused
+        loader = ImageFolder(self.data_dir, index_path=index_path)
+        self.assertEqual(len(loader), 5)
+        self.assertEqual(
+            ImageFolder(self.data_dir, index_path=index_path).samples,
+            loader.samples,
+        )
+
+    def test_racy_index(self):
+        # the directories are modified right before the index is written
+        index_path = os.path.join(self.empty_dir, 'index.npz')
+        self.set_dir_mtimes(time.time_ns())
+        dataset_folder = DatasetFolder(self.data_dir, index_path=index_path)
+        self.assertEqual(len(dataset_folder), 4)
+        self.add_image('class_1', '2.jpg')
+        cached_folder = DatasetFolder(self.data_dir, index_path=index_path)
+        self.assertEqual(len(cached_folder), 5)
+        self.assertEqual(cached_folder.samples[-1][1], 1)
+
     def test_transform(self):
         def fake_transform(img):
             return img
@@ -17,6 +17,8 @@ import sys
 import time
 import unittest
 
+import numpy as np
+
 import paddle.reader
 
 __all__ = []
@@ -153,6 +155,54 @@ class TestXmap(unittest.TestCase):
                             self.assertEqual(e, mapper(idx))
 
 
+class TestXmapProcess(unittest.TestCase):
+    def setUp(self):
+        if sys.platform == 'win32':
+            self.skipTest('use_process is not supported on windows')
+
+    def test_xmap(self):
+        def mapper(x):
+            return np.full([x % 3 + 1, 8], x, dtype='float32')
+
+        for order in (True, False):
+            for process_num in (1, 4):
+                for size in (1, 16):
+                    reader = paddle.reader.xmap_readers(
+                        mapper,
+                        reader_creator_10(0),
+                        process_num,
+                        size,
+                        order,
+                        use_process=True,
+                        chunk_size=3,
+                    )
+                    for n in range(2):
+                        result = [int(x[0, 0]) for x in reader()]
+                        if not order:
+                            result.sort()
+                        self.assertEqual(result, list(range(10)))
+
+    def test_break(self):
+        reader = paddle.reader.xmap_readers(
+            lambda x: x, reader_creator_10(0), 2, 2, True, use_process=True
+        )
+        for x in reader():
+            break
+        self.assertEqual(list(reader()), list(range(10)))
+
+    def test_error(self):
+        def mapper(x):
+            if x == 5:
+                raise KeyError('mapper error')
+            return x
+
+        reader = paddle.reader.xmap_readers(
+            mapper, reader_creator_10(0), 2, 4, True, use_process=True
+        )
+        with self.assertRaises(RuntimeError):
+            list(reader())
+
+
 class TestMultiProcessReader(unittest.TestCase):
     def setup(self):
         self.samples = []
@@ -182,6 +232,20 @@ class TestMultiProcessReader(unittest.TestCase):
             self.reader_test(use_pipe=False)
             self.reader_test(use_pipe=True)
 
+    def test_shared_memory(self):
+        if sys.platform == 'win32':
+            return
+        self.setup()
+        results = []
+        for data in paddle.reader.multiprocess_reader(
+            [self.reader0, self.reader1, self.reader2],
+            queue_size=10,
+            use_shared_memory=True,
+            chunk_size=4,
+        )():
+            results.append(data)
+        self.assertEqual(sorted(self.samples), sorted(results))
+
 
 if __name__ == '__main__':
     unittest.main()
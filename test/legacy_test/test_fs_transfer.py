@@ -0,0 +1,194 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import stat
+import sys
+import tempfile
+import time
+import unittest
+
+from paddle.distributed.fleet.utils.fs import (
+    ExecuteError,
+    FSMetadataCache,
+    FSTransferEngine,
+    HDFSClient,
+    LocalFS,
+)
+
+# A fake `hadoop fs` running the commands used by FSTransferEngine on the
+# local file system, it logs every command to count the processes spawned.
+# The next `get` fails after copying its first file if `fail_get` exists.
+FAKE_HADOOP = '''#!{python}
+import os, shutil, sys, time
+
+args = sys.argv[2:]
+with open(os.path.join(os.path.dirname(__file__), "cmd.log"), "a") as f:
+    f.write(" ".join(args) + "\\n")
+cmd, args = args[0], [a for a in args[1:] if not a.startswith("-")]
+if cmd == "-test":
+    flag = sys.argv[3]
+    check = os.path.isdir if flag == "-d" else os.path.exists
+    sys.exit(0 if check(args[0]) else 1)
+if cmd == "-ls":
+    for name in sorted(os.listdir(args[0])):
+        path = os.path.join(args[0], name)
+        kind = "d" if os.path.isdir(path) else "-"
+        print(kind + "rw-r--r--", "-", "u", "g", 0, "2024-01-01", "00:00", path)
+elif cmd == "-mkdir":
+    for path in args:
+        os.makedirs(path, exist_ok=True)
+elif cmd in ("-put", "-get"):
+    fail_get = os.path.join(os.path.dirname(__file__), "fail_get")
+    for src in args[:-1]:
+        if cmd == "-get" and os.path.exists(os.path.join(args[-1], os.path.basename(src))):
+            sys.exit(1)
+        if not os.path.exists(src):
+            sys.exit(1)
+        shutil.copy(src, args[-1])
+        if cmd == "-get" and os.path.exists(fail_get):
+            os.remove(fail_get)
+            sys.exit(1)
+'''
+
+
+class TestFSTransferEngine(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.temp_dir.name, "src")
+        self.files = {}
+        for rel in ["a.bin", "b.bin", "sub/c.bin", "sub/deep/d.bin"]:
+            path = os.path.join(self.src, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(rel.encode() * 100)
+            self.files[rel] = rel.encode() * 100
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def check_dir(self, path):
+        for rel, data in self.files.items():
+            with open(os.path.join(path, rel), "rb") as f:
+                self.assertEqual(f.read(), data)
+
+    def check_transfer(self, fs):
+        engine = FSTransferEngine(fs, num_workers=4, batch_size=2)
+        remote = os.path.join(self.temp_dir.name, "remote")
+        metrics = engine.upload(self.src, remote)
+        self.check_dir(remote)
+        summary = metrics.summary()
+        self.assertEqual(summary["files"], 4)
+        self.assertEqual(
+            summary["bytes"], sum(len(v) for v in self.files.values())
+        )
+        self.assertEqual(summary["failed_commands"], 0)
+
+        # upload again to overwrite the remote files
+        engine.upload(self.src, remote)
+
+        local = os.path.join(self.temp_dir.name, "local")
+        metrics = engine.download(remote, local)
+        self.check_dir(local)
+        self.assertEqual(metrics.summary()["files"], 4)
+        # download again to overwrite the local files
+        metrics = engine.download(remote, local)
+        self.assertEqual(metrics.summary()["files"], 4)
+
+        engine.download(f"{remote}/sub/c.bin", local)
+        self.assertTrue(os.path.exists(os.path.join(local, "c.bin")))
+        return engine
+
+    def test_local_fs(self):
+        engine = self.check_transfer(LocalFS())
+        self.assertGreater(engine.cache.hits, 0)
+
+    def fake_hadoop(self):
+        hadoop_home = os.path.join(self.temp_dir.name, "hadoop")
+        hadoop_bin = os.path.join(hadoop_home, "bin", "hadoop")
+        os.makedirs(os.path.dirname(hadoop_bin))
+        with open(hadoop_bin, "w") as f:
+            f.write(FAKE_HADOOP.format(python=sys.executable))
+        os.chmod(hadoop_bin, os.stat(hadoop_bin).st_mode | stat.S_IEXEC)
+        fs = HDFSClient(hadoop_home, None, time_out=6 * 1000, sleep_inter=100)
+        return fs, os.path.join(hadoop_home, "bin")
+
+    def commands(self, hadoop_bin_dir):
+        with open(os.path.join(hadoop_bin_dir, "cmd.log")) as f:
+            return [line.split()[0] for line in f]
+
+    def test_fake_hadoop(self):
+        fs, hadoop_bin_dir = self.fake_hadoop()
+        self.check_transfer(fs)
+
+        commands = self.commands(hadoop_bin_dir)
+        # 3 puts of 4 files in 3 dirs and 2 mkdirs of 3 dirs per upload
+        self.assertEqual(commands.count("-put"), 6)
+        self.assertEqual(commands.count("-mkdir"), 4)
+
+    def test_fake_hadoop_retry(self):
+        fs, hadoop_bin_dir = self.fake_hadoop()
+        fs_paths = [
+            os.path.join(self.src, "a.bin"),
+            os.path.join(self.src, "b.bin"),
+        ]
+        local = os.path.join(self.temp_dir.name, "local")
+        os.makedirs(local)
+
+        # the files of a partial failed `get` are removed before retrying
+        open(os.path.join(hadoop_bin_dir, "fail_get"), "w").close()
+        fs.batch_download(fs_paths, local)
+        for name in ["a.bin", "b.bin"]:
+            with open(os.path.join(local, name), "rb") as f:
+                self.assertEqual(f.read(), self.files[name])
+        self.assertEqual(self.commands(hadoop_bin_dir).count("-get"), 2)
+
+        # the partial files are removed after the last failure
+        fs_paths[1] = os.path.join(self.src, "missing.bin")
+        with self.assertRaises(ExecuteError):
+            fs.batch_download(fs_paths, local, retry_times=1)
+        self.assertFalse(os.path.exists(os.path.join(local, "a.bin")))
+        self.assertEqual(self.commands(hadoop_bin_dir).count("-get"), 4)
+
+    def test_failure(self):
+        class FailedFS(LocalFS):
+            def batch_upload(self, local_paths, fs_dir):
+                raise ExecuteError("put")
+
+        engine = FSTransferEngine(FailedFS())
+        with self.assertRaises(ExecuteError):
+            engine.upload(self.src, os.path.join(self.temp_dir.name, "dst"))
+
+
+class TestFSMetadataCache(unittest.TestCase):
+    def test_cache(self):
+        cache = FSMetadataCache(ttl=100)
+        cache.put("ls", "/a/", (["b"], ["c"]))
+        self.assertEqual(cache.get("ls", "/a"), (["b"], ["c"]))
+        self.assertTrue(cache.get("dir", "/a/b"))
+        self.assertFalse(cache.get("dir", "/a/c"))
+        self.assertTrue(cache.get("exist", "/a/c"))
+        self.assertFalse(cache.get("exist", "/a/d"))
+        self.assertIsNone(cache.get("exist", "/e"))
+        cache.invalidate("/a/b")
+        self.assertIsNone(cache.get("ls", "/a"))
+
+        cache = FSMetadataCache(ttl=0.01)
+        cache.put("exist", "/a", True)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("exist", "/a"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.hapi.batching import DynamicBatcher, load_test
+from paddle.jit.dy2static.shape_bucket import ShapeBucketPolicy
+from paddle.static import InputSpec
+
+
+class SumNet(paddle.nn.Layer):
+    def forward(self, x):
+        return x.sum(axis=-1)
+
+
+class FailNet(paddle.nn.Layer):
+    def forward(self, x):
+        raise ValueError('predict failed')
+
+
+class TestDynamicBatcher(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static(paddle.CPUPlace())
+
+    def tearDown(self):
+        paddle.enable_static()
+
+    def test_batching(self):
+        net = paddle.nn.Linear(8, 3)
+        model = paddle.Model(net, [InputSpec([None, 8], 'float32', 'x')])
+        model.prepare()
+        data = np.random.random([40, 8]).astype('float32')
+        expected = model.predict_batch([data])[0]
+
+        with DynamicBatcher(model, max_batch_size=16, max_wait=0.01) as b:
+            futures = [b.submit(x) for x in data]
+            for future, out in zip(futures, expected):
+                np.testing.assert_allclose(future.result()[0], out, rtol=1e-5)
+
+            async def predict_all():
+                return await asyncio.gather(*[b.apredict(x) for x in data])
+
+            outputs = asyncio.run(predict_all())
+            for output, out in zip(outputs, expected):
+                np.testing.assert_allclose(output[0], out, rtol=1e-5)
+
+            result = load_test(b.predict, lambda i: data[i % 40], 100, 8)
+            self.assertGreater(result['requests_per_second'], 0)
+
+        summary = b.metrics.summary()
+        self.assertEqual(summary['requests'], 180)
+        self.assertLessEqual(summary['mean_batch_size'], 16)
+        self.assertLess(summary['batches'], 180)
+        with self.assertRaises(RuntimeError):
+            b.submit(data[0])
+
+    def test_shape_bucket(self):
+        model = paddle.Model(SumNet(), [InputSpec([None, None], 'float32')])
+        model.prepare()
+        policy = ShapeBucketPolicy(axes=1, boundaries=[4, 8])
+        with DynamicBatcher(model, max_wait=0.05, shape_bucket=policy) as b:
+            futures = [
+                b.submit(np.ones([n], dtype='float32')) for n in range(1, 9)
+            ]
+            for n, future in enumerate(futures, 1):
+                self.assertEqual(float(future.result()[0]), n)
+        summary = b.metrics.summary()
+        self.assertEqual(summary['batches'], 2)
+        self.assertGreater(summary['padding_ratio'], 0)
+
+    def test_errors(self):
+        model = paddle.Model(FailNet(), [InputSpec([None, 4], 'float32')])
+        model.prepare()
+        with self.assertRaises(ValueError):
+            DynamicBatcher(model, max_batch_size=0)
+        with DynamicBatcher(model) as b:
+            with self.assertRaises(ValueError):
+                b.predict(np.ones([4], dtype='float32'))
+        self.assertEqual(b.metrics.summary()['failed_batches'], 1)
+
+    def test_cancel(self):
+        model = paddle.Model(SumNet(), [InputSpec([None, 4], 'float32')])
+        model.prepare()
+        x = np.ones([4], dtype='float32')
+        with DynamicBatcher(model, max_wait=0.05) as b:
+            future = b.submit(x)
+            self.assertTrue(future.cancel())
+
+            async def predict_timeout():
+                with self.assertRaises(asyncio.TimeoutError):
+                    await asyncio.wait_for(b.apredict(x), 0.001)
+
+            asyncio.run(predict_timeout())
+            self.assertEqual(float(b.predict(x, timeout=10)[0]), 4)
+            self.assertTrue(b._thread.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import unittest
+
+from paddle.distributed.launch.utils.kv_client import KVClient
+from paddle.distributed.launch.utils.kv_server import (
+    KVServer,
+    KVStore,
+    load_test,
+)
+
+
+class TestKVStore(unittest.TestCase):
+    def test_prefix(self):
+        store = KVStore()
+        for key in ["/a/1", "/a/2", "/ab/1", "/b", "/a"]:
+            store.put(key, b"v")
+        self.assertEqual(list(store.get_prefix("/a/")), ["/a/1", "/a/2"])
+        self.assertEqual(len(store.get_prefix("/a")), 4)
+        self.assertTrue(store.delete("/a/1"))
+        self.assertFalse(store.delete("/a/1"))
+        self.assertEqual(list(store.get_prefix("/a/")), ["/a/2"])
+        self.assertEqual(len(store), 4)
+
+    def test_wait_prefix(self):
+        store = KVStore()
+        store.put("/a/1", b"v")
+        self.assertTrue(store.wait_prefix("/a/", 1, 0))
+        self.assertFalse(store.wait_prefix("/a/", 2, 0.01))
+        timer = threading.Timer(0.1, store.put, args=("/a/2", b"v"))
+        timer.start()
+        self.assertTrue(store.wait_prefix("/a/", 2, 10))
+        timer.join()
+
+
+class TestKVServer(unittest.TestCase):
+    def setUp(self):
+        self.server = KVServer(0)
+        self.server.start()
+        self.client = KVClient(f"127.0.0.1:{self.server.server_address[1]}")
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_wait_prefix(self):
+        self.assertTrue(self.client.wait_server_ready())
+        self.assertTrue(self.client.put("/peers/0", "x"))
+        self.assertIsNone(self.client.wait_prefix("/peers", 2, timeout=0.1))
+        timer = threading.Timer(0.1, self.client.put, args=("/peers/1", "y"))
+        timer.start()
+        self.assertEqual(
+            self.client.wait_prefix("/peers", 2, timeout=10),
+            {"/peers/0": "x", "/peers/1": "y"},
+        )
+        timer.join()
+        self.assertTrue(self.client.delete("/peers/0"))
+        self.assertEqual(self.client.get_prefix("/peers"), {"/peers/1": "y"})
+
+
+class TestLoadTest(unittest.TestCase):
+    def test_load_test(self):
+        _, num_failed = load_test(128)
+        self.assertEqual(num_failed, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
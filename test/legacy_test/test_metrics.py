@@ -296,5 +296,62 @@ class TestAuc(unittest.TestCase):
         self.assertEqual(m.accumulate(), 0.0)
 
 
+class TestMetricMerge(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(2024)
+        self.preds = np.random.random([1000, 1])
+        self.labels = np.random.randint(0, 2, [1000, 1])
+
+    def check_merge(self, metric_cls, preds, labels, **kwargs):
+        m = metric_cls(**kwargs)
+        m.update(preds, labels)
+
+        merged = metric_cls(**kwargs)
+        for i in range(0, 1000, 300):
+            part = metric_cls(**kwargs)
+            part.update(preds[i : i + 300], labels[i : i + 300])
+            merged.merge(part)
+        self.assertAlmostEqual(m.accumulate(), merged.accumulate())
+        return m.accumulate()
+
+    def test_precision(self):
+        r = self.check_merge(paddle.metric.Precision, self.preds, self.labels)
+        pred_pos = np.floor(self.preds + 0.5) == 1
+        self.assertAlmostEqual(
+            r, np.sum(pred_pos & (self.labels == 1)) / np.sum(pred_pos)
+        )
+
+    def test_recall(self):
+        r = self.check_merge(paddle.metric.Recall, self.preds, self.labels)
+        label_pos = self.labels == 1
+        self.assertAlmostEqual(
+            r,
+            np.sum(label_pos & (np.rint(self.preds) == 1)) / np.sum(label_pos),
+        )
+
+    def test_auc(self):
+        preds = np.concatenate([1 - self.preds, self.preds], axis=1)
+        self.check_merge(paddle.metric.Auc, preds, self.labels)
+
+        m = paddle.metric.Auc(num_thresholds=100)
+        with self.assertRaises(ValueError):
+            m.merge(paddle.metric.Auc())
+
+    def test_accuracy(self):
+        correct = np.random.randint(0, 2, [1000, 2]).astype('float32')
+        m = paddle.metric.Accuracy(topk=(1, 2))
+        m.update(correct)
+
+        merged = paddle.metric.Accuracy(topk=(1, 2))
+        for i in range(0, 1000, 300):
+            part = paddle.metric.Accuracy(topk=(1, 2))
+            part.update(correct[i : i + 300])
+            merged.merge(part)
+        np.testing.assert_allclose(m.accumulate(), merged.accumulate())
+
+        with self.assertRaises(ValueError):
+            merged.merge(paddle.metric.Accuracy(topk=(1,)))
+
+
 if __name__ == '__main__':
     unittest.main()
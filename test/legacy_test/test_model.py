@@ -975,6 +975,82 @@ class TestModelFunction(unittest.TestCase):
             np.testing.assert_almost_equal(losses[0], losses[1], decimal=4)
             np.testing.assert_almost_equal(losses[0], losses[2], decimal=4)
 
+    def test_deferred_metrics(self):
+        class EpochLogs(paddle.callbacks.Callback):
+            def __init__(self):
+                self.logs = []
+
+            def on_epoch_end(self, epoch, logs=None):
+                self.logs.append(dict(logs))
+
+        base.enable_dygraph(base.CPUPlace())
+        data = np.random.random(size=(50, 20)).astype(np.float32)
+        label = np.random.randint(0, 10, size=(50, 1)).astype(np.int64)
+        dataset = paddle.io.TensorDataset(
+            [paddle.to_tensor(data), paddle.to_tensor(label)]
+        )
+        inputs = [InputSpec([None, 20], 'float32', 'x')]
+        labels = [InputSpec([None, 1], 'int64', 'label')]
+
+        results = []
+        for deferred in [False, True]:
+            self.set_seed()
+            net = MyModel()
+            optim = paddle.optimizer.SGD(
+                learning_rate=0.01, parameters=net.parameters()
+            )
+            model = Model(net, inputs, labels)
+            model.prepare(
+                optim,
+                loss=CrossEntropyLoss(),
+                metrics=Accuracy(topk=(1, 2)),
+            )
+            callback = EpochLogs()
+            model.fit(
+                dataset,
+                batch_size=4,
+                epochs=2,
+                log_freq=3,
+                verbose=0,
+                shuffle=False,
+                callbacks=[callback],
+                deferred_metrics=deferred,
+            )
+            eval_result = model.evaluate(
+                dataset, batch_size=8, verbose=0, deferred_metrics=deferred
+            )
+            results.append((callback.logs, eval_result))
+
+        class RaiseOnBatchEnd(paddle.callbacks.Callback):
+            def on_train_batch_end(self, step, logs=None):
+                if step == 1:
+                    raise ValueError('stop')
+
+        # the deferred mode is left when a callback raises
+        with self.assertRaises(ValueError):
+            model.fit(
+                dataset,
+                batch_size=4,
+                log_freq=3,
+                verbose=0,
+                callbacks=[RaiseOnBatchEnd()],
+                deferred_metrics=True,
+            )
+        self.assertFalse(model._adapter._deferred)
+        self.assertEqual(model._adapter._pending_metric_outs, [])
+        outs = model.train_batch([data[:4]], [label[:4]])
+        self.assertIsInstance(outs[0][0], np.ndarray)
+        base.disable_dygraph()
+
+        for logs, deferred_logs in zip(results[0][0], results[1][0]):
+            self.assertEqual(logs['step'], deferred_logs['step'])
+            np.testing.assert_allclose(logs['loss'], deferred_logs['loss'])
+            np.testing.assert_allclose(
+                logs['acc_top1'], deferred_logs['acc_top1']
+            )
+        for k, v in results[0][1].items():
+            np.testing.assert_allclose(v, results[1][1][k])
+
 
 class TestModelWithLRScheduler(unittest.TestCase):
     def test_fit_by_step(self):
@@ -0,0 +1,90 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import multiprocessing
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, Dataset
+from paddle.io.dataloader.shm_ring import _SharedMemoryRing
+
+SAMPLE_NUM = 64
+BATCH_SIZE = 8
+IMAGE_SIZE = 16
+
+
+class RandomDataset(Dataset):
+    def __getitem__(self, idx):
+        np.random.seed(idx)
+        image = np.random.random([IMAGE_SIZE]).astype('float32')
+        label = np.array([idx]).astype('int64')
+        return {'image': image, 'label': label, 'name': 'sample'}
+
+    def __len__(self):
+        return SAMPLE_NUM
+
+
+class TestSharedMemoryRing(unittest.TestCase):
+    def test_write_read(self):
+        ring = _SharedMemoryRing(2, 1024, multiprocessing.Queue())
+        try:
+            arrays = [
+                np.arange(12, dtype='float32').reshape([3, 4]),
+                np.array(7, dtype='int64'),
+            ]
+            self.assertTrue(ring.fits(arrays))
+            self.assertFalse(ring.fits([np.zeros([1024], dtype='float32')]))
+            self.assertFalse(ring.fits([np.array(['a'], dtype=object)]))
+
+            slot_id = ring.acquire()
+            metas = ring.write(slot_id, arrays)
+            outs = ring.read(slot_id, metas)
+            for arr, out in zip(arrays, outs):
+                np.testing.assert_array_equal(arr, out)
+            del outs
+            ring.release(slot_id)
+        finally:
+            ring.close()
+
+
+class TestDataLoaderWithShmRing(unittest.TestCase):
+    def run_loader(self, num_workers, shm_ring_size, shm_ring_slot_size):
+        paddle.disable_static()
+        loader = DataLoader(
+            RandomDataset(),
+            batch_size=BATCH_SIZE,
+            num_workers=num_workers,
+            shm_ring_size=shm_ring_size,
+            shm_ring_slot_size=shm_ring_slot_size,
+        )
+        images, labels = [], []
+        for data in loader:
+            self.assertEqual(data['name'], ['sample'] * BATCH_SIZE)
+            images.append(data['image'].numpy())
+            labels.append(data['label'].numpy())
+        return np.concatenate(images), np.concatenate(labels)
+
+    def test_main(self):
+        expect_image, expect_label = self.run_loader(0, 0, 1024)
+        # slot_size 64 is less than a batch, all batches fallback to queue
+        for shm_ring_size, shm_ring_slot_size in [(2, 1 << 20), (1, 64)]:
+            image, label = self.run_loader(2, shm_ring_size, shm_ring_slot_size)
+            np.testing.assert_allclose(image, expect_image)
+            np.testing.assert_array_equal(label, expect_label)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -23,6 +23,7 @@ import paddle.nn.functional as F
 from paddle import nn, profiler
 from paddle.io import DataLoader, Dataset
 from paddle.profiler import utils
+from paddle.profiler.timer import benchmark
 
 
 class TestProfiler(unittest.TestCase):
@@ -414,5 +415,51 @@ class TestTimerOnly(unittest.TestCase):
         p.stop()
 
 
+class TestTelemetry(unittest.TestCase):
+    def test_telemetry(self):
+        telemetry = benchmark().telemetry
+        telemetry.reset()
+        dataset = RandomDataset(20 * 4)
+        simple_net = SimpleNet()
+        opt = paddle.optimizer.SGD(
+            learning_rate=1e-3, parameters=simple_net.parameters()
+        )
+        loader = DataLoader(dataset, batch_size=4, drop_last=True)
+        p = profiler.Profiler(timer_only=True)
+        p.start()
+        telemetry.enable(sample_interval=2, capacity=4)
+        for image, label in loader():
+            with telemetry.phase('forward'):
+                loss = F.cross_entropy(simple_net(image), label).mean()
+            with telemetry.phase('backward'):
+                loss.backward()
+            opt.step()
+            opt.clear_grad()
+            p.step()
+        p.stop()
+        telemetry.disable()
+
+        snapshot = telemetry.snapshot(recent=True)
+        self.assertEqual(snapshot['steps'], 20)
+        self.assertEqual(snapshot['sampled_steps'], 10)
+        for phase in ['reader', 'forward', 'backward', 'batch']:
+            self.assertEqual(snapshot[phase]['count'], 10)
+            self.assertEqual(len(snapshot[phase]['recent']), 4)
+            self.assertLessEqual(snapshot[phase]['p50'], snapshot[phase]['p99'])
+        self.assertGreaterEqual(
+            snapshot['batch']['total'], snapshot['forward']['total']
+        )
+
+        text = telemetry.to_prometheus()
+        self.assertIn('paddle_step_sampled_steps_total 10\n', text)
+        self.assertIn(
+            'paddle_step_phase_seconds_count{phase="forward"} 10\n', text
+        )
+        self.assertIn(
+            'paddle_step_phase_seconds{phase="batch",quantile="0.99"}', text
+        )
+        telemetry.reset()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -14,9 +14,29 @@
 
 import unittest
 
+import numpy as np
+
 from paddle.profiler import statistic_helper
 
 
+def random_ranges(rng, num, span, max_length):
+    starts = rng.integers(0, span, num)
+    return list(
+        zip(
+            starts.tolist(),
+            (starts + rng.integers(1, max_length + 1, num)).tolist(),
+        )
+    )
+
+
+def to_cells(ranges, span):
+    # the unit cells [t, t + 1) covered by the ranges
+    cells = np.zeros(span, dtype=bool)
+    for start, end in ranges:
+        cells[start:end] = True
+    return cells
+
+
 class TestStatisticHelper(unittest.TestCase):
     def test_sum_ranges_case1(self):
         src = [(1, 3), (4, 10), (11, 15)]
@@ -130,6 +150,76 @@ class TestStatisticHelper(unittest.TestCase):
         dst = statistic_helper.subtract_ranges(src1, src2)
         self.assertEqual(dst, [(10, 11)])
 
+    def test_random_ranges(self):
+        rng = np.random.default_rng(2024)
+        span = 200
+        for _ in range(200):
+            src1 = random_ranges(rng, rng.integers(0, 20), span - 10, 10)
+            src2 = random_ranges(rng, rng.integers(0, 20), span - 10, 10)
+            cells1 = to_cells(src1, span)
+            cells2 = to_cells(src2, span)
+            merged1 = statistic_helper.merge_self_ranges(src1)
+            merged2 = statistic_helper.merge_self_ranges(src2)
+            np.testing.assert_array_equal(to_cells(merged1, span), cells1)
+            for (_, end), (start, _) in zip(merged1[:-1], merged1[1:]):
+                self.assertLess(end, start)
+
+            for func, cells in [
+                (statistic_helper.merge_ranges, cells1 | cells2),
+                (statistic_helper.intersection_ranges, cells1 & cells2),
+                (statistic_helper.subtract_ranges, cells1 & ~cells2),
+            ]:
+                dst = func(src1, src2)
+                np.testing.assert_array_equal(to_cells(dst, span), cells)
+                self.assertEqual(
+                    statistic_helper.sum_ranges(dst), int(cells.sum())
+                )
+                self.assertEqual(func(merged1, merged2, True), dst)
+                # numpy arrays in, numpy array out
+                dst_array = func(
+                    statistic_helper.to_range_array(merged1),
+                    statistic_helper.to_range_array(merged2),
+                    True,
+                )
+                self.assertIsInstance(dst_array, np.ndarray)
+                self.assertEqual(
+                    [tuple(time_range) for time_range in dst_array.tolist()],
+                    dst,
+                )
+
+    def test_synthetic_trace(self):
+        # communication and computation kernels of a trace, see
+        # benchmark_profiler_ranges.py for the timing of a long trace
+        rng = np.random.default_rng(2024)
+        num = 10000
+        communication = statistic_helper.to_range_array(
+            random_ranges(rng, num, 10**10, 10**5)
+        )
+        computation = statistic_helper.to_range_array(
+            random_ranges(rng, num, 10**10, 10**5)
+        )
+        communication = statistic_helper.merge_self_ranges(communication)
+        computation = statistic_helper.merge_self_ranges(computation)
+        merged = statistic_helper.merge_ranges(communication, computation, True)
+        overlap = statistic_helper.intersection_ranges(
+            communication, computation, True
+        )
+        exclusive = statistic_helper.subtract_ranges(
+            communication, overlap, True
+        )
+
+        communication_time = statistic_helper.sum_ranges(communication)
+        computation_time = statistic_helper.sum_ranges(computation)
+        overlap_time = statistic_helper.sum_ranges(overlap)
+        self.assertEqual(
+            statistic_helper.sum_ranges(merged),
+            communication_time + computation_time - overlap_time,
+        )
+        self.assertEqual(
+            statistic_helper.sum_ranges(exclusive),
+            communication_time - overlap_time,
+        )
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,65 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+from paddle.distributed.communication.serialization_utils import (
+    SIZE_BYTES,
+    pack_objects,
+    pack_slot,
+    unpack_objects,
+    unpack_slot_size,
+)
+
+
+class TestPackObjects(unittest.TestCase):
+    def test_pack_unpack(self):
+        array = np.random.random([16, 8])
+        objs = [
+            {"a": [1, 2, 3], "b": None},
+            array,
+            array[:, ::2],
+            "x" * 100,
+        ]
+        packed = pack_objects(objs)
+        self.assertEqual(packed.dtype, np.uint8)
+        # the contiguous array is packed out of band without a copy in pickle
+        self.assertGreaterEqual(packed.size, array.nbytes)
+        unpacked = unpack_objects(packed)
+        self.assertEqual(unpacked[0], objs[0])
+        np.testing.assert_array_equal(unpacked[1], array)
+        np.testing.assert_array_equal(unpacked[2], array[:, ::2])
+        self.assertEqual(unpacked[3], objs[3])
+        self.assertEqual(unpack_objects(pack_objects([])), [])
+
+    def test_slot(self):
+        packed = pack_objects([list(range(100))])
+        for inline_size in [8, packed.size, packed.size + 10]:
+            slot = pack_slot(packed, inline_size)
+            self.assertEqual(slot.size, SIZE_BYTES + inline_size)
+            self.assertEqual(unpack_slot_size(slot), packed.size)
+            head = min(packed.size, inline_size)
+            np.testing.assert_array_equal(
+                slot[SIZE_BYTES : SIZE_BYTES + head], packed[:head]
+            )
+        # the packed objects are split into the slot and the rest bytes
+        slot = pack_slot(packed, 16)
+        merged = np.concatenate([slot[SIZE_BYTES:], packed[16:]])
+        self.assertEqual(unpack_objects(merged), [list(range(100))])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import os
+import tempfile
+import unittest
+from io import BytesIO
+
+import numpy as np
+
+import paddle
+from paddle.framework.stream_format import StreamFormatReader
+
+
+class TestSaveLoadStreamFormat(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "model.pdparams")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_state_dict(self):
+        layer = paddle.nn.Linear(8, 4)
+        adam = paddle.optimizer.Adam(parameters=layer.parameters())
+        layer(paddle.rand([2, 8])).mean().backward()
+        adam.step()
+        obj = {
+            "model": layer.state_dict(),
+            "opt": adam.state_dict(),
+            "epoch": 3,
+            "extra": (np.arange(5), [1.5, "a", None]),
+        }
+        paddle.save(obj, self.path, use_stream_format=True)
+
+        load_obj = paddle.load(self.path)
+        self.assertIsInstance(load_obj["model"], collections.OrderedDict)
+        for key, value in obj["model"].items():
+            np.testing.assert_array_equal(
+                load_obj["model"][key].numpy(), value.numpy()
+            )
+            self.assertEqual(load_obj["model"][key].name, value.name)
+        self.assertEqual(load_obj["epoch"], 3)
+        self.assertEqual(load_obj["extra"][1], [1.5, "a", None])
+        np.testing.assert_array_equal(
+            load_obj["extra"][0].numpy(), np.arange(5)
+        )
+
+        new_layer = paddle.nn.Linear(8, 4)
+        new_layer.set_state_dict(load_obj["model"])
+        new_adam = paddle.optimizer.Adam(parameters=new_layer.parameters())
+        new_adam.set_state_dict(load_obj["opt"])
+
+        load_obj = paddle.load(self.path, return_numpy=True)
+        self.assertIsInstance(load_obj["model"]["weight"], np.memmap)
+
+    def test_lazy_reader(self):
+        obj = {
+            "w": paddle.rand([33, 7]),
+            "b": paddle.to_tensor(1.0, dtype="bfloat16"),
+            "e": paddle.zeros([0, 3]),
+        }
+        paddle.save(obj, self.path, use_stream_format=True)
+        reader = StreamFormatReader(self.path)
+        self.assertEqual(reader.keys(), ["w", "b", "e"])
+        np.testing.assert_array_equal(
+            reader.get_tensor("w", return_numpy=True), obj["w"].numpy()
+        )
+        b = reader.get_tensor("b")
+        self.assertEqual(b.dtype, paddle.bfloat16)
+        self.assertEqual(b.shape, [])
+        self.assertEqual(reader.get_tensor("e").shape, [0, 3])
+        with self.assertRaises(KeyError):
+            reader.get_tensor("c")
+
+    def test_memory_buffer(self):
+        byio = BytesIO()
+        tensor = paddle.rand([3, 4])
+        paddle.save(tensor, byio, use_stream_format=True)
+        paddle.save({"a": 1}, byio, use_stream_format=True)
+        byio.seek(0)
+        np.testing.assert_array_equal(paddle.load(byio).numpy(), tensor.numpy())
+        self.assertEqual(paddle.load(byio), {"a": 1})
+
+    def test_unsupported(self):
+        with self.assertRaises(TypeError):
+            paddle.save(
+                {1: paddle.rand([1])}, self.path, use_stream_format=True
+            )
+        with self.assertRaises(TypeError):
+            paddle.save({"a": object()}, self.path, use_stream_format=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1044,6 +1044,106 @@ class TestProfilerStatistic(unittest.TestCase):
                 )
             )
 
+    def test_streaming_statistic(self):
+        def build_step_tree(step, conv2d_ns):
+            root_node = HostPythonNode(
+                'Root Node',
+                profiler.TracerEventType.UserDefined,
+                0,
+                float('inf'),
+                1000,
+                1001,
+            )
+            profilerstep_node = HostPythonNode(
+                f'ProfileStep#{step}',
+                profiler.TracerEventType.ProfileStep,
+                0,
+                1000,
+                1000,
+                1001,
+            )
+            mobilenet_node = HostPythonNode(
+                'MobileNet',
+                profiler.TracerEventType.Forward,
+                10,
+                500,
+                1000,
+                1001,
+            )
+            conv2d_node = HostPythonNode(
+                'conv2d',
+                profiler.TracerEventType.Operator,
+                20,
+                20 + conv2d_ns,
+                1000,
+                1001,
+            )
+            conv2d_launchkernel = HostPythonNode(
+                'cudalaunchkernel',
+                profiler.TracerEventType.CudaRuntime,
+                30,
+                40,
+                1000,
+                1001,
+            )
+            conv2d_kernel = DevicePythonNode(
+                'conv2d_kernel',
+                profiler.TracerEventType.Kernel,
+                50,
+                150,
+                0,
+                0,
+                0,
+            )
+            root_node.children_node.append(profilerstep_node)
+            profilerstep_node.children_node.append(mobilenet_node)
+            mobilenet_node.children_node.append(conv2d_node)
+            conv2d_node.runtime_node.append(conv2d_launchkernel)
+            conv2d_launchkernel.device_node.append(conv2d_kernel)
+            return {'thread1001': root_node}
+
+        statistic = profiler_statistic.StreamingStatistic()
+        for step in range(100):
+            statistic.fold(build_step_tree(step, 100 + step))
+
+        self.assertEqual(statistic.num_folds, 100)
+        conv2d_item = statistic.operator_items['conv2d']
+        self.assertEqual(conv2d_item.call, 100)
+        self.assertEqual(conv2d_item.cpu_time, sum(range(100, 200)))
+        self.assertEqual(conv2d_item.max_cpu_time, 199)
+        self.assertEqual(conv2d_item.min_cpu_time, 100)
+        self.assertEqual(conv2d_item.gpu_time, 100 * 100)
+        # the relative error of percentiles is within 1/16
+        self.assertAlmostEqual(
+            conv2d_item.cpu_histogram.percentile(50), 149.5, delta=149.5 / 16
+        )
+        self.assertAlmostEqual(
+            conv2d_item.cpu_histogram.percentile(99), 198, delta=198 / 16
+        )
+        self.assertEqual(statistic.layer_items['MobileNet'].call, 100)
+        self.assertEqual(statistic.kernel_items['conv2d_kernel'].call, 100)
+        self.assertEqual(
+            statistic.model_perspective_items['ProfileStep'].cpu_time,
+            100 * 1000,
+        )
+        self.assertEqual(statistic.model_perspective_items['Forward'].call, 100)
+
+        stat_dict = statistic.to_dict()
+        self.assertEqual(stat_dict['operator']['conv2d']['calls'], 100)
+        self.assertIn('cpu_p99', stat_dict['operator']['conv2d'])
+        for sort_key in profiler.SortedKeys:
+            table = profiler_statistic._build_streaming_table(
+                statistic, sorted_by=sort_key, time_unit='us'
+            )
+            self.assertIn('Operator Summary', table)
+
+        histogram = profiler_statistic.StreamingHistogram()
+        for value in [0, 1, 31, 32, 1 << 40, 1 << 60]:
+            histogram.add(value)
+        self.assertEqual(histogram.count, 6)
+        self.assertEqual(histogram.percentile(0), 0)
+        self.assertEqual(histogram.percentile(50), 31)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,113 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+
+from paddle.io import DistributedBatchSampler
+from paddle.vision.datasets import DatasetFolder, RecordDataset
+from paddle.vision.datasets.record import (
+    RecordFileWriter,
+    convert_dataset_folder,
+)
+
+
+class TestRecordDataset(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.record_dir = tempfile.mkdtemp()
+        for i in range(3):
+            sub_dir = os.path.join(self.data_dir, 'class_' + str(i))
+            os.makedirs(sub_dir)
+            for j in range(7):
+                fake_img = np.full((8, 16, 3), i * 10 + j, dtype='uint8')
+                cv2.imwrite(os.path.join(sub_dir, str(j) + '.png'), fake_img)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+        shutil.rmtree(self.record_dir)
+
+    def test_convert(self):
+        paths = convert_dataset_folder(
+            self.data_dir, self.record_dir, num_shards=4, num_workers=2
+        )
+        self.assertEqual(len(paths), 4)
+
+        dataset = RecordDataset(self.record_dir, backend='cv2')
+        folder = DatasetFolder(self.data_dir)
+        self.assertEqual(len(dataset), 21)
+        self.assertEqual(dataset.classes, folder.classes)
+        self.assertEqual(sorted(dataset.targets), sorted(folder.targets))
+        self.assertEqual(dataset.shard_ranges[-1][1], 21)
+
+        for i in range(len(dataset)):
+            image, label = dataset[i]
+            self.assertEqual(image.shape, (8, 16, 3))
+            self.assertEqual(label, dataset.targets[i])
+            self.assertEqual(int(image[0, 0, 0]) // 10, label)
+
+        image, _ = RecordDataset(paths, backend='pil')[-1]
+        self.assertEqual(np.array(image).shape, (8, 16, 3))
+
+        # the mmaps are not pickled
+        copied = pickle.loads(pickle.dumps(dataset))
+        np.testing.assert_array_equal(copied[5][0], dataset[5][0])
+
+        with self.assertRaises(IndexError):
+            dataset.get_record(21)
+
+    def test_writer(self):
+        path = os.path.join(self.record_dir, 'data.rec')
+        with RecordFileWriter(path, {'name': 'test'}) as writer:
+            for i in range(5):
+                writer.write(bytes([i]) * i, label=i)
+        empty_path = os.path.join(self.record_dir, 'empty.rec')
+        RecordFileWriter(empty_path).close()
+
+        dataset = RecordDataset([path, empty_path], loader=bytes)
+        self.assertEqual(dataset.metadata, {'name': 'test'})
+        self.assertEqual(dataset.shard_ranges, [(0, 5), (5, 5)])
+        for i in range(5):
+            self.assertEqual(dataset[i], (bytes([i]) * i, i))
+
+    def test_shard_aware_sampler(self):
+        convert_dataset_folder(self.data_dir, self.record_dir, num_shards=4)
+        dataset = RecordDataset(self.record_dir)
+        for nranks in [2, 3]:
+            indices = []
+            for rank in range(nranks):
+                sampler = DistributedBatchSampler(
+                    dataset,
+                    batch_size=4,
+                    num_replicas=nranks,
+                    rank=rank,
+                    shuffle=True,
+                    shard_aware=True,
+                )
+                batches = list(sampler)
+                self.assertEqual(len(batches), len(sampler))
+                rank_indices = [i for batch in batches for i in batch]
+                self.assertEqual(len(rank_indices), sampler.num_samples)
+                indices.extend(rank_indices)
+            self.assertEqual(set(indices), set(range(len(dataset))))
+
+
+if __name__ == '__main__':
+    unittest.main()
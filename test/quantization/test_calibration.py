@@ -0,0 +1,272 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.static.quantization import PostTrainingQuantization
+from paddle.static.quantization.cal_kl_threshold import (
+    cal_kl_threshold,
+    expand_quantized_bins,
+    safe_entropy,
+)
+from paddle.static.quantization.calibration import (
+    SCALE_RATES,
+    StreamingHistogram,
+    calibration_losses,
+    channel_abs_max,
+    channel_min_max,
+    search_scale,
+)
+
+
+def kl_threshold_reference(hist, bin_width, bits):
+    # the sequential search of the kl threshold
+    hist = hist.astype('float64').tolist()
+    hist_bins = len(hist)
+    quant_range = 2 ** (bits - 1) - 1
+    P_sum = sum(hist)
+    min_kl_divergence = 0
+    min_kl_index = 0
+    kl_inited = False
+    for i in range(quant_range, hist_bins + 1):
+        reference_distr_P = hist[0:i]
+        outliers_count = sum(hist[i:])
+        if reference_distr_P[i - 1] == 0:
+            continue
+        reference_distr_P[i - 1] += outliers_count
+        reference_distr_bins = reference_distr_P[:]
+        candidate_distr_Q = hist[0:i]
+        num_merged_bins = int(i / quant_range)
+        candidate_distr_Q_quantized = [0] * quant_range
+        j_start = 0
+        j_end = num_merged_bins
+        for idx in range(quant_range):
+            candidate_distr_Q_quantized[idx] = sum(
+                candidate_distr_Q[j_start:j_end]
+            )
+            j_start += num_merged_bins
+            j_end += num_merged_bins
+            if (idx + 1) == quant_range - 1:
+                j_end = i
+        candidate_distr_Q = expand_quantized_bins(
+            candidate_distr_Q_quantized, reference_distr_bins
+        )
+        Q_sum = sum(candidate_distr_Q)
+        kl_divergence = safe_entropy(
+            reference_distr_P, P_sum, candidate_distr_Q, Q_sum
+        )
+        if not kl_inited or kl_divergence < min_kl_divergence:
+            min_kl_divergence = kl_divergence
+            min_kl_index = i
+            kl_inited = True
+    return (min_kl_index + 0.5) * bin_width
+
+
+def exact_losses(values, scales, bits, onnx_format, algo):
+    bins = 2 ** (bits - 1) - 1
+    losses = []
+    for scale in scales:
+        if onnx_format:
+            quant = np.clip(np.round(values / scale * bins), -bins - 1, bins)
+        else:
+            quant = np.round(np.clip(values, 0.0, scale) / scale * bins)
+        quant = quant / bins * scale
+        if algo == "mse":
+            losses.append(((values - quant) ** 2).mean())
+        else:
+            losses.append(
+                np.abs(values.mean() - quant.mean())
+                + np.abs(values.std() - quant.std())
+            )
+    return np.array(losses)
+
+
+class TestKLThreshold(unittest.TestCase):
+    def test_kl_threshold(self):
+        rng = np.random.RandomState(2024)
+        for _ in range(5):
+            values = np.abs(rng.standard_normal(10000) * rng.uniform(1, 5))
+            hist, edges = np.histogram(values, bins=512)
+            bin_width = edges[1] - edges[0]
+            for bits in [4, 8]:
+                self.assertAlmostEqual(
+                    cal_kl_threshold(hist, bin_width, bits),
+                    kl_threshold_reference(hist, bin_width, bits),
+                )
+
+
+class TestStreamingHistogram(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(2024)
+        self.batches = [
+            rng.standard_normal([8, 1000]) * (i + 1) for i in range(4)
+        ]
+        self.values = np.concatenate([b.ravel() for b in self.batches])
+
+    def test_merge(self):
+        hist = StreamingHistogram()
+        for batch in self.batches:
+            hist.update(batch)
+        merged = StreamingHistogram()
+        for batch in self.batches[::-1]:
+            other = StreamingHistogram()
+            other.update(batch)
+            merged.merge(other)
+        self.assertEqual(hist.bound, merged.bound)
+        self.assertEqual(hist.abs_max, np.abs(self.values).max())
+        self.assertEqual(hist.abs_max, merged.abs_max)
+        np.testing.assert_allclose(hist.count, merged.count)
+        np.testing.assert_allclose(hist.sum, merged.sum)
+        np.testing.assert_allclose(hist.square_sum, merged.square_sum)
+        self.assertEqual(hist.count.sum(), self.values.size)
+        self.assertAlmostEqual(hist.sum.sum(), self.values.sum())
+
+    def test_losses(self):
+        hist = StreamingHistogram()
+        for batch in self.batches:
+            hist.update(batch)
+        scales = SCALE_RATES * hist.abs_max
+        for onnx_format in [False, True]:
+            for algo in ["mse", "emd"]:
+                expected = exact_losses(
+                    self.values, scales, 8, onnx_format, algo
+                )
+                losses = calibration_losses(hist, scales, 8, onnx_format, algo)
+                np.testing.assert_allclose(losses, expected, atol=5e-4)
+                scale, loss = search_scale(hist, 8, onnx_format, algo)
+                self.assertIn(scale, scales)
+                self.assertLessEqual(loss, losses.min())
+
+
+def new_calibration(algo, scope):
+    # the states of PostTrainingQuantization used in the calibration
+    ptq = object.__new__(PostTrainingQuantization)
+    ptq._algo = algo
+    ptq._scope = scope
+    ptq._activation_bits = 8
+    ptq._onnx_format = False
+    ptq._hist_percent = 0.999
+    ptq._histogram_bins = 2048
+    ptq._weight_quantize_type = 'abs_max'
+    ptq._quantized_weight_var_name = set()
+    ptq._quantized_act_var_name = {'x', 'y'}
+    ptq._zero_size_var_names = set()
+    ptq._sampling_act_abs_min_max = {}
+    ptq._sampling_act_histogram = {}
+    ptq._quantized_var_threshold = {}
+    ptq._quantized_var_min = {}
+    ptq._quantized_var_max = {}
+    ptq._quantized_var_avg = {}
+    ptq._act_calibration_histogram = {}
+    ptq._best_calibration_loss = {}
+    ptq._quantized_threshold = {}
+    return ptq
+
+
+class TestMergeCalibrationStats(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(2024)
+        self.batches = [
+            {
+                'x': rng.standard_normal([4, 32]).astype('float32') * (i + 1),
+                'y': np.abs(rng.standard_normal([4, 8])).astype('float32'),
+            }
+            for i in range(5)
+        ]
+        self.scope = paddle.static.Scope()
+
+    def run_stage(self, ptq, stage, batches):
+        sample = (
+            ptq._collect_activation_abs_min_max
+            if stage == "Preparation"
+            else ptq._sampling
+        )
+        for batch in batches:
+            for name, value in batch.items():
+                self.scope.var(name).get_tensor().set(value, paddle.CPUPlace())
+            sample()
+
+    def calibrate(self, algo, num_workers):
+        # every worker runs every num_workers-th batch, and the stats are
+        # merged like PostTrainingQuantization._calibrate
+        workers = [
+            new_calibration(algo, self.scope) for _ in range(num_workers)
+        ]
+        main = workers[0]
+        stages = ["Sampling"]
+        if algo in ["KL", "hist"]:
+            stages.insert(0, "Preparation")
+        for stage in stages:
+            if stage == "Sampling" and algo in ["KL", "hist"]:
+                main._init_sampling_act_histogram()
+            stats = main._calibration_stats(stage)
+            for worker in workers[1:]:
+                worker._merge_calibration_stats(stage, stats)
+            for rank, worker in enumerate(workers):
+                self.run_stage(worker, stage, self.batches[rank::num_workers])
+            for worker in workers[1:]:
+                main._merge_calibration_stats(
+                    stage, worker._calibration_stats(stage)
+                )
+        if algo in ["KL", "hist"]:
+            main._calculate_kl_hist_threshold()
+            return main._quantized_var_threshold
+        if algo in ["mse", "emd"]:
+            main._calculate_mse_emd_threshold()
+        if algo == "min_max":
+            return main._quantized_var_min, main._quantized_var_max
+        if algo == "avg":
+            return {
+                name: np.mean(values)
+                for name, values in main._quantized_var_avg.items()
+            }
+        return main._quantized_threshold
+
+    def test_merge(self):
+        for algo in ["abs_max", "min_max", "avg", "mse", "emd", "KL", "hist"]:
+            expected = self.calibrate(algo, 1)
+            for num_workers in [2, 3]:
+                result = self.calibrate(algo, num_workers)
+                if algo == "min_max":
+                    self.assertEqual(result, expected)
+                    continue
+                self.assertEqual(result.keys(), expected.keys())
+                for name, value in expected.items():
+                    self.assertAlmostEqual(result[name], value, places=5)
+
+
+class TestChannelStats(unittest.TestCase):
+    def test_channel_stats(self):
+        weight = np.random.standard_normal([4, 3, 2, 2])
+        self.assertEqual(channel_abs_max(weight), np.abs(weight).max())
+        for axis in [0, 1]:
+            channels = np.moveaxis(weight, axis, 0)
+            self.assertEqual(
+                channel_abs_max(weight, axis),
+                [float(np.abs(c).max()) for c in channels],
+            )
+            self.assertEqual(
+                channel_min_max(weight, axis),
+                (
+                    [float(c.min()) for c in channels],
+                    [float(c.max()) for c in channels],
+                ),
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -221,6 +221,7 @@ class TestPostTrainingQuantization(unittest.TestCase):
         onnx_format=False,
         skip_tensor_list=None,
         bias_correction=False,
+        num_workers=1,
     ):
         place = paddle.CPUPlace()
         exe = paddle.static.Executor(place)
@@ -256,6 +257,7 @@ class TestPostTrainingQuantization(unittest.TestCase):
             onnx_format=onnx_format,
             skip_tensor_list=skip_tensor_list,
             is_use_cache_file=is_use_cache_file,
+            num_workers=num_workers,
         )
         ptq.quantize()
         ptq.save_quantized_model(self.int8_model_path)
@@ -280,6 +282,7 @@ class TestPostTrainingQuantization(unittest.TestCase):
         bias_correction=False,
         onnx_format=False,
         skip_tensor_list=None,
+        num_workers=1,
     ):
         origin_model_path = self.download_model(data_url, data_md5, model_name)
         origin_model_path = os.path.join(origin_model_path, model_name)
@@ -314,6 +317,7 @@ class TestPostTrainingQuantization(unittest.TestCase):
             onnx_format,
             skip_tensor_list,
             bias_correction,
+            num_workers=num_workers,
         )
 
         print(
@@ -374,6 +378,41 @@ class TestPostTrainingKLForMnist(TestPostTrainingQuantization):
         )
 
 
+class TestPostTrainingKLForMnistMultiWorkers(TestPostTrainingQuantization):
+    def test_post_training_kl_multi_workers(self):
+        model_name = "mnist_model"
+        data_url = "http://paddle-inference-dist.bj.bcebos.com/int8/mnist_model_combined.tar.gz"
+        data_md5 = "a49251d3f555695473941e5a725c6014"
+        algo = "KL"
+        round_type = "round"
+        quantizable_op_type = ["conv2d", "depthwise_conv2d", "mul"]
+        is_full_quantize = False
+        is_use_cache_file = False
+        is_optimize_model = True
+        diff_threshold = 0.01
+        batch_size = 10
+        infer_iterations = 50
+        quant_iterations = 5
+        self.run_test(
+            model_name,
+            'model.pdmodel',
+            'model.pdiparams',
+            data_url,
+            data_md5,
+            algo,
+            round_type,
+            quantizable_op_type,
+            is_full_quantize,
+            is_use_cache_file,
+            is_optimize_model,
+            diff_threshold,
+            batch_size,
+            infer_iterations,
+            quant_iterations,
+            num_workers=2,
+        )
+
+
 class TestPostTraininghistForMnist(TestPostTrainingQuantization):
     def test_post_training_hist(self):
         model_name = "mnist_model"
@@ -442,6 +481,41 @@ class TestPostTrainingmseForMnist(TestPostTrainingQuantization):
         )
 
 
+class TestPostTrainingmseForMnistMultiWorkers(TestPostTrainingQuantization):
+    def test_post_training_mse_multi_workers(self):
+        model_name = "mnist_model"
+        data_url = "http://paddle-inference-dist.bj.bcebos.com/int8/mnist_model_combined.tar.gz"
+        data_md5 = "a49251d3f555695473941e5a725c6014"
+        algo = "mse"
+        round_type = "round"
+        quantizable_op_type = ["conv2d", "depthwise_conv2d", "mul"]
+        is_full_quantize = False
+        is_use_cache_file = False
+        is_optimize_model = True
+        diff_threshold = 0.01
+        batch_size = 10
+        infer_iterations = 50
+        quant_iterations = 5
+        self.run_test(
+            model_name,
+            'model.pdmodel',
+            'model.pdiparams',
+            data_url,
+            data_md5,
+            algo,
+            round_type,
+            quantizable_op_type,
+            is_full_quantize,
+            is_use_cache_file,
+            is_optimize_model,
+            diff_threshold,
+            batch_size,
+            infer_iterations,
+            quant_iterations,
+            num_workers=2,
+        )
+
+
 class TestPostTrainingemdForMnist(TestPostTrainingQuantization):
     def test_post_training_mse(self):
         model_name = "mnist_model"
@@ -544,6 +618,41 @@ class TestPostTrainingAbsMaxForMnist(TestPostTrainingQuantization):
         )
 
 
+class TestPostTrainingAbsMaxForMnistMultiWorkers(TestPostTrainingQuantization):
+    def test_post_training_abs_max_multi_workers(self):
+        model_name = "mnist_model"
+        data_url = "http://paddle-inference-dist.bj.bcebos.com/int8/mnist_model_combined.tar.gz"
+        data_md5 = "a49251d3f555695473941e5a725c6014"
+        algo = "abs_max"
+        round_type = "round"
+        quantizable_op_type = ["conv2d", "depthwise_conv2d", "mul"]
+        is_full_quantize = False
+        is_use_cache_file = False
+        is_optimize_model = True
+        diff_threshold = 0.01
+        batch_size = 10
+        infer_iterations = 50
+        quant_iterations = 5
+        self.run_test(
+            model_name,
+            'model.pdmodel',
+            'model.pdiparams',
+            data_url,
+            data_md5,
+            algo,
+            round_type,
+            quantizable_op_type,
+            is_full_quantize,
+            is_use_cache_file,
+            is_optimize_model,
+            diff_threshold,
+            batch_size,
+            infer_iterations,
+            quant_iterations,
+            num_workers=2,
+        )
+
+
 class TestPostTrainingmseAdaroundForMnist(TestPostTrainingQuantization):
     def test_post_training_mse(self):
         model_name = "mnist_model"
@@ -25,6 +25,7 @@ from test_case_base import (
     test_instruction_translator_cache_context,
 )
 
+import paddle
 from paddle.jit.sot.opcode_translator.custom_code import CustomCode
 from paddle.jit.sot.opcode_translator.executor.executor_cache import (
     OpcodeExecutorCache,
@@ -162,5 +163,27 @@ class TestCacheExceedLimit(TestCaseBase):
             self.assert_results(foo, input)
 
 
+def add_length(x, name):
+    return x + len(name)
+
+
+class TestGuardIndex(TestCaseBase):
+    def test_guard_index(self):
+        x = paddle.to_tensor([1.0, 2.0])
+        names = [f"name_{i}" * (i % 3 + 1) for i in range(30)]
+        with test_instruction_translator_cache_context() as ctx:
+            for name in names:
+                self.assert_results(add_length, x, name)
+            translate_count = ctx.translate_count
+            self.assertEqual(translate_count, len(names))
+            guard_index = ctx.guard_indices[add_length.__code__]
+            self.assertIn("frame.f_locals['name']", guard_index.key_exprs)
+
+            # every specialization is found in the index
+            for name in reversed(names):
+                self.assert_results(add_length, x, name)
+            self.assertEqual(ctx.translate_count, translate_count)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,165 @@
+# Copyright (c) 2024 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+from test_case_base import (
+    TestCaseBase,
+    test_instruction_translator_cache_context,
+)
+
+import paddle
+from paddle.jit.sot import symbolic_translate
+from paddle.jit.sot.symbolic.compile_cache import (
+    COMPILE_LOCK,
+    AsyncCompileWorker,
+    FallbackWrapper,
+)
+from paddle.jit.sot.utils import (
+    ENV_MIN_GRAPH_SIZE,
+    async_compile_guard,
+    min_graph_size_guard,
+)
+
+
+def foo(x, y):
+    z = x * 2 + y
+    z = paddle.nn.functional.relu(z)
+    return z.mean()
+
+
+def bar(x, y):
+    z = paddle.tanh(x) * y
+    return z.sum()
+
+
+def baz(x, y):
+    z = paddle.tanh(x) * y
+    z = paddle.nn.functional.relu(z) + x
+    z = paddle.exp(z) - y
+    z = paddle.sin(z) * x
+    z = paddle.cos(z) + y
+    z = paddle.abs(z) - x
+    return z.sum()
+
+
+class TestAsyncCompile(TestCaseBase):
+    def test_eager_fallback(self):
+        worker = AsyncCompileWorker()
+        worker.reset_stats()
+        x = paddle.rand([4, 4])
+        y = paddle.rand([4, 4])
+        with async_compile_guard(True), min_graph_size_guard(0):
+            with test_instruction_translator_cache_context() as ctx:
+                sym_foo = symbolic_translate(foo)
+                # hold the background compilation, the subgraph runs eagerly
+                with COMPILE_LOCK:
+                    for _ in range(3):
+                        self.assert_nest_match(sym_foo(x, y), foo(x, y))
+                    self.assertEqual(worker.stats()["queue_depth"], 1)
+                worker.wait()
+                for _ in range(2):
+                    self.assert_nest_match(sym_foo(x, y), foo(x, y))
+                self.assertEqual(ctx.translate_count, 1)
+
+        stats = worker.stats()
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertEqual(stats["max_queue_depth"], 1)
+        self.assertEqual(stats["num_compiled"], 1)
+        self.assertEqual(stats["num_failed"], 0)
+        self.assertEqual(stats["eager_calls"], 3)
+        self.assertEqual(stats["compiled_calls"], 2)
+        self.assertGreater(stats["eager_time"], 0)
+        self.assertGreater(stats["compiled_time"], 0)
+
+    def test_graph_size(self):
+        build_threads = []
+        build_partial_program = FallbackWrapper.build_partial_program
+
+        def record_build(wrapper, *args, **kwargs):
+            build_threads.append(threading.current_thread())
+            return build_partial_program(wrapper, *args, **kwargs)
+
+        worker = AsyncCompileWorker()
+        worker.wait()
+        worker.reset_stats()
+        x = paddle.rand([4, 4])
+        y = paddle.rand([4, 4])
+        with async_compile_guard(True), min_graph_size_guard(
+            ENV_MIN_GRAPH_SIZE.default
+        ), mock.patch.object(
+            FallbackWrapper, "build_partial_program", record_build
+        ):
+            with test_instruction_translator_cache_context():
+                sym_baz = symbolic_translate(baz)
+                with COMPILE_LOCK:
+                    self.assert_nest_match(sym_baz(x, y), baz(x, y))
+                    # the graph size is checked without building the program
+                    self.assertEqual(build_threads, [])
+                worker.wait()
+                self.assert_nest_match(sym_baz(x, y), baz(x, y))
+        self.assertEqual(len(build_threads), 1)
+        self.assertIsNot(build_threads[0], threading.main_thread())
+        stats = worker.stats()
+        self.assertEqual(stats["num_compiled"], 1)
+        self.assertEqual(stats["eager_calls"], 1)
+        self.assertEqual(stats["compiled_calls"], 1)
+
+    def test_foreground_priority(self):
+        def slow_compile():
+            with COMPILE_LOCK.background():
+                time.sleep(0.2)
+
+        worker = AsyncCompileWorker()
+        worker.wait()
+        worker.reset_stats()
+        for _ in range(5):
+            worker.submit(slow_compile)
+        # the first one is being compiled
+        time.sleep(0.05)
+        start = time.perf_counter()
+        with COMPILE_LOCK:
+            blocked_time = time.perf_counter() - start
+        # the calling thread does not wait for the whole queue
+        self.assertLess(blocked_time, 0.5)
+        worker.wait()
+        stats = worker.stats()
+        self.assertEqual(stats["num_compiled"], 5)
+        self.assertEqual(stats["blocked_calls"], 1)
+        self.assertGreater(stats["blocked_time"], 0)
+
+    def test_backward(self):
+        x_dy = paddle.rand([4, 4])
+        x_dy.stop_gradient = False
+        x_st = x_dy.detach()
+        x_st.stop_gradient = False
+        y = paddle.rand([4, 4])
+        with async_compile_guard(True), min_graph_size_guard(0):
+            with test_instruction_translator_cache_context():
+                with COMPILE_LOCK:
+                    out = symbolic_translate(bar)(x_st, y)
+                out.backward()
+                bar(x_dy, y).backward()
+                AsyncCompileWorker().wait()
+        np.testing.assert_allclose(x_st.grad.numpy(), x_dy.grad.numpy())
+
+
+if __name__ == "__main__":
+    unittest.main()